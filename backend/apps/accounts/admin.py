@@ -2,10 +2,11 @@
 
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+from apps.stores.mixins import StoreScopedAdminMixin
 from .models import Account
 
 @admin.register(Account)
-class AccountAdmin(UserAdmin):
+class AccountAdmin(StoreScopedAdminMixin, UserAdmin):
     """
     Configuração do painel de administração para o modelo Account.
 
@@ -19,6 +20,7 @@ class AccountAdmin(UserAdmin):
         ('Dados Adicionais e Comissões', {
             'fields': (
                 'user_type', 
+                'store',
                 'document', 
                 'phone', 
                 'commission_rate', 
@@ -26,13 +28,25 @@ class AccountAdmin(UserAdmin):
                 'commission_start_date'
             ),
         }),
+        ('Totais de Vendas', {
+            'fields': (
+                'lifetime_sales_amount',
+                'lifetime_commission',
+                'active_sale_days',
+                'last_sale_date',
+            ),
+        }),
     )
 
+    # Mantidos pelos signals de vendas (apps/accounts/counters.py)
+    readonly_fields = ('lifetime_sales_amount', 'lifetime_commission', 'active_sale_days', 'last_sale_date')
+
     # 2. Adicione seus campos customizados ao formulário de criação de usuário
     add_fieldsets = UserAdmin.add_fieldsets + (
         ('Dados Adicionais', {
             'fields': (
                 'user_type', 
+                'store',
                 'document', 
                 'phone', 
                 'commission_rate',
@@ -47,11 +61,12 @@ class AccountAdmin(UserAdmin):
         'first_name', 
         'last_name', 
         'user_type', 
+        'store',
         'is_staff'
     ]
 
     # 4. (Opcional) Adicione seus campos aos filtros da barra lateral
-    list_filter = UserAdmin.list_filter + ('user_type', 'commission_active')
+    list_filter = UserAdmin.list_filter + ('user_type', 'store', 'commission_active')
 
     # 5. (Opcional) Adicione seus campos à busca
     search_fields = UserAdmin.search_fields + ('document',)
\ No newline at end of file
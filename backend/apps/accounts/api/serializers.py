@@ -1,5 +1,6 @@
 from django.db import models
 from rest_framework import serializers
+from apps.stores.tenancy import user_store_id
 from ..models import Account
 
 
@@ -19,6 +20,12 @@ class AccountsSerializer(serializers.ModelSerializer):
     def get_full_name(self, obj):
         return obj.get_full_name()
 
+    DATE_PARAMS = ("start_date", "end_date", "month", "year")
+
+    def _has_date_filter(self):
+        params = self.context["request"].query_params
+        return any(params.get(name) for name in self.DATE_PARAMS)
+
     def _get_date_filtered_qs(self, obj):
         """
         Retorna o queryset de vendas do vendedor filtrado por:
@@ -28,7 +35,7 @@ class AccountsSerializer(serializers.ModelSerializer):
         - year
         Recebe os parâmetros via query_params.
         """
-        qs = obj.daily_sales.filter(is_active=True)
+        qs = obj.daily_sales.active()
         params = self.context["request"].query_params
 
         start = params.get("start_date")
@@ -48,11 +55,16 @@ class AccountsSerializer(serializers.ModelSerializer):
         return qs
 
     def get_total_sold(self, obj):
+        # Sem filtro de período: totais acumulados da própria linha, sem consulta
+        if not self._has_date_filter():
+            return obj.lifetime_sales_amount
         qs = self._get_date_filtered_qs(obj)
         result = qs.aggregate(total=models.Sum("total_amount"))
         return result["total"] or 0
 
     def get_total_commission_paid(self, obj):
+        if not self._has_date_filter():
+            return obj.lifetime_commission
         qs = self._get_date_filtered_qs(obj)
         result = qs.aggregate(total=models.Sum("calculated_commission"))
         return result["total"] or 0
@@ -61,11 +73,12 @@ class AccountsSerializer(serializers.ModelSerializer):
         model = Account
         fields = [
             "id", "username", "first_name", "last_name", "email",
-            "user_type", "document", "phone",
+            "user_type", "document", "phone", "store",
             "commission_rate", "commission_active", "commission_start_date",
             "is_active", "password",
             "is_staff", "is_superuser",   # 🔹 agora visíveis
             "full_name", "total_sold", "total_commission_paid",
+            "last_sale_date", "active_sale_days",
         ]
         extra_kwargs = {
             "password": {"write_only": True, "required": False},
@@ -76,6 +89,28 @@ class AccountsSerializer(serializers.ModelSerializer):
             "is_superuser": {"read_only": True},  # 🔒 idem
         }
 
+    def validate_store(self, value):
+        # Usuário de uma loja não vincula (nem se desvincula) a outra loja
+        request = self.context.get("request")
+        store_id = user_store_id(request.user) if request else None
+        if store_id is not None and (value is None or value.pk != store_id):
+            raise serializers.ValidationError("Você só pode vincular usuários à sua loja.")
+        return value
+
+    def validate(self, attrs):
+        request = self.context.get("request")
+        # Criado por usuário de uma loja: herda a loja de quem cria
+        if self.instance is None and "store" not in attrs and request is not None:
+            store_id = user_store_id(request.user)
+            if store_id:
+                attrs["store"] = request.user.store
+        # Só administradores da rede ficam sem loja
+        store = attrs.get("store", getattr(self.instance, "store", None))
+        user_type = attrs.get("user_type", getattr(self.instance, "user_type", Account.UserType.SELLER))
+        if store is None and user_type != Account.UserType.ADMIN:
+            raise serializers.ValidationError({"store": "Vendedores e gerentes precisam estar vinculados a uma loja."})
+        return attrs
+
     def create(self, validated_data):
         password = validated_data.pop("password", None)
         validated_data.setdefault("last_name", "")
@@ -3,12 +3,17 @@ from rest_framework import viewsets, permissions, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from apps.core.db_router import use_replica
+from ..autocomplete import search_prefix
 from ..models import Account
+from ..search import AccountSearchFilter
+from ..utils import is_vendedor
 from .serializers import AccountsSerializer, ChangePasswordSerializer
 from apps.core.pagination import StandardResultsSetPagination
+from apps.stores.mixins import StoreScopedViewMixin
 
 
-class AccountViewSet(viewsets.ModelViewSet):
+class AccountViewSet(StoreScopedViewMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciar usuários (Accounts).
 
@@ -20,6 +25,7 @@ class AccountViewSet(viewsets.ModelViewSet):
     - Ordenação (OrderingFilter)
     - Filtros avançados via django-filter
     - Endpoints extras: `me/` e `change_password/`
+    - Usuários da loja da requisição (apps/stores/tenancy.py)
 
     Exemplos de uso:
     /api/v1/accounts/users/?search=bruno
@@ -27,6 +33,7 @@ class AccountViewSet(viewsets.ModelViewSet):
     /api/v1/accounts/users/?user_type=admin&is_active=true
     /api/v1/accounts/users/me/
     /api/v1/accounts/users/change_password/
+    /api/v1/users/autocomplete/?q=bru&user_type=SELLER
     """
 
     queryset = Account.objects.all()
@@ -36,18 +43,26 @@ class AccountViewSet(viewsets.ModelViewSet):
     # 🔒 Permissão padrão (todos devem estar logados)
     permission_classes = [permissions.IsAuthenticated]
 
+    # ⏱️ Throttling: o autocomplete dispara a cada tecla, orçamento maior
+    throttle_scope = 'accounts'
+    throttle_action_scopes = {'autocomplete': 'autocomplete'}
+
     # 🔍 Busca e ordenação
+    # Busca por último: sem ?ordering= explícito ela ordena por relevância
     filter_backends = [
-        filters.SearchFilter,
-        filters.OrderingFilter,
         DjangoFilterBackend,
+        filters.OrderingFilter,
+        AccountSearchFilter,
     ]
     search_fields = ['username', 'email', 'first_name', 'last_name']
     ordering_fields = ['username', 'email', 'first_name', 'last_name', 'date_joined']
     ordering = ['username']
 
     # 🎯 Filtros avançados (via querystring)
-    filterset_fields = ['user_type', 'is_active', 'commission_active']
+    filterset_fields = ['user_type', 'is_active', 'commission_active', 'store']
+
+    # Sem loja vinculada o usuário ainda consulta o próprio perfil e troca a senha
+    store_exempt_actions = ('me', 'change_password')
 
     def get_permissions(self):
         """
@@ -59,6 +74,7 @@ class AccountViewSet(viewsets.ModelViewSet):
             return [permissions.IsAdminUser()]
         return [permissions.IsAuthenticated()]
 
+
     # 👤 Endpoint: /api/v1/accounts/users/me/
     @action(detail=False, methods=['get', 'patch'], url_path='me',
             permission_classes=[permissions.IsAuthenticated])
@@ -113,3 +129,29 @@ class AccountViewSet(viewsets.ModelViewSet):
         user.save()
         return Response({"detail": "Senha alterada com sucesso!"},
                         status=status.HTTP_200_OK)
+
+    # 🔎 Endpoint: /api/v1/users/autocomplete/?q=bru
+    @action(detail=False, methods=['get'], url_path='autocomplete',
+            permission_classes=[permissions.IsAuthenticated])
+    def autocomplete(self, request):
+        """
+        GET → até `limit` (padrão 10, máx. 25) usuários ativos cujo nome,
+        sobrenome ou username começa com `q`. Filtro opcional `user_type`.
+
+        [{"id": 3, "name": "Bruno Vidal"}, ...]
+        """
+        if is_vendedor(request.user):
+            return Response({"detail": "Apenas gerentes e administradores."}, status=status.HTTP_403_FORBIDDEN)
+
+        query = request.query_params.get('q', '').strip()
+        user_type = request.query_params.get('user_type') or None
+        if user_type and user_type not in Account.UserType.values:
+            return Response({"user_type": "Tipo de usuário inválido."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = max(1, int(request.query_params.get('limit', 10)))
+        except ValueError:
+            limit = 10
+
+        with use_replica():
+            results = search_prefix(query, user_type=user_type, limit=limit, store_id=self.store_id)
+        return Response(results)
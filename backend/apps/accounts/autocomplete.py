@@ -0,0 +1,71 @@
+# apps/accounts/autocomplete.py
+"""
+Busca por prefixo de usuários ativos (nome, sobrenome ou username) para
+campos de autocomplete.
+
+Os filtros usam as colunas `search_*` do `Account`, já sem acento e em
+casefold (`fold_search`, preenchidas no save): o LOWER() do SQLite só
+converte ASCII e "Érica" nunca casaria com "éri". O termo buscado passa
+pela mesma normalização, e as colunas têm índices parciais próprios:
+- PostgreSQL: `col LIKE 'pre%'` (índice `text_pattern_ops`)
+- SQLite e outros: `col >= 'pre' AND col < 'pre\U0010ffff'`
+  (o LIKE do SQLite com ESCAPE não usa índice; a faixa usa)
+"""
+from django.conf import settings
+from django.db import connections
+from django.db.models import Q
+
+from apps.core.cache import TTLCache
+from .models import Account
+from .utils import fold_search
+
+AUTOCOMPLETE_CACHE_TTL = getattr(settings, 'AUTOCOMPLETE_CACHE_TTL', 30)
+MAX_RESULTS = 25
+
+# (prefixo, user_type, limite, loja) -> [{"id", "name"}]
+autocomplete_cache = TTLCache(maxsize=2048, ttl=AUTOCOMPLETE_CACHE_TTL)
+
+_PREFIX_END = '\U0010ffff'
+
+
+def _prefix(lookup, prefix, vendor):
+    if vendor == 'postgresql':
+        return Q(**{f'{lookup}__startswith': prefix})
+    return Q(**{f'{lookup}__gte': prefix, f'{lookup}__lt': prefix + _PREFIX_END})
+
+
+def search_prefix(query, user_type=None, limit=10, store_id=None):
+    """
+    Até `limit` usuários ativos cujo nome, sobrenome ou username começa com
+    `query`, sem diferenciar acentos nem maiúsculas ("eri" -> Érica). Com
+    mais de uma palavra, casa com o nome completo ("bruno vi" -> Bruno
+    Vidal). Com `store_id`, só os da loja.
+    """
+    term = fold_search(query)
+    if not term:
+        return []
+    limit = min(limit, MAX_RESULTS)
+    key = (term, user_type, limit, store_id)
+    results = autocomplete_cache.get(key)
+    if results is not None:
+        return results
+
+    queryset = Account.active_objects.all()
+    vendor = connections[queryset.db].vendor
+    # O nome completo começa pelo nome: uma palavra casa com nome, sobrenome ou username
+    condition = _prefix('search_name', term, vendor)
+    if ' ' not in term:
+        condition |= _prefix('search_last_name', term, vendor) | _prefix('search_username', term, vendor)
+    queryset = queryset.filter(condition)
+    if user_type:
+        queryset = queryset.filter(user_type=user_type)
+    if store_id is not None:
+        queryset = queryset.filter(store_id=store_id)
+
+    rows = queryset.order_by('search_name', 'id').values('id', 'first_name', 'last_name', 'username')[:limit]
+    results = [
+        {'id': row['id'], 'name': f"{row['first_name']} {row['last_name']}".strip() or row['username']}
+        for row in rows
+    ]
+    autocomplete_cache.set(key, results)
+    return results
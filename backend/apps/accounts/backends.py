@@ -0,0 +1,85 @@
+# apps/accounts/backends.py
+import copy
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from rest_framework.authentication import TokenAuthentication
+
+from apps.core.cache import TTLCache
+
+AUTH_CACHE_TTL = getattr(settings, 'AUTH_CACHE_TTL', 60)
+AUTH_CACHE_MAXSIZE = getattr(settings, 'AUTH_CACHE_MAXSIZE', 1024)
+
+# user_id -> Account | token key -> (Account, Token)
+user_cache = TTLCache(maxsize=AUTH_CACHE_MAXSIZE, ttl=AUTH_CACHE_TTL)
+token_cache = TTLCache(maxsize=AUTH_CACHE_MAXSIZE, ttl=AUTH_CACHE_TTL)
+
+
+def invalidate_user(user_id):
+    """Remove o usuário e todos os tokens dele dos caches deste processo."""
+    user_cache.delete(str(user_id))
+    token_cache.delete_where(lambda entry: entry[0].pk == user_id)
+
+
+def invalidate_token(key):
+    token_cache.delete(key)
+
+
+def request_copy(user):
+    """
+    Cópia do usuário em cache para uma requisição. `copy.copy` sozinho
+    compartilharia o `_state` (e o `fields_cache` das relações já carregadas,
+    como a loja): cada cópia recebe o seu.
+    """
+    clone = copy.copy(user)
+    clone._state = copy.deepcopy(user._state)
+    return clone
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend com cache do usuário resolvido a partir da sessão.
+
+    O `AuthenticationMiddleware` chama `get_user()` a cada requisição; com o
+    cache, a consulta ao `Account` só acontece no primeiro acesso ou após a
+    invalidação (save do Account, troca de senha) ou expiração do TTL.
+    Cada requisição recebe uma cópia com `_state` próprio (`request_copy`),
+    então alterações em `request.user` não vazam para outras requisições.
+    """
+
+    def get_user(self, user_id):
+        key = str(user_id)
+        user = user_cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is None:
+                return None
+            user_cache.set(key, user)
+        return request_copy(user)
+
+    async def aget_user(self, user_id):
+        key = str(user_id)
+        user = user_cache.get(key)
+        if user is None:
+            user = await super().aget_user(user_id)
+            if user is None:
+                return None
+            user_cache.set(key, user)
+        return request_copy(user)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication do DRF sem o JOIN token/usuário a cada chamada.
+
+    O token é invalidado ao ser removido ou recriado (rotação) e quando o
+    Account dono é salvo.
+    """
+
+    def authenticate_credentials(self, key):
+        entry = token_cache.get(key)
+        if entry is None:
+            entry = super().authenticate_credentials(key)
+            token_cache.set(key, entry)
+        user, token = entry
+        return request_copy(user), token
@@ -0,0 +1,182 @@
+# apps/accounts/counters.py
+"""
+Totais acumulados do vendedor, desnormalizados no Account.
+
+    lifetime_sales_amount   soma de total_amount das vendas ativas
+    lifetime_commission     soma de calculated_commission das vendas ativas
+    active_sale_days        número de vendas ativas (uma por dia)
+    last_sale_date          data da venda ativa mais recente
+
+Cada save/exclusão de `DailySales` aplica só a diferença, com um UPDATE
+de `F()` na linha do vendedor (signals em `apps/accounts/signals.py`).
+Atualizações em massa por UPDATE direto (ações do admin) chamam
+`reconcile` para os vendedores afetados.
+
+Meses movidos para o arquivo frio continuam contando: o arquivamento
+remove as linhas sem disparar signals, e tanto `reconcile` quanto a
+migração de backfill e a busca da última venda somam tabela e resumos do
+arquivo (`ArchivedSalesMonth.seller_totals`, sem abrir os arquivos).
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db.models import Case, Count, F, Max, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce, Greatest
+
+from apps.sales.archive import archived_lifetime_totals
+from apps.sales.models import DailySales
+from .backends import invalidate_user
+from .models import Account
+
+ZERO = Decimal('0.00')
+
+COUNTER_FIELDS = ('lifetime_sales_amount', 'lifetime_commission', 'active_sale_days', 'last_sale_date')
+
+
+def _contribution(active, seller_id, sale_date, amount, commission):
+    if not active or seller_id is None:
+        return None
+    return seller_id, sale_date, amount or ZERO, commission or ZERO
+
+
+def sale_contributions(instance, action):
+    """
+    (antes, depois) do que a venda soma nos totais do vendedor; cada lado é
+    (seller_id, sale_date, valor, comissão) ou None. O "antes" vem de
+    `_tracked_changes` (apps.core.tracking).
+    """
+    after = None
+    if action != 'deleted':
+        after = _contribution(
+            instance.is_active, instance.seller_id, instance.sale_date,
+            instance.total_amount, instance.calculated_commission,
+        )
+    if action == 'created':
+        return None, after
+
+    changes = getattr(instance, '_tracked_changes', {}) if action == 'updated' else {}
+
+    def before(attname):
+        return changes[attname][0] if attname in changes else getattr(instance, attname)
+
+    return _contribution(
+        before('is_active'), before('seller_id'), before('sale_date'),
+        before('total_amount'), before('calculated_commission'),
+    ), after
+
+
+def _latest_sale_date(seller_id):
+    """Última venda ativa do vendedor, na tabela ou nos meses arquivados."""
+    latest = Subquery(
+        DailySales.objects.filter(seller=OuterRef('pk')).order_by('-sale_date').values('sale_date')[:1]
+    )
+    archived = archived_lifetime_totals([seller_id]).get(seller_id)
+    if archived is None or archived[3] is None:
+        return latest
+    # Greatest com NULL é NULL no SQLite: sem venda na tabela fica a do arquivo
+    return Coalesce(Greatest(latest, Value(archived[3])), Value(archived[3]))
+
+
+def apply_sale_change(before, after, using=None):
+    """Aplica a diferença entre duas contribuições (um UPDATE por vendedor afetado)."""
+    if before == after:
+        return
+    sellers = {side[0] for side in (before, after) if side is not None}
+    for seller_id in sellers:
+        removed = before if before is not None and before[0] == seller_id else None
+        added = after if after is not None and after[0] == seller_id else None
+
+        amount = (added[2] if added else ZERO) - (removed[2] if removed else ZERO)
+        commission = (added[3] if added else ZERO) - (removed[3] if removed else ZERO)
+        days = (1 if added else 0) - (1 if removed else 0)
+
+        last_sale_date = F('last_sale_date')
+        if added:
+            last_sale_date = Greatest(Coalesce(last_sale_date, Value(added[1])), Value(added[1]))
+        if removed:
+            # A venda mais recente saiu: busca a próxima (a linha já foi gravada/removida)
+            last_sale_date = Case(
+                When(last_sale_date=removed[1], then=_latest_sale_date(seller_id)),
+                default=last_sale_date,
+            )
+
+        Account.objects.using(using).filter(pk=seller_id).update(
+            lifetime_sales_amount=F('lifetime_sales_amount') + amount,
+            lifetime_commission=F('lifetime_commission') + commission,
+            active_sale_days=F('active_sale_days') + days,
+            last_sale_date=last_sale_date,
+        )
+        # O usuário em cache (autenticação) levaria os totais antigos
+        invalidate_user(seller_id)
+
+
+# ------------------------------------------
+# Recalculo completo
+# ------------------------------------------
+def compute_counters(seller_ids=None):
+    """{seller_id: {campo: valor}} somando a tabela de vendas e o arquivo frio."""
+    counters = defaultdict(lambda: {
+        'lifetime_sales_amount': ZERO, 'lifetime_commission': ZERO,
+        'active_sale_days': 0, 'last_sale_date': None,
+    })
+
+    def add(seller_id, amount, commission, days, last):
+        entry = counters[seller_id]
+        entry['lifetime_sales_amount'] += amount or ZERO
+        entry['lifetime_commission'] += commission or ZERO
+        entry['active_sale_days'] += days
+        if last is not None and (entry['last_sale_date'] is None or last > entry['last_sale_date']):
+            entry['last_sale_date'] = last
+
+    sales_qs = DailySales.objects.all()
+    if seller_ids is not None:
+        sales_qs = sales_qs.filter(seller_id__in=seller_ids)
+    rows = sales_qs.values('seller_id').annotate(
+        amount=Sum('total_amount'), commission=Sum('calculated_commission'),
+        days=Count('id'), last=Max('sale_date'),
+    ).order_by()
+    for row in rows:
+        add(row['seller_id'], row['amount'], row['commission'], row['days'], row['last'])
+
+    for seller_id, (amount, commission, days, last) in archived_lifetime_totals(seller_ids).items():
+        add(seller_id, amount, commission, days, last)
+
+    return counters
+
+
+def reconcile(seller_ids=None, dry_run=False):
+    """
+    Compara os totais gravados com os recalculados e corrige os divergentes.
+    Retorna a lista de (account_id, {campo: (gravado, correto)}).
+    """
+    expected = compute_counters(seller_ids)
+    accounts = Account.objects.only('pk', *COUNTER_FIELDS)
+    if seller_ids is not None:
+        accounts = accounts.filter(pk__in=seller_ids)
+    else:
+        # Contas sem vendas só precisam de checagem se tiverem algo gravado
+        accounts = accounts.filter(pk__in=list(expected)) | accounts.exclude(
+            active_sale_days=0, lifetime_sales_amount=0, lifetime_commission=0, last_sale_date__isnull=True,
+        )
+
+    drifted, changed = [], []
+    empty = {'lifetime_sales_amount': ZERO, 'lifetime_commission': ZERO, 'active_sale_days': 0, 'last_sale_date': None}
+    for account in accounts.iterator():
+        correct = expected.get(account.pk, empty)
+        diff = {
+            field: (getattr(account, field), correct[field])
+            for field in COUNTER_FIELDS if getattr(account, field) != correct[field]
+        }
+        if diff:
+            drifted.append((account.pk, diff))
+            for field in COUNTER_FIELDS:
+                setattr(account, field, correct[field])
+            changed.append(account)
+
+    if changed and not dry_run:
+        # bulk_update não dispara os signals do Account (grupos, índice de busca)
+        Account.objects.bulk_update(changed, COUNTER_FIELDS, batch_size=500)
+        for account in changed:
+            invalidate_user(account.pk)
+    return drifted
+
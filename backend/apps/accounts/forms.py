@@ -1,5 +1,7 @@
 from django import forms
 from django.contrib.auth.forms import AuthenticationForm, UserCreationForm
+from apps.stores.models import Store
+from apps.stores.tenancy import user_store_id
 from .models import Account
 
 
@@ -24,6 +26,17 @@ class SellerForm(UserCreationForm):
             "phone",
             "birth_date",
             "commission_rate",
+            "store",
         ]
 
+    def __init__(self, *args, user=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        store_id = user_store_id(user)
+        if store_id is not None:
+            # Quem é de uma loja só cadastra na própria loja
+            del self.fields["store"]
+            self.instance.store_id = store_id
+        else:
+            self.fields["store"].queryset = Store.objects.order_by("name")
+
         
\ No newline at end of file
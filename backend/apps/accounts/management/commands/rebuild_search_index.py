@@ -0,0 +1,18 @@
+# apps/accounts/management/commands/rebuild_search_index.py
+from django.core.management.base import BaseCommand
+
+from apps.accounts.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Recria o índice FTS5 de busca de contas (SQLite) a partir de accounts_account. "
+        "Use depois de cargas em massa que não disparam signals. No PostgreSQL o índice é mantido pelo banco."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        count = rebuild_index(using=options['database'])
+        self.stdout.write(self.style.SUCCESS(f"{count} contas indexadas."))
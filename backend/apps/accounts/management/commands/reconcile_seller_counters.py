@@ -0,0 +1,25 @@
+# apps/accounts/management/commands/reconcile_seller_counters.py
+from django.core.management.base import BaseCommand
+
+from apps.accounts.counters import reconcile
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula os totais acumulados dos vendedores (vendas, comissão, dias "
+        "com venda e última venda) a partir da tabela e do arquivo frio, "
+        "corrigindo os que divergirem."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seller', type=int, action='append', dest='sellers',
+                            help='Id do vendedor (pode repetir); padrão: todos')
+        parser.add_argument('--dry-run', action='store_true', help='Só lista as divergências')
+
+    def handle(self, *args, sellers=None, dry_run=False, **options):
+        drifted = reconcile(sellers, dry_run=dry_run)
+        for account_id, diff in drifted:
+            details = ', '.join(f'{field}: {stored} -> {correct}' for field, (stored, correct) in diff.items())
+            self.stdout.write(f'Conta {account_id}: {details}')
+        verb = 'divergentes' if dry_run else 'corrigidas'
+        self.stdout.write(self.style.SUCCESS(f'{len(drifted)} contas {verb}.'))
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_account_birth_date'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='account',
+            options={'default_manager_name': 'objects', 'verbose_name': 'Usuário', 'verbose_name_plural': 'Usuários'},
+        ),
+        migrations.RemoveIndex(
+            model_name='account',
+            name='accounts_ac_user_ty_c41348_idx',
+        ),
+        migrations.AddIndex(
+            model_name='account',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['user_type', 'commission_active'], name='accounts_active_type_idx'),
+        ),
+    ]
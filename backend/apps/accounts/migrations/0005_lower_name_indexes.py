@@ -0,0 +1,52 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:33
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+# No PostgreSQL, LIKE 'pre%' só usa índice com text_pattern_ops (ou collation "C")
+PATTERN_INDEXES = {
+    'accounts_first_pattern_idx': 'first_name',
+    'accounts_last_pattern_idx': 'last_name',
+    'accounts_username_pattern_idx': 'username',
+}
+
+
+def create_pattern_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, column in PATTERN_INDEXES.items():
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON accounts_account '
+            f'(LOWER({column}) text_pattern_ops) WHERE is_active'
+        )
+
+
+def drop_pattern_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name in PATTERN_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_partial_active_indexes'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='account',
+            index=models.Index(django.db.models.functions.text.Lower('first_name'), django.db.models.functions.text.Lower('last_name'), condition=models.Q(('is_active', True)), name='accounts_name_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='account',
+            index=models.Index(django.db.models.functions.text.Lower('last_name'), condition=models.Q(('is_active', True)), name='accounts_last_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='account',
+            index=models.Index(django.db.models.functions.text.Lower('username'), condition=models.Q(('is_active', True)), name='accounts_username_lower_idx'),
+        ),
+        migrations.RunPython(create_pattern_indexes, drop_pattern_indexes),
+    ]
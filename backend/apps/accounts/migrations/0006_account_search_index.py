@@ -0,0 +1,43 @@
+from django.db import migrations
+
+# Mesmas expressões de apps/accounts/search.py
+FTS_TABLE = 'accounts_account_fts'
+SEARCH_DOCUMENT = "LOWER(first_name || ' ' || last_name || ' ' || username || ' ' || email)"
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS accounts_search_trgm_idx ON accounts_account '
+            f'USING GIN ({SEARCH_DOCUMENT} gin_trgm_ops)'
+        )
+    elif vendor == 'sqlite':
+        schema_editor.execute(
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5('
+            "username, first_name, last_name, email, tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        schema_editor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, username, first_name, last_name, email) '
+            'SELECT id, username, first_name, last_name, email FROM accounts_account'
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS accounts_search_trgm_idx')
+    elif vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_lower_name_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
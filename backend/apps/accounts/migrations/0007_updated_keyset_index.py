@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_account_search_index'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='account',
+            index=models.Index(fields=['updated_at', 'id'], name='accounts_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:51
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Sum
+
+
+def backfill_counters(apps, schema_editor):
+    # Só a tabela quente; meses já arquivados entram com `reconcile_seller_counters`
+    Account = apps.get_model('accounts', 'Account')
+    DailySales = apps.get_model('sales', 'DailySales')
+    rows = (
+        DailySales._default_manager.filter(is_active=True).values('seller_id')
+        .annotate(amount=Sum('total_amount'), commission=Sum('calculated_commission'), days=Count('id'), last=Max('sale_date'))
+        .order_by()
+    )
+    for row in rows:
+        Account.objects.filter(pk=row['seller_id']).update(
+            lifetime_sales_amount=row['amount'] or 0,
+            lifetime_commission=row['commission'] or 0,
+            active_sale_days=row['days'],
+            last_sale_date=row['last'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_updated_keyset_index'),
+        ('sales', '0005_updated_keyset_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='account',
+            name='active_sale_days',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Dias com Venda'),
+        ),
+        migrations.AddField(
+            model_name='account',
+            name='last_sale_date',
+            field=models.DateField(blank=True, editable=False, null=True, verbose_name='Última Venda'),
+        ),
+        migrations.AddField(
+            model_name='account',
+            name='lifetime_commission',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=12, verbose_name='Comissão Acumulada (R$)'),
+        ),
+        migrations.AddField(
+            model_name='account',
+            name='lifetime_sales_amount',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=14, verbose_name='Total Vendido (R$)'),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
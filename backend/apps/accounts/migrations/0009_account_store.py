@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def assign_default_store(apps, schema_editor):
+    # Instalação de loja única: vendedores e gerentes existentes ficam na loja
+    # padrão; administradores continuam com acesso à rede toda
+    Store = apps.get_model('stores', 'Store')
+    Account = apps.get_model('accounts', 'Account')
+    code = getattr(settings, 'DEFAULT_STORE_CODE', 'principal')
+    default = Store._default_manager.get_or_create(code=code, defaults={'name': 'Loja Principal'})[0]
+    Account._default_manager.exclude(user_type='ADMIN').filter(store__isnull=True).update(store_id=default.pk)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_seller_counters'),
+        ('stores', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='account',
+            name='store',
+            field=models.ForeignKey(blank=True, help_text='Deixe em branco para usuários da rede (veem todas as lojas)', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='accounts', to='stores.store', verbose_name='Loja'),
+        ),
+        migrations.AddIndex(
+            model_name='account',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['store', 'user_type', 'commission_active'], name='accounts_store_type_idx'),
+        ),
+        migrations.RunPython(assign_default_store, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+import apps.accounts.models
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def assign_store_to_storeless(apps, schema_editor):
+    # Vendedores/gerentes criados sem loja depois da 0009 enxergariam a rede
+    # toda; vão para a loja padrão (só administradores ficam sem loja)
+    Store = apps.get_model('stores', 'Store')
+    Account = apps.get_model('accounts', 'Account')
+    storeless = Account._default_manager.exclude(user_type='ADMIN').filter(store__isnull=True)
+    if not storeless.exists():
+        return
+    code = getattr(settings, 'DEFAULT_STORE_CODE', 'principal')
+    default = Store._default_manager.get_or_create(code=code, defaults={'name': 'Loja Principal'})[0]
+    storeless.update(store_id=default.pk)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_account_store'),
+        ('stores', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='account',
+            managers=[
+                ('objects', apps.accounts.models.AccountManager()),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='account',
+            name='store',
+            field=models.ForeignKey(blank=True, help_text='Obrigatória para vendedores e gerentes; em branco só para administradores da rede', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='accounts', to='stores.store', verbose_name='Loja'),
+        ),
+        migrations.RunPython(assign_store_to_storeless, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,54 @@
+from datetime import date
+from decimal import Decimal
+
+from django.db import migrations
+from django.db.models import Count, Max, Sum
+
+
+def backfill_counters(apps, schema_editor):
+    # A 0008 somou só a tabela quente: refaz os totais incluindo os resumos
+    # dos meses arquivados (mesma conta de `apps.accounts.counters.compute_counters`)
+    Account = apps.get_model('accounts', 'Account')
+    DailySales = apps.get_model('sales', 'DailySales')
+    ArchivedSalesMonth = apps.get_model('sales', 'ArchivedSalesMonth')
+
+    archived = {}
+    for month in ArchivedSalesMonth._default_manager.all():
+        for seller_id, values in month.seller_totals.items():
+            amount, commission, days, last = archived.get(int(seller_id), (Decimal('0'), Decimal('0'), 0, None))
+            month_last = date.fromisoformat(values[4]) if len(values) > 4 else None
+            archived[int(seller_id)] = (
+                amount + Decimal(values[0]),
+                commission + Decimal(values[1]),
+                days + values[2],
+                max(filter(None, (last, month_last)), default=None),
+            )
+    if not archived:
+        return
+
+    rows = (
+        DailySales._default_manager.filter(is_active=True, seller_id__in=list(archived)).values('seller_id')
+        .annotate(amount=Sum('total_amount'), commission=Sum('calculated_commission'), days=Count('id'), last=Max('sale_date'))
+        .order_by()
+    )
+    live = {row['seller_id']: row for row in rows}
+    for seller_id, (amount, commission, days, last) in archived.items():
+        row = live.get(seller_id, {'amount': 0, 'commission': 0, 'days': 0, 'last': None})
+        Account.objects.filter(pk=seller_id).update(
+            lifetime_sales_amount=amount + (row['amount'] or 0),
+            lifetime_commission=commission + (row['commission'] or 0),
+            active_sale_days=days + row['days'],
+            last_sale_date=max(filter(None, (last, row['last'])), default=None),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0010_storeless_non_admins'),
+        ('sales', '0009_archive_seller_last_sale'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,97 @@
+# Generated by Django 5.2.5 on 2026-10-19 16:59
+
+from django.db import migrations, models
+
+from apps.accounts.utils import fold_search
+
+# Índices LOWER(col) text_pattern_ops da 0005, trocados pelas colunas normalizadas
+PATTERN_INDEXES = {
+    'accounts_first_pattern_idx': 'first_name',
+    'accounts_last_pattern_idx': 'last_name',
+    'accounts_username_pattern_idx': 'username',
+}
+
+
+def fill_search_keys(apps, schema_editor):
+    Account = apps.get_model('accounts', 'Account')
+    accounts = Account._default_manager.only('first_name', 'last_name', 'username')
+    batch = []
+    for account in accounts.iterator(chunk_size=1000):
+        account.search_name = fold_search(f'{account.first_name} {account.last_name}')
+        account.search_last_name = fold_search(account.last_name)
+        account.search_username = fold_search(account.username)
+        batch.append(account)
+        if len(batch) == 1000:
+            Account._default_manager.bulk_update(batch, ['search_name', 'search_last_name', 'search_username'])
+            batch = []
+    Account._default_manager.bulk_update(batch, ['search_name', 'search_last_name', 'search_username'])
+
+
+def drop_pattern_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name in PATTERN_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+def create_pattern_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, column in PATTERN_INDEXES.items():
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON accounts_account '
+            f'(LOWER({column}) text_pattern_ops) WHERE is_active'
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0011_backfill_archived_counters'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('stores', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='account',
+            name='accounts_name_lower_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='account',
+            name='accounts_last_lower_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='account',
+            name='accounts_username_lower_idx',
+        ),
+        migrations.AddField(
+            model_name='account',
+            name='search_last_name',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='account',
+            name='search_name',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='account',
+            name='search_username',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(fill_search_keys, migrations.RunPython.noop),
+        migrations.RunPython(drop_pattern_indexes, create_pattern_indexes),
+        migrations.AddIndex(
+            model_name='account',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['search_name'], name='accounts_search_name_idx', opclasses=['text_pattern_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='account',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['search_last_name'], name='accounts_search_last_idx', opclasses=['text_pattern_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='account',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['search_username'], name='accounts_search_user_idx', opclasses=['text_pattern_ops']),
+        ),
+    ]
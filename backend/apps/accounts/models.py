@@ -1,8 +1,24 @@
 # apps/accounts/models.py
+from django.core.exceptions import ValidationError
 from django.db import models
-from django.contrib.auth.models import AbstractUser
-from apps.core.models import BaseModel
-from django.db.models import Sum, F, DecimalField
+from django.contrib.auth.models import AbstractUser, UserManager
+from apps.core.models import ActiveManager, BaseModel
+from django.db.models import Q, Sum, F, DecimalField
+from .utils import fold_search
+
+# Colunas normalizadas do autocomplete e os campos de onde saem
+SEARCH_KEY_SOURCES = {
+    "search_name": ("first_name", "last_name"),
+    "search_last_name": ("last_name",),
+    "search_username": ("username",),
+}
+
+
+class AccountManager(UserManager):
+    def create_superuser(self, username, email=None, password=None, **extra_fields):
+        # Superusuário é administrador da rede (o único tipo que fica sem loja)
+        extra_fields.setdefault("user_type", self.model.UserType.ADMIN)
+        return super().create_superuser(username, email, password, **extra_fields)
 
 
 class Account(AbstractUser, BaseModel):
@@ -35,6 +51,17 @@ class Account(AbstractUser, BaseModel):
     )
     phone = models.CharField(max_length=15, blank=True, verbose_name="Telefone")
 
+    # Loja do usuário; vazio só para administradores da rede (apps/stores/tenancy.py)
+    store = models.ForeignKey(
+        "stores.Store",
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name="accounts",
+        verbose_name="Loja",
+        help_text="Obrigatória para vendedores e gerentes; em branco só para administradores da rede",
+    )
+
     # Controles específicos para comissão
     commission_rate = models.DecimalField(
         max_digits=5,
@@ -58,9 +85,52 @@ class Account(AbstractUser, BaseModel):
         blank=True, null=True, verbose_name="Data de Nascimento"
     )
 
+    # Totais das vendas ativas, mantidos por apps/accounts/counters.py
+    lifetime_sales_amount = models.DecimalField(
+        max_digits=14, decimal_places=2, default=0, editable=False,
+        verbose_name="Total Vendido (R$)",
+    )
+    lifetime_commission = models.DecimalField(
+        max_digits=12, decimal_places=2, default=0, editable=False,
+        verbose_name="Comissão Acumulada (R$)",
+    )
+    last_sale_date = models.DateField(
+        blank=True, null=True, editable=False, verbose_name="Última Venda"
+    )
+    active_sale_days = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name="Dias com Venda"
+    )
+
+    # Nome completo, sobrenome e username sem acento e em casefold, para a
+    # busca por prefixo do autocomplete (apps/accounts/autocomplete.py)
+    search_name = models.TextField(blank=True, default="", editable=False)
+    search_last_name = models.TextField(blank=True, default="", editable=False)
+    search_username = models.TextField(blank=True, default="", editable=False)
+
+    # `objects` continua sendo o UserManager (todos, para login e admin)
+    objects = AccountManager()
+    active_objects = ActiveManager()
+
     def __str__(self):
         return self.get_full_name() or self.username
 
+    def save(self, *args, **kwargs):
+        # Saves parciais só recalculam as colunas de busca se o nome mudou
+        update_fields = kwargs.get("update_fields")
+        sources = {field for fields in SEARCH_KEY_SOURCES.values() for field in fields}
+        if update_fields is None or set(update_fields) & sources:
+            for column, fields in SEARCH_KEY_SOURCES.items():
+                setattr(self, column, fold_search(" ".join(getattr(self, field) for field in fields)))
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, *SEARCH_KEY_SOURCES}
+        super().save(*args, **kwargs)
+
+    def clean(self):
+        super().clean()
+        # Sem loja o usuário enxerga a rede toda: só administradores
+        if self.store_id is None and self.user_type != self.UserType.ADMIN:
+            raise ValidationError({"store": "Vendedores e gerentes precisam estar vinculados a uma loja."})
+
     def is_seller(self):
         """Verifica se o usuário é um vendedor ativo para comissões."""
         return (
@@ -70,7 +140,10 @@ class Account(AbstractUser, BaseModel):
         )
 
     def total_sold(self, start_date=None, end_date=None):
-        qs = self.daily_sales.filter(is_active=True)
+        # Sem período: total acumulado, sem consulta
+        if start_date is None and end_date is None:
+            return self.lifetime_sales_amount
+        qs = self.daily_sales.active()
         if start_date:
             qs = qs.filter(sale_date__gte=start_date)
         if end_date:
@@ -79,7 +152,9 @@ class Account(AbstractUser, BaseModel):
         return result["total"] or 0
 
     def total_commission_paid(self, start_date=None, end_date=None):
-        qs = self.daily_sales.filter(is_active=True)
+        if start_date is None and end_date is None:
+            return self.lifetime_commission
+        qs = self.daily_sales.active()
         if start_date:
             qs = qs.filter(sale_date__gte=start_date)
         if end_date:
@@ -90,7 +165,25 @@ class Account(AbstractUser, BaseModel):
     class Meta:
         verbose_name = "Usuário"
         verbose_name_plural = "Usuários"
+        default_manager_name = "objects"
         indexes = [
-            # Índice para consultas de vendedores ativos
-            models.Index(fields=["user_type", "commission_active", "is_active"]),
+            # Índice parcial para consultas de vendedores ativos
+            models.Index(
+                fields=["user_type", "commission_active"],
+                condition=Q(is_active=True),
+                name="accounts_active_type_idx",
+            ),
+            # Mesmo filtro dentro de uma loja (tenant primeiro)
+            models.Index(
+                fields=["store", "user_type", "commission_active"],
+                condition=Q(is_active=True),
+                name="accounts_store_type_idx",
+            ),
+            # Busca por prefixo do autocomplete (apps/accounts/autocomplete.py)
+            # (text_pattern_ops só no PostgreSQL, para o LIKE 'pre%'; os outros bancos ignoram)
+            models.Index(fields=["search_name"], opclasses=["text_pattern_ops"], condition=Q(is_active=True), name="accounts_search_name_idx"),
+            models.Index(fields=["search_last_name"], opclasses=["text_pattern_ops"], condition=Q(is_active=True), name="accounts_search_last_idx"),
+            models.Index(fields=["search_username"], opclasses=["text_pattern_ops"], condition=Q(is_active=True), name="accounts_search_user_idx"),
+            # Keyset do feed de alterações (apps/integrations/changes.py)
+            models.Index(fields=["updated_at", "id"], name="accounts_updated_idx"),
         ]
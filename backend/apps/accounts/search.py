@@ -0,0 +1,211 @@
+# apps/accounts/search.py
+"""
+Busca textual de usuários (username, nome, sobrenome e e-mail) com
+resultados ordenados por relevância.
+
+O texto pesquisável fica em um índice próprio por banco:
+- PostgreSQL: índice GIN `pg_trgm` sobre
+  `LOWER(first_name || ' ' || last_name || ' ' || username || ' ' || email)`;
+  o `LIKE '%termo%'` usa o índice e `word_similarity` dá o ranking
+- SQLite: tabela virtual FTS5 `accounts_account_fts` (rowid = id do
+  Account), mantida pelos signals de `Account`; busca por prefixo de
+  palavra com ranking `bm25`
+
+Os dois são criados pela migração 0006. `rebuild_search_index` refaz o
+índice do SQLite depois de cargas que não disparam signals
+(`bulk_create`, `update`).
+
+`AccountSearchFilter` substitui o `SearchFilter` do DRF: filtra a view
+por uma subconsulta com todas as contas que casam (`search_account_field`:
+'pk' para contas, 'seller' para vendas e relatórios), sem limite. Sem
+`?ordering=` explícito, as `SEARCH_MAX_MATCHES` contas mais relevantes
+vêm primeiro, por relevância, e o restante depois, na ordem padrão.
+Em bancos sem índice de busca cai no `icontains` do `SearchFilter`.
+
+Os dois índices não casam exatamente os mesmos textos:
+- PostgreSQL casa qualquer trecho ("runo" acha "Bruno") e compara acentos
+  ("joao" não acha "João")
+- SQLite casa início de palavra ("bru" acha "Bruno", "runo" não), ignora
+  acentos e quebra o e-mail em palavras ("gmail" acha "ana@gmail.com")
+Termos digitados desde o início das palavras, com a acentuação correta,
+dão o mesmo resultado nos dois.
+"""
+from django.conf import settings
+from django.db import connections
+from django.db.models import Case, IntegerField, Value, When
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+
+from .models import Account
+
+SEARCH_MAX_MATCHES = getattr(settings, 'SEARCH_MAX_MATCHES', 500)
+
+# Colunas indexadas; saves que não tocam nelas não reindexam
+SEARCH_COLUMNS = ('username', 'first_name', 'last_name', 'email')
+
+FTS_TABLE = 'accounts_account_fts'
+
+SEARCH_DOCUMENT = (
+    "LOWER(first_name || ' ' || last_name || ' ' || username || ' ' || email)"
+)
+
+
+def _like_pattern(term):
+    escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escaped}%'
+
+
+def _fts_query(terms):
+    # Cada termo vira uma frase com prefixo: "bru"* "vid"* (E implícito)
+    return ' '.join('"{}"*'.format(term.replace('"', '""')) for term in terms)
+
+
+def _postgres_condition(terms):
+    conditions = ' AND '.join(f'{SEARCH_DOCUMENT} LIKE %s' for _ in terms)
+    return f'SELECT id FROM accounts_account WHERE {conditions}', [_like_pattern(term) for term in terms]
+
+
+def _postgres_matches(cursor, terms, limit):
+    sql, params = _postgres_condition(terms)
+    cursor.execute(
+        f'{sql} ORDER BY word_similarity(%s, {SEARCH_DOCUMENT}) DESC, id LIMIT %s',
+        [*params, ' '.join(terms), limit],
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
+def _sqlite_condition(terms):
+    return f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [_fts_query(terms)]
+
+
+def _sqlite_matches(cursor, terms, limit):
+    sql, params = _sqlite_condition(terms)
+    cursor.execute(f'{sql} ORDER BY bm25({FTS_TABLE}), rowid LIMIT %s', [*params, limit])
+    return [row[0] for row in cursor.fetchall()]
+
+
+# Aliases de banco onde a tabela FTS5 já foi encontrada
+_indexed_aliases = set()
+
+
+def _sqlite_has_index(connection):
+    if connection.alias not in _indexed_aliases:
+        if FTS_TABLE not in connection.introspection.table_names():
+            return False
+        _indexed_aliases.add(connection.alias)
+    return True
+
+
+def search_accounts(query, using=None, limit=SEARCH_MAX_MATCHES):
+    """
+    Ids das contas (ativas ou não) que casam com todos os termos de
+    `query`, do mais relevante para o menos. None se o banco não tiver
+    índice de busca.
+    """
+    terms = [term for term in query.lower().split() if term]
+    if not terms:
+        return []
+    connection = connections[using or Account.objects.db]
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            return _postgres_matches(cursor, terms, limit)
+        if connection.vendor == 'sqlite' and _sqlite_has_index(connection):
+            return _sqlite_matches(cursor, terms, limit)
+    return None
+
+
+def search_subquery(query, using=None):
+    """
+    Subconsulta (RawSQL) com os ids de todas as contas que casam com
+    `query`, sem limite, para `__in`. None se o banco não tiver índice.
+    """
+    terms = [term for term in query.lower().split() if term]
+    connection = connections[using or Account.objects.db]
+    if connection.vendor == 'postgresql':
+        return RawSQL(*_postgres_condition(terms))
+    if connection.vendor == 'sqlite' and _sqlite_has_index(connection):
+        return RawSQL(*_sqlite_condition(terms))
+    return None
+
+
+# ------------------------------------------
+# Manutenção do índice FTS5 (somente SQLite)
+# ------------------------------------------
+def _sqlite_connection(using=None):
+    connection = connections[using or Account.objects.db]
+    if connection.vendor != 'sqlite' or not _sqlite_has_index(connection):
+        return None
+    return connection
+
+
+def index_account(account, using=None):
+    connection = _sqlite_connection(using)
+    if connection is None:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [account.pk])
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, username, first_name, last_name, email) VALUES (%s, %s, %s, %s, %s)',
+            [account.pk, account.username, account.first_name, account.last_name, account.email],
+        )
+
+
+def unindex_account(pk, using=None):
+    connection = _sqlite_connection(using)
+    if connection is None:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [pk])
+
+
+def rebuild_index(using=None):
+    """Recria o conteúdo do índice FTS5 a partir de accounts_account."""
+    connection = _sqlite_connection(using)
+    if connection is None:
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, username, first_name, last_name, email) '
+            'SELECT id, username, first_name, last_name, email FROM accounts_account'
+        )
+        return cursor.rowcount
+
+
+# ------------------------------------------
+# Filter backend do DRF
+# ------------------------------------------
+class AccountSearchFilter(filters.SearchFilter):
+    """
+    `?search=` pelo índice de busca de contas, com ranking.
+
+    Na view:
+        filter_backends = [..., AccountSearchFilter]
+        search_account_field = 'seller'   # padrão: 'pk'
+        search_fields = [...]             # usado só sem índice de busca
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        matches = search_subquery(' '.join(terms), using=queryset.db)
+        if matches is None:
+            return super().filter_queryset(request, queryset, view)
+
+        # Filtro sem limite: nenhuma conta que casa fica de fora
+        field = getattr(view, 'search_account_field', 'pk')
+        queryset = queryset.filter(**{f'{field}__in': matches})
+        if filters.OrderingFilter.ordering_param in request.query_params:
+            return queryset
+        # Relevância só para as primeiras contas; as demais vêm depois
+        ids = search_accounts(' '.join(terms), using=queryset.db)
+        if not ids:
+            return queryset
+        rank = Case(
+            *(When(**{field: pk}, then=Value(position)) for position, pk in enumerate(ids)),
+            default=Value(len(ids)),
+            output_field=IntegerField(),
+        )
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        return queryset.alias(search_rank=rank).order_by('search_rank', *ordering)
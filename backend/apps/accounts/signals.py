@@ -1,8 +1,14 @@
 # apps/accounts/signals.py
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.contrib.auth.models import Group
+from rest_framework.authtoken.models import Token
+from apps.sales.models import DailySales
+from .autocomplete import autocomplete_cache
+from .backends import invalidate_token, invalidate_user
+from .counters import apply_sale_change, sale_contributions
 from .models import Account
+from .search import SEARCH_COLUMNS, index_account, unindex_account
 
 @receiver(post_save, sender=Account)
 def set_user_group(sender, instance, created, **kwargs):
@@ -26,3 +32,45 @@ def set_user_group(sender, instance, created, **kwargs):
         group = Group.objects.get(name='Seller')
 
     instance.groups.add(group)
+
+
+@receiver([post_save, post_delete], sender=Account)
+def invalidate_account_cache(sender, instance, **kwargs):
+    """
+    Remove o usuário (e os tokens dele) do cache de autenticação sempre que
+    o Account muda: edição, desativação ou troca de senha.
+    """
+    invalidate_user(instance.pk)
+    # Nomes e status mudam os resultados do autocomplete
+    autocomplete_cache.clear()
+
+
+@receiver(post_save, sender=Account)
+def sync_search_index(sender, instance, update_fields=None, using=None, **kwargs):
+    """Mantém o índice de busca (FTS5 no SQLite) igual aos dados do Account."""
+    # Saves parciais sem colunas pesquisáveis (ex.: last_login) não reindexam
+    if update_fields and not set(update_fields) & set(SEARCH_COLUMNS):
+        return
+    index_account(instance, using=using)
+
+
+@receiver(post_delete, sender=Account)
+def remove_from_search_index(sender, instance, using=None, **kwargs):
+    unindex_account(instance.pk, using=using)
+
+
+@receiver([post_save, post_delete], sender=Token)
+def invalidate_token_cache(sender, instance, **kwargs):
+    """Rotação ou remoção de token invalida a chave no cache."""
+    invalidate_token(instance.key)
+
+
+
+@receiver([post_save, post_delete], sender=DailySales)
+def update_seller_counters(sender, instance, created=False, using=None, **kwargs):
+    """Aplica nos totais do vendedor a diferença causada pela venda."""
+    if kwargs.get('signal') is post_delete:
+        action = 'deleted'
+    else:
+        action = 'created' if created else 'updated'
+    apply_sale_change(*sale_contributions(instance, action), using=using)
@@ -1,3 +1,42 @@
 from django.test import TestCase
 
-# Create your tests here.
+from apps.stores.models import Store
+from .autocomplete import autocomplete_cache, search_prefix
+from .models import Account
+
+
+class AutocompleteTests(TestCase):
+    """Busca por prefixo sem diferenciar acentos nem maiúsculas."""
+
+    @classmethod
+    def setUpTestData(cls):
+        store_id = Store.default_id()
+        cls.erica = Account.objects.create_user(
+            'erica', 'erica@example.com', 'x', document='10', store_id=store_id,
+            first_name='Érica', last_name='Müller',
+        )
+        cls.bruno = Account.objects.create_user(
+            'bvidal', 'bruno@example.com', 'x', document='11', store_id=store_id,
+            first_name='Bruno', last_name='Vidal',
+        )
+
+    def setUp(self):
+        autocomplete_cache.clear()
+
+    def names(self, query):
+        return [row['name'] for row in search_prefix(query)]
+
+    def test_accents_and_case_are_ignored(self):
+        self.assertEqual(self.names('éri'), ['Érica Müller'])
+        self.assertEqual(self.names('ERI'), ['Érica Müller'])
+        self.assertEqual(self.names('mull'), ['Érica Müller'])
+        self.assertEqual(self.names('érica mü'), ['Érica Müller'])
+        self.assertEqual(self.names('bruno vi'), ['Bruno Vidal'])
+        self.assertEqual(self.names('bvi'), ['Bruno Vidal'])
+
+    def test_partial_save_refreshes_search_keys(self):
+        self.bruno.last_name = 'Araújo'
+        self.bruno.save(update_fields=['last_name'])
+
+        self.assertEqual(self.names('arau'), ['Bruno Araújo'])
+        self.assertEqual(self.names('vid'), [])
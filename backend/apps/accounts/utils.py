@@ -1,4 +1,6 @@
 # Funções de verificação de tipo de usuário
+import unicodedata
+
 
 def is_administrador(user):
     return getattr(user, "user_type", None) == "ADMIN"
@@ -11,3 +13,13 @@ def is_gerente(user):
     """Verifica se o usuário é um caixa."""
     return getattr(user, "user_type", None) == "MANAGER"
 
+
+def fold_search(value):
+    """
+    Forma de busca de um texto: sem acentos, casefold e espaços simples
+    ("  Érica  Müller" -> "erica muller"). O LOWER() do SQLite só converte
+    ASCII, por isso o autocomplete compara com colunas já normalizadas.
+    """
+    decomposed = unicodedata.normalize("NFKD", value or "")
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.casefold().split())
@@ -1,11 +1,16 @@
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib.auth.views import LoginView, LogoutView
-from django.shortcuts import render
+from datetime import date
+
+from django.core.paginator import Paginator
+from django.db.models import Count, FilteredRelation, Q, Sum
+from django.shortcuts import redirect, render
 from django.urls import reverse_lazy
 from django.utils.decorators import method_decorator
 from django.views.generic import CreateView, View
 from django.contrib import messages
+from apps.stores.tenancy import scope_queryset, user_store_id
 from .forms import LoginForm, SellerForm
 from .models import Account
 from .utils import is_administrador, is_vendedor
@@ -48,6 +53,9 @@ class CreateTeamMemberView(CreateView):
     template_name = 'accounts/equipe.html'
     success_url = reverse_lazy('accounts:equipe')
 
+    def get_form_kwargs(self):
+        return {**super().get_form_kwargs(), 'user': self.request.user}
+
     def form_valid(self, form):
         messages.success(self.request, 'Membro da equipe criado com sucesso.')
         return super().form_valid(form)
@@ -65,26 +73,93 @@ class CreateTeamMemberView(CreateView):
 @method_decorator([login_required, user_passes_test(is_administrador, login_url=reverse_lazy('dashboard:dashboard'))], name='dispatch')
 class EquipeView(View):
     template_name = 'accounts/equipe.html'
+    paginate_by = 25
 
     def get(self, request, *args, **kwargs):
-        form = SellerForm()
-        membros = Account.objects.all()
-        return render(request, self.template_name, {'form': form, 'membros': membros})
+        return render(request, self.template_name, self.get_context_data(form=SellerForm(user=request.user)))
 
     def post(self, request, *args, **kwargs):
-        form = SellerForm(request.POST)
-        membros = Account.objects.all()
+        form = SellerForm(request.POST, user=request.user)
         if form.is_valid():
             form.save()
             messages.success(request, 'Membro da equipe criado com sucesso.')
-            form = SellerForm()  # Limpa o formulário após o sucesso
-        else:
-            messages.error(
-                request,
-                'Erro ao criar membro da equipe. Verifique os dados e tente novamente.',
-                extra_tags='danger'
+            # Post/Redirect/Get: a listagem é montada uma vez, no GET seguinte
+            return redirect('accounts:equipe')
+
+        messages.error(
+            request,
+            'Erro ao criar membro da equipe. Verifique os dados e tente novamente.',
+            extra_tags='danger'
+        )
+        return render(request, self.template_name, self.get_context_data(form=form))
+
+    def get_members(self):
+        """Membros visíveis para o usuário: os da sua loja, ou a rede toda."""
+        return scope_queryset(Account.objects.all(), user_store_id(self.request.user))
+
+    def get_stats(self):
+        """Totais dos cards em uma única consulta agregada."""
+        return self.get_members().aggregate(
+            total=Count('id'),
+            active=Count('id', filter=Q(is_active=True)),
+            sellers=Count('id', filter=Q(user_type=Account.UserType.SELLER)),
+            managers=Count('id', filter=Q(user_type=Account.UserType.MANAGER)),
+            admins=Count('id', filter=Q(user_type=Account.UserType.ADMIN)),
+        )
+
+    def get_filters(self):
+        params = self.request.GET
+        return {
+            'q': params.get('q', '').strip(),
+            'role': params.get('role', ''),
+            'status': params.get('status', ''),
+        }
+
+    def get_queryset(self, filters):
+        """Membros filtrados, com vendas e comissão do mês corrente no mesmo SELECT."""
+        today = date.today()
+        # Condição no próprio JOIN: só as vendas do mês entram, não o histórico inteiro
+        queryset = self.get_members().annotate(
+            month_daily_sales=FilteredRelation('daily_sales', condition=Q(
+                daily_sales__sale_date__range=(today.replace(day=1), today),
+                daily_sales__is_active=True,
+            )),
+        ).annotate(
+            month_sales=Sum('month_daily_sales__total_amount'),
+            month_commission=Sum('month_daily_sales__calculated_commission'),
+        )
+
+        if filters['q']:
+            queryset = queryset.filter(
+                Q(username__icontains=filters['q'])
+                | Q(first_name__icontains=filters['q'])
+                | Q(last_name__icontains=filters['q'])
+                | Q(email__icontains=filters['q'])
             )
-        return render(request, self.template_name, {'form': form, 'membros': membros})
+        if filters['role'] in Account.UserType.values:
+            queryset = queryset.filter(user_type=filters['role'])
+        if filters['status'] in ('active', 'inactive'):
+            queryset = queryset.filter(is_active=filters['status'] == 'active')
+
+        return queryset.order_by('-is_active', 'first_name', 'username')
+
+    def get_context_data(self, **kwargs):
+        filters = self.get_filters()
+        page_obj = Paginator(self.get_queryset(filters), self.paginate_by).get_page(self.request.GET.get('page'))
+
+        # Querystring dos filtros, preservada nos links de paginação
+        query = self.request.GET.copy()
+        query.pop('page', None)
+
+        return {
+            'membros': page_obj.object_list,
+            'page_obj': page_obj,
+            'stats': self.get_stats(),
+            'filters': filters,
+            'filters_active': any(filters.values()),
+            'filter_query': query.urlencode(),
+            **kwargs,
+        }
 
 
 from django.contrib.auth.decorators import login_required
@@ -0,0 +1,22 @@
+from django.contrib import admin
+
+from apps.stores.mixins import StoreScopedAdminMixin
+from .models import ChangeEvent
+
+
+@admin.register(ChangeEvent)
+class ChangeEventAdmin(StoreScopedAdminMixin, admin.ModelAdmin):
+    list_display = ('created_at', 'action', 'content_type', 'object_id', 'store', 'actor')
+    list_filter = ('action', 'content_type', 'store')
+    list_select_related = ('content_type', 'actor', 'store')
+    show_full_result_count = False
+
+    # Log somente leitura
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,14 @@
+from rest_framework import serializers
+from ..models import ChangeEvent
+
+
+class ChangeEventSerializer(serializers.ModelSerializer):
+    model = serializers.SerializerMethodField()
+    actor = serializers.StringRelatedField()
+
+    class Meta:
+        model = ChangeEvent
+        fields = ['id', 'model', 'object_id', 'action', 'changes', 'actor', 'actor_id', 'store', 'created_at']
+
+    def get_model(self, obj):
+        return obj.content_type.model
@@ -0,0 +1,7 @@
+from rest_framework.routers import DefaultRouter
+from .views import ChangeEventViewSet
+
+router = DefaultRouter()
+router.register(r'audit/events', ChangeEventViewSet, basename='audit-event')  # -> /api/v1/audit/events/
+
+urlpatterns = router.urls
@@ -0,0 +1,35 @@
+import django_filters
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import permissions, viewsets
+
+from apps.core.pagination import StandardCursorPagination
+from apps.stores.mixins import StoreScopedViewMixin
+from ..models import ChangeEvent
+from .serializers import ChangeEventSerializer
+
+
+class ChangeEventFilter(django_filters.FilterSet):
+    model = django_filters.CharFilter(field_name='content_type__model', lookup_expr='iexact')
+    created_after = django_filters.IsoDateTimeFilter(field_name='created_at', lookup_expr='gte')
+    created_before = django_filters.IsoDateTimeFilter(field_name='created_at', lookup_expr='lt')
+
+    class Meta:
+        model = ChangeEvent
+        fields = ['model', 'object_id', 'action', 'actor']
+
+
+class ChangeEventViewSet(StoreScopedViewMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Log de auditoria (somente leitura, apenas administradores).
+    🏬 Restrito à loja da requisição (apps/stores/tenancy.py).
+    Paginação por cursor, do evento mais recente para o mais antigo.
+
+    /api/v1/audit/events/?model=dailysales&object_id=42
+    /api/v1/audit/events/?actor=3&action=UPDATE&created_after=2025-08-01T00:00:00
+    """
+    queryset = ChangeEvent.objects.select_related('content_type', 'actor')
+    serializer_class = ChangeEventSerializer
+    permission_classes = [permissions.IsAdminUser]
+    pagination_class = StandardCursorPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = ChangeEventFilter
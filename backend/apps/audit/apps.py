@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class AuditConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.audit'
+    verbose_name = 'Auditoria'
+
+    def ready(self):
+        import apps.audit.signals
@@ -0,0 +1,98 @@
+# apps/audit/buffer.py
+"""
+Buffer de eventos de auditoria por requisição (write-behind).
+
+Cada alteração auditada vira um `ChangeEvent` não salvo. Ele só entra no
+buffer quando a transação que fez a alteração é confirmada (`on_commit`),
+então rollbacks não deixam rastro. O `AuditMiddleware` grava todo o buffer
+com um único `bulk_create` ao fim da requisição.
+
+Fora de uma requisição (comandos, shell) os eventos de cada transação são
+gravados juntos no commit.
+"""
+import logging
+from contextvars import ContextVar
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ChangeEvent
+
+logger = logging.getLogger(__name__)
+
+# Lista de eventos confirmados da requisição atual (None fora de requisições)
+_request_buffer = ContextVar('audit_request_buffer', default=None)
+
+
+class request_scope:
+    """Abre um buffer para a requisição; `flush(actor)` grava os eventos pendentes."""
+
+    def __enter__(self):
+        self.events = []
+        self._token = _request_buffer.set(self.events)
+        return self
+
+    def __exit__(self, *exc_info):
+        _request_buffer.reset(self._token)
+
+    def flush(self, actor=None):
+        events, self.events[:] = list(self.events), []
+        if not events:
+            return 0
+        for event in events:
+            if event.actor_id is None and actor is not None:
+                event.actor = actor
+        try:
+            ChangeEvent.objects.bulk_create(events)
+        except Exception:
+            # A auditoria não pode derrubar uma requisição já confirmada
+            logger.exception("Falha ao gravar %s eventos de auditoria", len(events))
+            return 0
+        return len(events)
+
+
+def _build(content_type, object_id, action, changes, actor, created_at, store_id=None):
+    return ChangeEvent(
+        content_type=content_type,
+        object_id=object_id,
+        action=action,
+        changes={name: list(values) for name, values in changes.items()},
+        actor=actor,
+        store_id=store_id,
+        created_at=created_at,
+    )
+
+
+def _enqueue(events, using):
+    def commit():
+        buffer = _request_buffer.get()
+        if buffer is not None:
+            buffer.extend(events)
+        else:
+            ChangeEvent.objects.bulk_create(events)
+    transaction.on_commit(commit, using=using)
+
+
+def record(instance, action, changes, actor=None, using=None):
+    """Registra a alteração de `instance` para quando a transação atual confirmar."""
+    content_type = ContentType.objects.get_for_model(instance, for_concrete_model=True)
+    event = _build(content_type, instance.pk, action, changes, actor, timezone.now(), getattr(instance, 'store_id', None))
+    _enqueue([event], using)
+    return event
+
+
+def record_many(model, changes_by_pk, action, actor=None, created_at=None, using=None, stores=None):
+    """
+    Versão em lote de `record` para alterações feitas com UPDATE direto.
+    `stores`: {pk: store_id} dos objetos alterados.
+    """
+    content_type = ContentType.objects.get_for_model(model, for_concrete_model=True)
+    created_at = created_at or timezone.now()
+    stores = stores or {}
+    events = [
+        _build(content_type, pk, action, changes, actor, created_at, stores.get(pk))
+        for pk, changes in changes_by_pk.items()
+    ]
+    _enqueue(events, using)
+    return events
@@ -0,0 +1,40 @@
+# apps/audit/middleware.py
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+
+from .buffer import request_scope
+
+
+class AuditMiddleware:
+    """
+    Agrupa os eventos de auditoria da requisição e grava todos com um único
+    INSERT ao final. O autor é o `request.user` resolvido pela view (sessão
+    ou token do DRF, que também atribui o usuário ao HttpRequest).
+
+    Híbrido: sob ASGI não força a cadeia de middlewares para o modo síncrono;
+    a gravação (banco e `request.user` preguiçoso) roda em `sync_to_async`.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with request_scope() as scope:
+            response = self.get_response(request)
+            self.flush(scope, request)
+        return response
+
+    async def __acall__(self, request):
+        with request_scope() as scope:
+            response = await self.get_response(request)
+            await sync_to_async(self.flush)(scope, request)
+        return response
+
+    def flush(self, scope, request):
+        user = getattr(request, 'user', None)
+        scope.flush(actor=user if user is not None and user.is_authenticated else None)
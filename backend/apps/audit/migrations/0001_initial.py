@@ -0,0 +1,37 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:27
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeEvent',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('object_id', models.PositiveBigIntegerField(verbose_name='ID do objeto')),
+                ('action', models.CharField(choices=[('CREATE', 'Criação'), ('UPDATE', 'Alteração'), ('DELETE', 'Exclusão')], max_length=10, verbose_name='Ação')),
+                ('changes', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder, help_text='{"campo": [valor anterior, valor novo]}', verbose_name='Alterações')),
+                ('created_at', models.DateTimeField(verbose_name='Registrado em')),
+                ('actor', models.ForeignKey(blank=True, help_text='Usuário autenticado na requisição (vazio em comandos e tarefas)', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Autor')),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='contenttypes.contenttype', verbose_name='Modelo')),
+            ],
+            options={
+                'verbose_name': 'Evento de Auditoria',
+                'verbose_name_plural': 'Eventos de Auditoria',
+                'ordering': ['-id'],
+                'indexes': [models.Index(fields=['content_type', 'object_id', 'id'], name='audit_object_idx'), models.Index(fields=['actor', 'id'], name='audit_actor_idx')],
+            },
+        ),
+    ]
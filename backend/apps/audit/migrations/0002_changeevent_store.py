@@ -0,0 +1,55 @@
+# Generated by Django 5.2.5 on 2026-10-19 16:51
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+AUDITED = (('sales', 'DailySales'), ('commissions', 'MonthlyCommissionReport'))
+
+
+def backfill_store(apps, schema_editor):
+    # Loja do objeto auditado; objetos já excluídos: a loja guardada no próprio evento
+    ChangeEvent = apps.get_model('audit', 'ChangeEvent')
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    for app_label, model_name in AUDITED:
+        content_type = ContentType.objects.filter(app_label=app_label, model=model_name.lower()).first()
+        if content_type is None:
+            continue
+        model = apps.get_model(app_label, model_name)
+        store = model._default_manager.filter(pk=OuterRef('object_id')).values('store_id')[:1]
+        events = ChangeEvent.objects.filter(content_type=content_type)
+        events.update(store_id=Subquery(store))
+
+        orphans = []
+        for event in events.filter(store__isnull=True).only('id', 'changes').iterator(chunk_size=2000):
+            values = event.changes.get('store_id') or [None, None]
+            event.store_id = values[1] if values[1] is not None else values[0]
+            if event.store_id is not None:
+                orphans.append(event)
+        ChangeEvent.objects.bulk_update(orphans, ['store'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0001_initial'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('stores', '0001_initial'),
+        ('sales', '0009_archive_seller_last_sale'),
+        ('commissions', '0012_report_store_required'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='changeevent',
+            name='store',
+            field=models.ForeignKey(blank=True, help_text='Loja do objeto alterado (vazio para objetos sem loja)', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='stores.store', verbose_name='Loja'),
+        ),
+        migrations.AddIndex(
+            model_name='changeevent',
+            index=models.Index(fields=['store', 'id'], name='audit_store_idx'),
+        ),
+        migrations.RunPython(backfill_store, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,86 @@
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class ChangeEvent(models.Model):
+    """
+    Registro imutável (append-only) de uma alteração em um objeto auditado.
+
+    Não herda de BaseModel: um evento nunca é editado nem desativado, então
+    `is_active`/`updated_at` não fazem sentido aqui.
+
+    `changes` guarda só os campos alterados: {"campo": [antes, depois]}.
+    `store` é a loja do objeto no momento da alteração (escopo por loja na
+    API e no admin, como nos demais registros).
+    """
+
+    class Action(models.TextChoices):
+        CREATE = "CREATE", "Criação"
+        UPDATE = "UPDATE", "Alteração"
+        DELETE = "DELETE", "Exclusão"
+
+    id = models.BigAutoField(primary_key=True)
+
+    content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.PROTECT,
+        related_name='+',
+        verbose_name="Modelo"
+    )
+    object_id = models.PositiveBigIntegerField(verbose_name="ID do objeto")
+
+    action = models.CharField(max_length=10, choices=Action.choices, verbose_name="Ação")
+
+    changes = models.JSONField(
+        default=dict,
+        encoder=DjangoJSONEncoder,
+        verbose_name="Alterações",
+        help_text='{"campo": [valor anterior, valor novo]}'
+    )
+
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name="Autor",
+        help_text="Usuário autenticado na requisição (vazio em comandos e tarefas)"
+    )
+
+    store = models.ForeignKey(
+        'stores.Store',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name="Loja",
+        help_text="Loja do objeto alterado (vazio para objetos sem loja)"
+    )
+
+    created_at = models.DateTimeField(verbose_name="Registrado em")
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Eventos de auditoria não podem ser alterados.")
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValueError("Eventos de auditoria não podem ser excluídos.")
+
+    def __str__(self):
+        return f"{self.get_action_display()} {self.content_type.model} #{self.object_id}"
+
+    class Meta:
+        verbose_name = "Evento de Auditoria"
+        verbose_name_plural = "Eventos de Auditoria"
+        ordering = ['-id']
+        indexes = [
+            # Histórico de um objeto e "o que este usuário alterou"
+            models.Index(fields=['content_type', 'object_id', 'id'], name='audit_object_idx'),
+            models.Index(fields=['actor', 'id'], name='audit_actor_idx'),
+            # Log de uma loja (API e admin com escopo de loja)
+            models.Index(fields=['store', 'id'], name='audit_store_idx'),
+        ]
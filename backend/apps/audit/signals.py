@@ -0,0 +1,61 @@
+# apps/audit/signals.py
+from django.db.models.signals import post_delete, post_save
+
+from apps.commissions.models import MonthlyCommissionReport
+from apps.commissions.signals import reports_transitioned
+from apps.sales.models import DailySales
+from apps.sales.signals import sales_updated
+from .buffer import record, record_many
+from .models import ChangeEvent
+
+AUDITED_MODELS = (DailySales, MonthlyCommissionReport)
+
+
+def audit_save(sender, instance, created, raw=False, using=None, **kwargs):
+    """Criação ou alteração: registra só os campos que mudaram."""
+    if raw:
+        return
+    changes = getattr(instance, '_tracked_changes', {})
+    if not created and not changes:
+        return
+    action = ChangeEvent.Action.CREATE if created else ChangeEvent.Action.UPDATE
+    record(instance, action, changes, using=using)
+
+
+def audit_delete(sender, instance, using=None, **kwargs):
+    """Exclusão definitiva: guarda os últimos valores."""
+    changes = {name: (value, None) for name, value in getattr(instance, '_tracked_initial', {}).items()}
+    record(instance, ChangeEvent.Action.DELETE, changes, using=using)
+
+
+def audit_reports_transitioned(sender, previous, status, actor, changed_at, **kwargs):
+    """Transição em lote (UPDATE direto): um evento por relatório alterado."""
+    changes_by_pk = {}
+    for pk, row in previous.items():
+        changes = {'status': (row['status'], status)}
+        if status in (MonthlyCommissionReport.Status.APPROVED, MonthlyCommissionReport.Status.PAID):
+            if row['approved_by_id'] is None:
+                changes['approved_by_id'] = (None, actor.pk)
+            if row['approved_at'] is None:
+                changes['approved_at'] = (None, changed_at)
+        if status == MonthlyCommissionReport.Status.PAID and row['paid_at'] is None:
+            changes['paid_at'] = (None, changed_at)
+        changes_by_pk[pk] = changes
+    record_many(
+        sender, changes_by_pk, ChangeEvent.Action.UPDATE, actor=actor, created_at=changed_at,
+        stores={pk: row['store_id'] for pk, row in previous.items()},
+    )
+
+
+def audit_sales_updated(sender, changes, stores, actor, changed_at, **kwargs):
+    """Vendas alteradas em lote (UPDATE direto): um evento por venda."""
+    record_many(sender, changes, ChangeEvent.Action.UPDATE, actor=actor, created_at=changed_at, stores=stores)
+
+
+reports_transitioned.connect(audit_reports_transitioned, dispatch_uid='audit_reports_transitioned')
+sales_updated.connect(audit_sales_updated, dispatch_uid='audit_sales_updated')
+
+# Diff em `_tracked_changes`: modelos registrados nos próprios apps (apps/core/tracking.py)
+for model in AUDITED_MODELS:
+    post_save.connect(audit_save, sender=model, dispatch_uid=f'audit_save_{model._meta.label}')
+    post_delete.connect(audit_delete, sender=model, dispatch_uid=f'audit_delete_{model._meta.label}')
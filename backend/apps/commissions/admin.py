@@ -1,16 +1,52 @@
-from django.contrib import admin
-from .models import MonthlyCommissionReport
+from django.contrib import admin, messages
+from django.utils import timezone
+from apps.core.admin import AutocompleteFilter, LargeTableAdmin
+from apps.dashboard.snapshots import invalidate
+from apps.stores.mixins import StoreScopedAdminMixin
+from .models import MonthlyCommissionReport, PaymentBatch
+
+RECALCULATE_BATCH_SIZE = 500
+
 
 @admin.register(MonthlyCommissionReport)
-class MonthlyCommissionReportAdmin(admin.ModelAdmin):
-    list_display = ('seller', 'period_display', 'total_sales_amount', 'total_commission', 'status')
-    list_filter = ('seller', 'year', 'month', 'status')
+class MonthlyCommissionReportAdmin(StoreScopedAdminMixin, LargeTableAdmin):
+    list_display = ('seller', 'store', 'period_display', 'total_sales_amount', 'total_commission', 'status')
+    list_filter = ('store', ('seller', AutocompleteFilter), 'year', 'month', 'status')
+    list_select_related = ('seller', 'store')
     search_fields = ('seller__username', 'seller__first_name', 'seller__last_name')
     readonly_fields = ('total_sales_amount', 'total_commission', 'average_commission_rate')
+    autocomplete_fields = ('seller', 'approved_by')
     ordering = ('-year', '-month')
+    actions = ('recalculate_from_sales',)
+
+    @admin.action(description="Recalcular a partir das vendas")
+    def recalculate_from_sales(self, request, queryset):
+        fields = ['total_sales_amount', 'sales_days_count', 'total_commission', 'average_commission_rate', 'updated_at']
+        now = timezone.now()
+        # Aprovados já podem estar em um lote de pagamento (remessa gerada com
+        # os totais atuais): só pendentes fora de lote são recalculados
+        reports = list(queryset.filter(status=MonthlyCommissionReport.Status.PENDING, payment_batch__isnull=True))
+        for report in reports:
+            report.calculate_from_sales()
+            report.updated_at = now
+        MonthlyCommissionReport.all_objects.bulk_update(reports, fields, batch_size=RECALCULATE_BATCH_SIZE)
+        # bulk_update não dispara signals
+        invalidate(*{(report.year, report.month) for report in reports})
+        self.message_user(
+            request,
+            f"{len(reports)} relatórios recalculados (só pendentes; aprovados, pagos e cancelados não são alterados).",
+            messages.SUCCESS,
+        )
 
     def period_display(self, obj):
         return obj.period_display
     period_display.short_description = 'Período'
     period_display.admin_order_field = 'month'  
-    
\ No newline at end of file
+    
+
+
+@admin.register(PaymentBatch)
+class PaymentBatchAdmin(StoreScopedAdminMixin, admin.ModelAdmin):
+    list_display = ('id', 'store', 'year', 'month', 'report_count', 'total_amount', 'created_by', 'created_at')
+    list_filter = ('store', 'year', 'month')
+    readonly_fields = ('store', 'year', 'month', 'report_count', 'total_amount', 'created_by')
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from ..models import MonthlyCommissionReport
+from ..models import FLAGGED_SALES_MESSAGE, MonthlyCommissionReport, PaymentBatch
 
 class MonthlyCommissionReportSerializer(serializers.ModelSerializer):
     period_display = serializers.ReadOnlyField()
@@ -7,17 +7,71 @@ class MonthlyCommissionReportSerializer(serializers.ModelSerializer):
     class Meta:
         model = MonthlyCommissionReport
         fields = [
-            'id', 'seller', 'year', 'month',
+            'id', 'seller', 'store', 'year', 'month',
             'total_sales_amount', 'sales_days_count',
             'total_commission', 'average_commission_rate',
             'status', 'approved_by', 'approved_at',
             'paid_at',
-            'payment_notes', 'period_display'
+            'payment_notes', 'period_display',
+            'payment_batch', 'batch_amount'
         ]
 
         read_only_fields = [
             'total_sales_amount', 'sales_days_count',
             'total_commission', 'average_commission_rate',
-            'approved_at', 'paid_at'
+            'approved_at', 'paid_at', 'payment_batch', 'batch_amount', 'store'
         ]
 
+    def validate(self, attrs):
+        instance = self.instance
+        source = instance.status if instance else None
+        target = attrs.get('status', source or MonthlyCommissionReport.Status.PENDING)
+        if MonthlyCommissionReport.needs_anomaly_review(source, target):
+            seller = attrs.get('seller', instance.seller if instance else None)
+            year = attrs.get('year', instance.year if instance else None)
+            month = attrs.get('month', instance.month if instance else None)
+            if seller and year and month and MonthlyCommissionReport.has_flagged_sales(seller.pk, year, month):
+                raise serializers.ValidationError({"status": FLAGGED_SALES_MESSAGE})
+        return attrs
+
+
+class BulkTransitionSerializer(serializers.Serializer):
+    """
+    Parâmetros de `bulk_transition/`: informe `ids` ou o período
+    (`year` + `month`, opcionalmente restrito a `sellers`).
+    """
+    MAX_IDS = 1000
+
+    status = serializers.ChoiceField(choices=[
+        MonthlyCommissionReport.Status.APPROVED,
+        MonthlyCommissionReport.Status.PAID,
+        MonthlyCommissionReport.Status.CANCELLED,
+    ])
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False, allow_empty=False, max_length=MAX_IDS
+    )
+    year = serializers.IntegerField(required=False, min_value=2024, max_value=2100)
+    month = serializers.IntegerField(required=False, min_value=1, max_value=12)
+    sellers = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False, allow_empty=False)
+
+    def validate(self, attrs):
+        has_period = 'year' in attrs and 'month' in attrs
+        if not attrs.get('ids') and not has_period:
+            raise serializers.ValidationError("Informe ids ou year e month.")
+        if ('year' in attrs) != ('month' in attrs):
+            raise serializers.ValidationError("year e month devem ser informados juntos.")
+        return attrs
+
+
+class PaymentBatchSerializer(serializers.ModelSerializer):
+    created_by = serializers.StringRelatedField()
+
+    class Meta:
+        model = PaymentBatch
+        fields = ['id', 'uuid', 'store', 'year', 'month', 'report_count', 'total_amount', 'created_by', 'created_at']
+        read_only_fields = ['store', 'report_count', 'total_amount']
+
+    def validate(self, attrs):
+        if not 1 <= attrs['month'] <= 12:
+            raise serializers.ValidationError({"month": "Mês inválido."})
+        return attrs
@@ -1,8 +1,9 @@
 # apps/commissions/urls.py
 from rest_framework.routers import DefaultRouter
-from .views import MonthlyCommissionReportViewSet
+from .views import MonthlyCommissionReportViewSet, PaymentBatchViewSet
 
 router = DefaultRouter()
 router.register(r'monthly-reports', MonthlyCommissionReportViewSet, basename='monthly-report')
+router.register(r'payment-batches', PaymentBatchViewSet, basename='payment-batch')
 
 urlpatterns = router.urls
@@ -1,29 +1,49 @@
-from rest_framework import viewsets, permissions, filters
+from django.http import StreamingHttpResponse
+from rest_framework import viewsets, permissions, filters, mixins, status
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.utils import timezone
 from apps.accounts.models import Account
-from ..models import MonthlyCommissionReport
-from .serializers import MonthlyCommissionReportSerializer
+from apps.accounts.search import AccountSearchFilter
+from apps.accounts.utils import is_vendedor
+from apps.core.db import retry_on_busy
+from apps.core.streaming import stream_content
+from apps.stores.mixins import StoreScopedViewMixin
+from ..models import MonthlyCommissionReport, PaymentBatch
+from ..payments import PaymentBatchError, create_batch, iter_manifest, iter_remittance
+from ..services import bulk_transition
+from .serializers import BulkTransitionSerializer, MonthlyCommissionReportSerializer, PaymentBatchSerializer
 
-class MonthlyCommissionReportViewSet(viewsets.ModelViewSet):
+class MonthlyCommissionReportViewSet(StoreScopedViewMixin, viewsets.ModelViewSet):
     """
-    ViewSet para CRUD e geração de relatórios mensais de comissão.
+    ViewSet para CRUD e geração de relatórios mensais de comissão,
+    restritos à loja da requisição (apps/stores/tenancy.py).
     """
     queryset = MonthlyCommissionReport.objects.all().order_by('-year', '-month')
     serializer_class = MonthlyCommissionReportSerializer
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, filters.SearchFilter]
-    filterset_fields = ['seller', 'year', 'month', 'status']
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, AccountSearchFilter]
+    filterset_fields = ['seller', 'year', 'month', 'status', 'payment_batch']
     ordering_fields = ['year', 'month', 'total_sales_amount', 'total_commission']
     search_fields = ['seller__username', 'seller__first_name', 'seller__last_name']
+    search_account_field = 'seller'  # ?search= pelo índice de busca de contas
+    store_related_fields = {'seller': 'store'}  # só vendedores da loja
+
+    # Geração e transições em massa têm orçamento próprio, bem menor
+    throttle_scope = 'reports'
+    throttle_action_scopes = {
+        'generate_all_reports': 'commissions-generate',
+        'bulk_transition': 'commissions-bulk',
+    }
 
     def perform_create(self, serializer):
         report = serializer.save()
         report.calculate_from_sales()
         report.save()
 
+    # Status e evento do outbox na mesma transação
+    @retry_on_busy
     def perform_update(self, serializer):
         instance = self.get_object()
         new_status = serializer.validated_data.get('status', instance.status)
@@ -46,15 +66,14 @@ class MonthlyCommissionReportViewSet(viewsets.ModelViewSet):
         year = int(year) if year else now.year
         month = int(month) if month else now.month
 
-        sellers = Account.objects.filter(
+        sellers = self.scope_to_store(Account.active_objects.filter(
             user_type='SELLER',
-            commission_active=True,
-            is_active=True
-        )
+            commission_active=True
+        ))
 
         created_reports = []
         for seller in sellers:
-            report, created = MonthlyCommissionReport.objects.get_or_create(
+            report, created = MonthlyCommissionReport.all_objects.get_or_create(
                 seller=seller,
                 year=year,
                 month=month
@@ -67,4 +86,92 @@ class MonthlyCommissionReportViewSet(viewsets.ModelViewSet):
             "year": year,
             "month": month,
             "reports": created_reports
-        })
\ No newline at end of file
+        })
+    @action(detail=False, methods=['post'], url_path='bulk_transition', url_name='bulk_transition')
+    def bulk_transition(self, request):
+        """
+        Aprova, paga ou cancela vários relatórios em uma requisição.
+        POST /api/v1/monthly-reports/bulk_transition/
+        {"status": "PAID", "year": 2025, "month": 8, "sellers": [3, 5]}
+        {"status": "APPROVED", "ids": [10, 11, 12]}
+        """
+        if is_vendedor(request.user):
+            return Response({"detail": "Apenas gerentes e administradores."}, status=status.HTTP_403_FORBIDDEN)
+
+        params = BulkTransitionSerializer(data=request.data)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+
+        reports_qs = self.get_queryset()
+        if data.get('ids'):
+            reports_qs = reports_qs.filter(pk__in=data['ids'])
+        if 'year' in data:
+            reports_qs = reports_qs.filter(year=data['year'], month=data['month'])
+        if data.get('sellers'):
+            reports_qs = reports_qs.filter(seller_id__in=data['sellers'])
+
+        outcomes = bulk_transition(reports_qs, data['status'], request.user, requested_ids=data.get('ids'))
+        results = [
+            {"id": pk, "outcome": outcome, "status": current}
+            for pk, (outcome, current) in sorted(outcomes.items())
+        ]
+        return Response({
+            "status": data['status'],
+            "updated": sum(1 for result in results if result["outcome"] == "updated"),
+            "results": results,
+        })
+
+
+class IsManagerOrAdmin(permissions.BasePermission):
+    message = "Apenas gerentes e administradores."
+
+    def has_permission(self, request, view):
+        return request.user.is_authenticated and not is_vendedor(request.user)
+
+
+class PaymentBatchViewSet(StoreScopedViewMixin, mixins.CreateModelMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Lotes de pagamento (da loja da requisição; usuários da rede sem
+    `?store=` criam lotes da rede toda).
+
+    POST /api/v1/payment-batches/ {"year": 2025, "month": 8}
+        marca os relatórios APROVADOS do período (ainda sem lote) com o novo lote
+    GET  /api/v1/payment-batches/{id}/remittance/   remessa em largura fixa (streaming)
+    GET  /api/v1/payment-batches/{id}/manifest/     manifesto CSV/PIX (streaming)
+    """
+    queryset = PaymentBatch.objects.select_related('created_by')
+    serializer_class = PaymentBatchSerializer
+    permission_classes = [IsManagerOrAdmin]
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['year', 'month']
+    throttle_action_scopes = {'create': 'payments', 'remittance': 'exports', 'manifest': 'exports'}
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            batch = create_batch(
+                serializer.validated_data['year'], serializer.validated_data['month'], request.user, store_id=self.store_id,
+            )
+        except PaymentBatchError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(self.get_serializer(batch).data, status=status.HTTP_201_CREATED)
+
+    def _stream(self, lines, filename, content_type):
+        response = StreamingHttpResponse(stream_content(self.request, lines), content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    @action(detail=True, methods=['get'])
+    def remittance(self, request, pk=None):
+        batch = self.get_object()
+        try:
+            lines = iter_remittance(batch)
+        except PaymentBatchError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return self._stream(lines, f'remessa-lote-{batch.pk}.txt', 'text/plain; charset=ascii')
+
+    @action(detail=True, methods=['get'])
+    def manifest(self, request, pk=None):
+        batch = self.get_object()
+        return self._stream(iter_manifest(batch), f'manifesto-lote-{batch.pk}.csv', 'text/csv')
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class CommissionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.commissions'
+
+    def ready(self):
+        from apps.core.tracking import track_changes
+        from .models import MonthlyCommissionReport
+
+        # Diff de campos lido pela auditoria, dashboard e outbox
+        track_changes(MonthlyCommissionReport)
@@ -0,0 +1,54 @@
+# apps/commissions/management/commands/generate_payment_batch.py
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.commissions.models import PaymentBatch
+from apps.commissions.payments import PaymentBatchError, create_batch, iter_manifest, iter_remittance
+
+
+class Command(BaseCommand):
+    help = (
+        "Cria um lote de pagamento com os relatórios APROVADOS do período e grava "
+        "a remessa (largura fixa) e o manifesto CSV. Com --batch regrava os arquivos de um lote existente."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--year', type=int)
+        parser.add_argument('--month', type=int, choices=range(1, 13))
+        parser.add_argument('--batch', type=int, help='Id de um lote já gerado')
+        parser.add_argument('--output-dir', default='.', help='Diretório dos arquivos (padrão: atual)')
+
+    def handle(self, *args, **options):
+        if options['batch']:
+            try:
+                batch = PaymentBatch.all_objects.get(pk=options['batch'])
+            except PaymentBatch.DoesNotExist:
+                raise CommandError(f"Lote {options['batch']} não encontrado.")
+        elif options['year'] and options['month']:
+            try:
+                batch = create_batch(options['year'], options['month'])
+            except PaymentBatchError as exc:
+                raise CommandError(str(exc))
+        else:
+            raise CommandError('Informe --year e --month, ou --batch.')
+
+        try:
+            remittance = iter_remittance(batch)
+        except PaymentBatchError as exc:
+            raise CommandError(f"{batch}: {exc}")
+
+        output_dir = Path(options['output_dir'])
+        output_dir.mkdir(parents=True, exist_ok=True)
+        files = [
+            (output_dir / f'remessa-lote-{batch.pk}.txt', remittance, 'ascii'),
+            (output_dir / f'manifesto-lote-{batch.pk}.csv', iter_manifest(batch), 'utf-8'),
+        ]
+        for path, lines, encoding in files:
+            with open(path, 'w', encoding=encoding, newline='') as stream:
+                stream.writelines(lines)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{batch}: {batch.report_count} relatórios, R$ {batch.total_amount} -> "
+            + ', '.join(str(path) for path, _, _ in files)
+        ))
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:26
+
+import django.db.models.manager
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('commissions', '0007_remove_monthlycommissionreport_paid_by_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='monthlycommissionreport',
+            managers=[
+                ('all_objects', django.db.models.manager.Manager()),
+            ],
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:28
+
+import django.db.models.deletion
+import django.db.models.manager
+import uuid
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('commissions', '0008_soft_delete_managers'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PaymentBatch',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False, verbose_name='ID')),
+                ('uuid', models.UUIDField(default=uuid.uuid4, editable=False, help_text='Identificador único usado em URLs públicas', unique=True, verbose_name='UUID')),
+                ('is_active', models.BooleanField(default=True, help_text='Desmarque para desativar o registro em vez de excluí-lo', verbose_name='Ativo')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Atualizado em')),
+                ('year', models.PositiveIntegerField(verbose_name='Ano')),
+                ('month', models.PositiveIntegerField(verbose_name='Mês')),
+                ('report_count', models.PositiveIntegerField(default=0, verbose_name='Relatórios')),
+                ('total_amount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14, verbose_name='Valor total (R$)')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='payment_batches', to=settings.AUTH_USER_MODEL, verbose_name='Gerado por')),
+            ],
+            options={
+                'verbose_name': 'Lote de Pagamento',
+                'verbose_name_plural': 'Lotes de Pagamento',
+                'ordering': ['-created_at'],
+            },
+            managers=[
+                ('all_objects', django.db.models.manager.Manager()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='monthlycommissionreport',
+            name='payment_batch',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='reports', to='commissions.paymentbatch', verbose_name='Lote de Pagamento'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('commissions', '0009_paymentbatch'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='monthlycommissionreport',
+            index=models.Index(fields=['updated_at', 'id'], name='commissions_report_updated_idx'),
+        ),
+    ]
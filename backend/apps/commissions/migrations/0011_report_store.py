@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_store(apps, schema_editor):
+    Store = apps.get_model('stores', 'Store')
+    Account = apps.get_model('accounts', 'Account')
+    MonthlyCommissionReport = apps.get_model('commissions', 'MonthlyCommissionReport')
+    code = getattr(settings, 'DEFAULT_STORE_CODE', 'principal')
+    default = Store._default_manager.get_or_create(code=code, defaults={'name': 'Loja Principal'})[0]
+    seller_store = Account._default_manager.filter(pk=OuterRef('seller_id')).values('store_id')[:1]
+    MonthlyCommissionReport._default_manager.update(store_id=Subquery(seller_store))
+    MonthlyCommissionReport._default_manager.filter(store__isnull=True).update(store_id=default.pk)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('commissions', '0010_updated_keyset_index'),
+        ('stores', '0001_initial'),
+        ('accounts', '0009_account_store'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='monthlycommissionreport',
+            name='store',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='commission_reports', to='stores.store', verbose_name='Loja'),
+        ),
+        migrations.AddField(
+            model_name='paymentbatch',
+            name='store',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='payment_batches', to='stores.store', verbose_name='Loja'),
+        ),
+        migrations.RunPython(backfill_store, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Migração separada do preenchimento: no PostgreSQL o ALTER não pode rodar
+# na mesma transação do UPDATE (eventos de trigger pendentes)
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('commissions', '0011_report_store'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='monthlycommissionreport',
+            name='store',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.PROTECT, related_name='commission_reports', to='stores.store', verbose_name='Loja'),
+        ),
+        migrations.AddIndex(
+            model_name='monthlycommissionreport',
+            index=models.Index(fields=['store', 'year', 'month', 'status'], name='commissions_store_period_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='monthlycommissionreport',
+            index=models.Index(fields=['store', 'updated_at', 'id'], name='commissions_store_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.5 on 2026-10-19 16:56
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def freeze_batch_amounts(apps, schema_editor):
+    # Lotes já gerados: o valor atual passa a ser o congelado
+    MonthlyCommissionReport = apps.get_model('commissions', 'MonthlyCommissionReport')
+    MonthlyCommissionReport._default_manager.filter(payment_batch__isnull=False).update(batch_amount=F('total_commission'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('commissions', '0012_report_store_required'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='monthlycommissionreport',
+            name='batch_amount',
+            field=models.DecimalField(blank=True, decimal_places=2, help_text='Comissão congelada quando o relatório entrou no lote; é o valor pago pela remessa', max_digits=10, null=True, verbose_name='Valor no Lote'),
+        ),
+        migrations.RunPython(freeze_batch_amounts, migrations.RunPython.noop),
+    ]
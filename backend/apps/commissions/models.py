@@ -7,6 +7,10 @@ from django.core.exceptions import ValidationError
 from django.utils import timezone
 from apps.core.models import BaseModel
 from apps.sales.models import DailySales
+from apps.stores.models import Store
+
+FLAGGED_SALES_MESSAGE = "Há vendas sinalizadas como anomalia neste mês; revise-as antes de aprovar."
+
 
 class MonthlyCommissionReport(BaseModel):
     """
@@ -26,6 +30,15 @@ class MonthlyCommissionReport(BaseModel):
         verbose_name="Vendedor"
     )
 
+    # Loja do vendedor (tenant); preenchida no save()
+    store = models.ForeignKey(
+        'stores.Store',
+        on_delete=models.PROTECT,
+        editable=False,
+        related_name='commission_reports',
+        verbose_name="Loja"
+    )
+
     year = models.PositiveIntegerField(
         verbose_name="Ano",
         validators=[MinValueValidator(2024), MaxValueValidator(2100)]
@@ -57,11 +70,25 @@ class MonthlyCommissionReport(BaseModel):
     paid_at = models.DateTimeField(null=True, blank=True, verbose_name="Pago em")
     payment_notes = models.TextField(blank=True, verbose_name="Observações do Pagamento")
 
+    payment_batch = models.ForeignKey(
+        'PaymentBatch',
+        on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='reports', verbose_name="Lote de Pagamento"
+    )
+
+    batch_amount = models.DecimalField(
+        max_digits=10, decimal_places=2, null=True, blank=True,
+        verbose_name="Valor no Lote",
+        help_text="Comissão congelada quando o relatório entrou no lote; é o valor pago pela remessa"
+    )
+
     def save(self, *args, **kwargs):
         is_new = self._state.adding
+        if self.store_id is None:
+            self.store_id = self.seller.store_id or Store.default_id()
         
         if not is_new:
-            original_status = MonthlyCommissionReport.objects.get(pk=self.pk).status
+            original_status = MonthlyCommissionReport.all_objects.get(pk=self.pk).status
 
             if original_status != self.Status.APPROVED and self.status == self.Status.APPROVED:
                 if not self.approved_at: self.approved_at = timezone.now()
@@ -73,9 +100,20 @@ class MonthlyCommissionReport(BaseModel):
         super().save(*args, **kwargs)
 
     def calculate_from_sales(self):
+        # Mês no arquivo frio: usa o resumo gravado no arquivamento
+        from apps.sales.archive import archived_seller_totals, month_bounds
+        archived = archived_seller_totals(self.year, self.month, self.seller_id)
+        if archived is not None:
+            self.total_sales_amount, self.total_commission, self.sales_days_count, weighted_sum = archived
+            if self.total_sales_amount > 0:
+                self.average_commission_rate = weighted_sum / self.total_sales_amount
+            else:
+                self.average_commission_rate = Decimal('0.00')
+            return
+
+        first_day, next_month = month_bounds(self.year, self.month)
         sales_qs = DailySales.objects.filter(
-            seller=self.seller, sale_date__year=self.year,
-            sale_date__month=self.month, is_active=True
+            seller=self.seller, sale_date__gte=first_day, sale_date__lt=next_month
         )
         report_data = sales_qs.aggregate(
             total_sales=Sum('total_amount'),
@@ -98,10 +136,76 @@ class MonthlyCommissionReport(BaseModel):
         months = ['', 'Janeiro', 'Fevereiro', 'Março', 'Abril', 'Maio', 'Junho', 'Julho', 'Agosto', 'Setembro', 'Outubro', 'Novembro', 'Dezembro']
         return f"{months[self.month]}/{self.year}"
     def clean(self):
-        if MonthlyCommissionReport.objects.exclude(pk=self.pk).filter(seller=self.seller, year=self.year, month=self.month).exists():
+        if MonthlyCommissionReport.all_objects.exclude(pk=self.pk).filter(seller=self.seller, year=self.year, month=self.month).exists():
             raise ValidationError("Já existe um relatório para este vendedor neste mês.")
+        original_status = None
+        if not self._state.adding:
+            original_status = MonthlyCommissionReport.all_objects.filter(pk=self.pk).values_list('status', flat=True).first()
+        if (self.needs_anomaly_review(original_status, self.status)
+                and self.has_flagged_sales(self.seller_id, self.year, self.month)):
+            raise ValidationError(FLAGGED_SALES_MESSAGE)
+
+    @classmethod
+    def needs_anomaly_review(cls, source, target):
+        """Aprovação (ou pagamento direto de um pendente) exige o mês sem vendas sinalizadas."""
+        if target == cls.Status.APPROVED:
+            return source != cls.Status.APPROVED
+        return target == cls.Status.PAID and source not in (cls.Status.APPROVED, cls.Status.PAID)
+
+    @staticmethod
+    def has_flagged_sales(seller_id, year, month):
+        """Há vendas do mês sinalizadas como anomalia e não revisadas (apps.sales.anomalies)?"""
+        from apps.sales.archive import month_bounds
+        first_day, next_month = month_bounds(year, month)
+        return DailySales.objects.filter(
+            seller_id=seller_id, is_flagged=True, sale_date__gte=first_day, sale_date__lt=next_month,
+        ).exists()
 
     class Meta:
         verbose_name = "Relatório de Comissão Mensal"
         verbose_name_plural = "Relatórios de Comissão Mensais"
-        unique_together = ['seller', 'year', 'month']
\ No newline at end of file
+        unique_together = ['seller', 'year', 'month']
+        indexes = [
+            # Keyset do feed de alterações (apps/integrations/changes.py)
+            models.Index(fields=['updated_at', 'id'], name='commissions_report_updated_idx'),
+            models.Index(fields=['store', 'updated_at', 'id'], name='commissions_store_updated_idx'),
+            # Relatórios do mês de uma loja (dashboard, geração, lotes): tenant primeiro
+            models.Index(fields=['store', 'year', 'month', 'status'], name='commissions_store_period_idx'),
+        ]
+
+
+class PaymentBatch(BaseModel):
+    """
+    Lote de pagamento gerado a partir dos relatórios APROVADOS de um período
+    (ver `apps.commissions.payments`). Os arquivos de remessa e o manifesto
+    são gerados sob demanda, em streaming, a partir dos relatórios do lote.
+    """
+
+    year = models.PositiveIntegerField(verbose_name="Ano")
+    month = models.PositiveIntegerField(verbose_name="Mês")
+
+    # Loja dos relatórios do lote; vazio = lote da rede toda
+    store = models.ForeignKey(
+        'stores.Store',
+        on_delete=models.PROTECT, null=True, blank=True,
+        related_name='payment_batches', verbose_name="Loja"
+    )
+
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='payment_batches', verbose_name="Gerado por"
+    )
+
+    report_count = models.PositiveIntegerField(default=0, verbose_name="Relatórios")
+    total_amount = models.DecimalField(
+        max_digits=14, decimal_places=2, default=Decimal('0.00'), verbose_name="Valor total (R$)"
+    )
+
+    def __str__(self):
+        return f"Lote {self.pk} - {self.month:02d}/{self.year}"
+
+    class Meta:
+        verbose_name = "Lote de Pagamento"
+        verbose_name_plural = "Lotes de Pagamento"
+        ordering = ['-created_at']
@@ -0,0 +1,193 @@
+# apps/commissions/payments.py
+"""
+Lotes de pagamento de comissões.
+
+`create_batch` reserva em um único UPDATE todos os relatórios APROVADOS do
+período que ainda não estão em lote. A partir daí os arquivos são gerados
+em streaming, lendo os relatórios do lote em blocos (`iterator`) com o
+documento do vendedor no mesmo SELECT, então a memória não cresce com o
+número de favorecidos:
+
+- `iter_remittance`: remessa bancária em largura fixa (linhas de 120
+  posições: header 0, detalhes 1, trailer 9 com quantidade e total)
+- `iter_manifest`: manifesto CSV do lote, com a chave PIX (CPF/CNPJ)
+
+O valor pago é o `batch_amount` congelado na criação do lote: recalcular
+o relatório depois não muda o lote. Relatórios cancelados ou desativados
+depois de entrar no lote ficam fora dos arquivos.
+"""
+import csv
+import unicodedata
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+
+from apps.core.streaming import EchoBuffer
+from .models import MonthlyCommissionReport, PaymentBatch
+
+RECORD_LENGTH = 120
+CHUNK_SIZE = 2000
+
+MANIFEST_COLUMNS = [
+    'batch', 'report_id', 'seller_id', 'seller_name', 'document', 'pix_key_type', 'pix_key', 'amount', 'period',
+]
+
+
+class PaymentBatchError(Exception):
+    pass
+
+
+def create_batch(year, month, created_by=None, store_id=None):
+    """
+    Cria o lote e marca os relatórios aprovados e ainda sem lote do período
+    (só os da loja, com `store_id`; sem loja, os de toda a rede).
+    """
+    with transaction.atomic():
+        batch = PaymentBatch.objects.create(year=year, month=month, created_by=created_by, store_id=store_id)
+        reports_qs = MonthlyCommissionReport.objects.filter(
+            year=year, month=month,
+            status=MonthlyCommissionReport.Status.APPROVED,
+            payment_batch__isnull=True,
+        )
+        if store_id is not None:
+            reports_qs = reports_qs.filter(store_id=store_id)
+        marked = reports_qs.update(
+            payment_batch=batch, batch_amount=F('total_commission'), updated_at=timezone.now(),
+        )
+        if not marked:
+            # Desfaz a criação do lote vazio
+            raise PaymentBatchError('Nenhum relatório aprovado sem lote neste período.')
+
+        totals = batch.reports.aggregate(count=Count('id'), total=Sum('batch_amount'))
+        batch.report_count = totals['count']
+        batch.total_amount = totals['total']
+        batch.save(update_fields=['report_count', 'total_amount', 'updated_at'])
+    return batch
+
+
+def _batch_rows(batch):
+    # `objects`: só relatórios ativos; cancelados depois do lote não são pagos
+    return (
+        MonthlyCommissionReport.objects.filter(payment_batch=batch)
+        .exclude(status=MonthlyCommissionReport.Status.CANCELLED)
+        .order_by('id')
+        .values(
+            'id', 'seller_id', 'seller__first_name', 'seller__last_name', 'seller__username',
+            'seller__document', 'batch_amount',
+        )
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+
+
+def _ascii(text):
+    return unicodedata.normalize('NFKD', text or '').encode('ascii', 'ignore').decode().upper()
+
+
+def _alpha(text, size):
+    return _ascii(text)[:size].ljust(size)
+
+
+def _number(value, size):
+    text = str(value)
+    if text.startswith('-') or len(text) > size:
+        raise PaymentBatchError(f'Valor {value} não cabe em um campo numérico de {size} posições da remessa.')
+    return text.rjust(size, '0')
+
+
+def _cents(value):
+    return int((value * 100).to_integral_value())
+
+
+def _digits(document):
+    return ''.join(ch for ch in document or '' if ch.isdigit())
+
+
+def _document(document, owner):
+    """CPF (11) ou CNPJ (14) só com dígitos; sem documento válido não há remessa."""
+    digits = _digits(document)
+    if len(digits) not in (11, 14):
+        raise PaymentBatchError(f'{owner} sem CPF/CNPJ válido.')
+    return _number(digits, 14)
+
+
+def _seller_name(row):
+    name = f"{row['seller__first_name']} {row['seller__last_name']}".strip()
+    return name or row['seller__username']
+
+
+def _record(*fields):
+    line = ''.join(fields)
+    if len(line) != RECORD_LENGTH:
+        raise PaymentBatchError(f'Registro da remessa com {len(line)} posições (esperado {RECORD_LENGTH}).')
+    return line + '\r\n'
+
+
+def iter_remittance(batch):
+    """
+    Linhas da remessa. Todos os registros são montados uma vez antes (sem
+    guardar as linhas): um valor negativo ou que não cabe no campo levanta
+    `PaymentBatchError` aqui, antes de qualquer byte do arquivo ser escrito.
+    """
+    for _ in _remittance_lines(batch):
+        pass
+    return _remittance_lines(batch)
+
+
+def _remittance_lines(batch):
+    """
+    Linhas da remessa em largura fixa.
+
+    Header  (0): tipo(1) CNPJ da empresa(14) nome da empresa(30) lote(10) data AAAAMMDD(8) período AAAAMM(6) brancos(51)
+    Detalhe (1): tipo(1) sequência(6) documento(14) nome(30) valor em centavos(15) período(6) relatório(10) brancos(38)
+    Trailer (9): tipo(1) quantidade(6) total em centavos(18) brancos(95)
+    """
+    period = f'{batch.year:04d}{batch.month:02d}'
+    yield _record(
+        '0',
+        _document(getattr(settings, 'PAYMENT_COMPANY_DOCUMENT', ''), 'PAYMENT_COMPANY_DOCUMENT'),
+        _alpha(getattr(settings, 'PAYMENT_COMPANY_NAME', ''), 30),
+        _number(batch.pk, 10),
+        timezone.localdate().strftime('%Y%m%d'),
+        period,
+        ' ' * 51,
+    )
+
+    count = total = 0
+    for row in _batch_rows(batch):
+        count += 1
+        amount = _cents(row['batch_amount'])
+        total += amount
+        yield _record(
+            '1',
+            _number(count, 6),
+            _document(row['seller__document'], f"Vendedor {row['seller_id']} (relatório {row['id']})"),
+            _alpha(_seller_name(row), 30),
+            _number(amount, 15),
+            period,
+            _number(row['id'], 10),
+            ' ' * 38,
+        )
+
+    yield _record('9', _number(count, 6), _number(total, 18), ' ' * 95)
+
+
+def iter_manifest(batch):
+    """Linhas CSV do manifesto do lote (cabeçalho + um favorecido por linha)."""
+    writer = csv.writer(EchoBuffer())
+    period = f'{batch.month:02d}/{batch.year}'
+    yield writer.writerow(MANIFEST_COLUMNS)
+    for row in _batch_rows(batch):
+        document = _digits(row['seller__document'])
+        yield writer.writerow([
+            batch.pk,
+            row['id'],
+            row['seller_id'],
+            _seller_name(row),
+            document,
+            'CNPJ' if len(document) == 14 else 'CPF',
+            document,
+            row['batch_amount'],
+            period,
+        ])
@@ -1,3 +1,16 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.sales.anomalies import flagged_periods
+from apps.sales.archive import month_bounds
+from .models import MonthlyCommissionReport
+from .signals import reports_transitioned
+
+
 def calculate_commission(sales_amount: float, commission_rate: float) -> float:
     """
     Calculate the commission for a given sales amount and commission rate.
@@ -11,4 +24,93 @@ def calculate_commission(sales_amount: float, commission_rate: float) -> float:
     """
     return sales_amount * (commission_rate / 100)
 
-print(calculate_commission(100, 0.5))  # Example usage
\ No newline at end of file
+
+Status = MonthlyCommissionReport.Status
+
+# status de destino -> status de origem permitidos
+ALLOWED_TRANSITIONS = {
+    Status.APPROVED: (Status.PENDING,),
+    Status.PAID: (Status.PENDING, Status.APPROVED),
+    Status.CANCELLED: (Status.PENDING, Status.APPROVED),
+}
+
+# Resultados por relatório em bulk_transition
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+INVALID = "invalid_transition"
+NOT_FOUND = "not_found"
+BLOCKED = "flagged_sales"
+
+
+def _flagged_reports(rows, target):
+    """ids dos relatórios (linhas de values()) cujo mês tem vendas sinalizadas pendentes de revisão."""
+    rows = [row for row in rows if MonthlyCommissionReport.needs_anomaly_review(row['status'], target)]
+    if not rows:
+        return set()
+    periods = sorted({(row['year'], row['month']) for row in rows})
+    start = month_bounds(*periods[0])[0]
+    end = month_bounds(*periods[-1])[1] - timedelta(days=1)
+    flagged = flagged_periods({row['seller_id'] for row in rows}, start, end)
+    return {row['id'] for row in rows if (row['seller_id'], row['year'], row['month']) in flagged}
+
+
+def bulk_transition(reports_qs, target, actor, requested_ids=None):
+    """
+    Move todos os relatórios de `reports_qs` para `target` com um único
+    UPDATE condicional (só os que estão em um status de origem permitido).
+
+    Preenche `approved_by`/`approved_at` (aprovação e pagamento) e `paid_at`
+    (pagamento) apenas onde ainda estão vazios, como o `save()` faz um a um.
+    Como o UPDATE não dispara sinais de modelo, envia `reports_transitioned`.
+
+    Relatórios de meses com vendas sinalizadas como anomalia (apps.sales.anomalies)
+    não são aprovados nem pagos direto do pendente: vêm como `flagged_sales`.
+
+    Retorna {id: (resultado, status atual)}; ids pedidos que não existem
+    (ou não são visíveis em `reports_qs`) vêm como `not_found`.
+    """
+    sources = ALLOWED_TRANSITIONS[target]
+    now = timezone.now()
+
+    with transaction.atomic():
+        # Trava as linhas (só as dos relatórios, não as das tabelas do JOIN)
+        # para que os resultados reflitam exatamente o UPDATE
+        current = {
+            row['id']: row for row in reports_qs.select_for_update(of=('self',)).values(
+                'id', 'status', 'approved_by_id', 'approved_at', 'paid_at', 'seller_id', 'store_id', 'year', 'month',
+            )
+        }
+        eligible = [pk for pk, row in current.items() if row['status'] in sources]
+        blocked = _flagged_reports([current[pk] for pk in eligible], target)
+        eligible = [pk for pk in eligible if pk not in blocked]
+
+        updates = {'status': target, 'updated_at': now}
+        if target in (Status.APPROVED, Status.PAID):
+            updates['approved_by'] = Coalesce('approved_by', Value(actor.pk))
+            updates['approved_at'] = Coalesce('approved_at', Value(now))
+        if target == Status.PAID:
+            updates['paid_at'] = Coalesce('paid_at', Value(now))
+
+        if eligible:
+            MonthlyCommissionReport.all_objects.filter(pk__in=eligible, status__in=sources).update(**updates)
+            reports_transitioned.send(
+                sender=MonthlyCommissionReport,
+                previous={pk: current[pk] for pk in eligible},
+                status=target,
+                actor=actor,
+                changed_at=now,
+            )
+
+    outcomes = {}
+    for pk, row in current.items():
+        if pk in eligible:
+            outcomes[pk] = (UPDATED, target)
+        elif pk in blocked:
+            outcomes[pk] = (BLOCKED, row['status'])
+        elif row['status'] == target:
+            outcomes[pk] = (UNCHANGED, target)
+        else:
+            outcomes[pk] = (INVALID, row['status'])
+    for pk in requested_ids or ():
+        outcomes.setdefault(pk, (NOT_FOUND, None))
+    return outcomes
@@ -0,0 +1,10 @@
+# apps/commissions/signals.py
+from django.dispatch import Signal
+
+# Enviado após uma transição em lote de relatórios (UPDATE direto, sem post_save).
+# Argumentos:
+#   previous: {id: {'status', 'approved_by_id', 'approved_at', 'paid_at'}} antes do UPDATE
+#   status: novo status
+#   actor: usuário que fez a transição
+#   changed_at: datetime gravado em updated_at (e nos campos preenchidos)
+reports_transitioned = Signal()
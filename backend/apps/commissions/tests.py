@@ -1,3 +1,141 @@
-from django.test import TestCase
+from datetime import date
+from decimal import Decimal
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+
+from apps.accounts.models import Account
+from apps.sales.models import DailySales
+from apps.stores.models import Store
+from .models import MonthlyCommissionReport
+from .payments import RECORD_LENGTH, PaymentBatchError, create_batch, iter_remittance
+from .services import BLOCKED, INVALID, NOT_FOUND, UNCHANGED, UPDATED, bulk_transition
+
+Status = MonthlyCommissionReport.Status
+
+
+class BulkTransitionTests(TestCase):
+    """Resultado por relatório das transições em massa."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = Account.objects.create_user(
+            'admin', 'admin@example.com', 'x', user_type='ADMIN', document='1', is_staff=True,
+        )
+        store_id = Store.default_id()
+        cls.bruno = Account.objects.create_user(
+            'bruno', 'bruno@example.com', 'x', user_type='SELLER', document='2',
+            store_id=store_id, commission_rate=Decimal('1.00'),
+        )
+        cls.carla = Account.objects.create_user(
+            'carla', 'carla@example.com', 'x', user_type='SELLER', document='3',
+            store_id=store_id, commission_rate=Decimal('1.00'),
+        )
+        cls.pending = cls.report(cls.bruno, 2025, 1, Status.PENDING)
+        cls.approved = cls.report(cls.carla, 2025, 1, Status.APPROVED)
+        cls.paid = cls.report(cls.bruno, 2025, 2, Status.PAID)
+        cls.cancelled = cls.report(cls.bruno, 2025, 3, Status.CANCELLED)
+        # Mês com venda sinalizada como anomalia e ainda não revisada
+        cls.flagged = cls.report(cls.carla, 2025, 2, Status.PENDING)
+        sale = DailySales.objects.create(seller=cls.carla, sale_date=date(2025, 2, 10), total_amount=Decimal('900.00'))
+        DailySales.all_objects.filter(pk=sale.pk).update(is_flagged=True)
+
+    @classmethod
+    def report(cls, seller, year, month, status):
+        return MonthlyCommissionReport.objects.create(seller=seller, year=year, month=month, status=status)
+
+    def transition(self, target, ids):
+        reports_qs = MonthlyCommissionReport.objects.filter(pk__in=ids)
+        return bulk_transition(reports_qs, target, self.admin, requested_ids=ids)
+
+    def test_every_outcome(self):
+        missing = max(report.pk for report in (self.pending, self.approved, self.paid, self.cancelled, self.flagged)) + 1
+        outcomes = self.transition(Status.PAID, [
+            self.pending.pk, self.approved.pk, self.paid.pk, self.cancelled.pk, self.flagged.pk, missing,
+        ])
+
+        self.assertEqual(outcomes, {
+            self.pending.pk: (UPDATED, Status.PAID),
+            self.approved.pk: (UPDATED, Status.PAID),
+            self.paid.pk: (UNCHANGED, Status.PAID),
+            self.cancelled.pk: (INVALID, Status.CANCELLED),
+            self.flagged.pk: (BLOCKED, Status.PENDING),
+            missing: (NOT_FOUND, None),
+        })
+
+    def test_updates_only_updated_rows(self):
+        self.transition(Status.PAID, [self.pending.pk, self.cancelled.pk, self.flagged.pk])
+
+        self.pending.refresh_from_db()
+        self.assertEqual(self.pending.status, Status.PAID)
+        self.assertEqual(self.pending.approved_by, self.admin)
+        self.assertIsNotNone(self.pending.paid_at)
+        for report, status in ((self.cancelled, Status.CANCELLED), (self.flagged, Status.PENDING)):
+            report.refresh_from_db()
+            self.assertEqual(report.status, status)
+            self.assertIsNone(report.paid_at)
+
+    def test_approve_does_not_reopen_paid(self):
+        outcomes = self.transition(Status.APPROVED, [self.approved.pk, self.paid.pk])
+
+        self.assertEqual(outcomes[self.approved.pk], (UNCHANGED, Status.APPROVED))
+        self.assertEqual(outcomes[self.paid.pk], (INVALID, Status.PAID))
+        self.paid.refresh_from_db()
+        self.assertEqual(self.paid.status, Status.PAID)
+
+    def test_report_outside_queryset_is_not_found(self):
+        # Fora do queryset visível (ex.: outra loja) conta como inexistente
+        reports_qs = MonthlyCommissionReport.objects.filter(seller=self.bruno)
+        outcomes = bulk_transition(reports_qs, Status.CANCELLED, self.admin, requested_ids=[self.approved.pk])
+
+        self.assertEqual(outcomes[self.approved.pk], (NOT_FOUND, None))
+        self.approved.refresh_from_db()
+        self.assertEqual(self.approved.status, Status.APPROVED)
+
+
+@override_settings(PAYMENT_COMPANY_DOCUMENT='12.345.678/0001-90')
+class RemittanceTests(TestCase):
+    """Remessa em largura fixa: valores fora do layout param antes da primeira linha."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.seller = Account.objects.create_user(
+            'bruno', 'bruno@example.com', 'x', user_type='SELLER', document='123.456.789-09',
+            store_id=Store.default_id(), commission_rate=Decimal('1.00'),
+        )
+        cls.report = MonthlyCommissionReport.objects.create(
+            seller=cls.seller, year=2025, month=1, status=Status.APPROVED, total_commission=Decimal('12.34'),
+        )
+        cls.batch = create_batch(2025, 1)
+
+    def test_records_have_fixed_length(self):
+        lines = list(iter_remittance(self.batch))
+
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(all(len(line) == RECORD_LENGTH + 2 for line in lines))
+        self.assertIn('000000000001234', lines[1])
+
+    def test_batch_pays_the_amount_frozen_at_creation(self):
+        MonthlyCommissionReport.objects.filter(pk=self.report.pk).update(total_commission=Decimal('99.00'))
+
+        lines = list(iter_remittance(self.batch))
+        self.assertIn('000000000001234', lines[1])
+        self.assertTrue(lines[2].startswith('9000001000000000000001234'))
+
+    def test_cancelled_report_is_not_paid(self):
+        MonthlyCommissionReport.objects.filter(pk=self.report.pk).update(status=Status.CANCELLED)
+
+        lines = list(iter_remittance(self.batch))
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[1].startswith('9000000'))
+
+    def test_negative_amount_is_rejected_before_streaming(self):
+        MonthlyCommissionReport.objects.filter(pk=self.report.pk).update(batch_amount=Decimal('-1.00'))
+
+        with self.assertRaises(PaymentBatchError):
+            iter_remittance(self.batch)
+
+    def test_missing_document_is_rejected(self):
+        Account.objects.filter(pk=self.seller.pk).update(document='')
+
+        with self.assertRaises(PaymentBatchError):
+            iter_remittance(self.batch)
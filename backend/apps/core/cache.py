@@ -0,0 +1,65 @@
+# apps/core/cache.py
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Cache em memória, por processo, com expiração (TTL) e descarte LRU.
+
+    Seguro para uso entre threads. Não é compartilhado entre processos:
+    cada worker tem o seu, então a invalidação por sinal vale só para o
+    processo local e o TTL limita por quanto tempo os demais ficam
+    desatualizados.
+
+    Uso:
+        users = TTLCache(maxsize=1024, ttl=60)
+        users.set(1, user)
+        users.get(1)
+    """
+
+    def __init__(self, maxsize=1024, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING:
+                return default
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_where(self, predicate):
+        """Remove as entradas cujo valor satisfaz `predicate(value)`."""
+        with self._lock:
+            for key in [key for key, (_, value) in self._data.items() if predicate(value)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
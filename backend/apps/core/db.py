@@ -0,0 +1,57 @@
+# apps/core/db.py
+import functools
+import logging
+import random
+import time
+
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections, transaction
+
+logger = logging.getLogger(__name__)
+
+BUSY_MESSAGES = ('database is locked', 'database table is locked', 'database is busy')
+
+
+def is_busy_error(exc):
+    """True se a exceção é um SQLITE_BUSY/SQLITE_LOCKED (contenção de escrita)."""
+    return isinstance(exc, OperationalError) and any(
+        message in str(exc).lower() for message in BUSY_MESSAGES
+    )
+
+
+def retry_on_busy(func=None, *, attempts=5, base_delay=0.05, using=DEFAULT_DB_ALIAS):
+    """
+    Executa a função dentro de `transaction.atomic` e repete a transação
+    inteira quando o SQLite responde "database is locked".
+
+    Só repete quando é a transação mais externa: dentro de um atomic já
+    aberto a falha sobe para quem abriu a transação. Em outros bancos a
+    função apenas roda dentro de `transaction.atomic`.
+
+    Uso:
+        @retry_on_busy
+        def perform_create(self, serializer): ...
+    """
+    if func is None:
+        return functools.partial(retry_on_busy, attempts=attempts, base_delay=base_delay, using=using)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        connection = connections[using]
+        if connection.vendor != 'sqlite' or connection.in_atomic_block:
+            with transaction.atomic(using=using):
+                return func(*args, **kwargs)
+
+        for attempt in range(1, attempts + 1):
+            try:
+                with transaction.atomic(using=using):
+                    return func(*args, **kwargs)
+            except OperationalError as exc:
+                if not is_busy_error(exc) or attempt == attempts:
+                    raise
+                # Backoff exponencial com jitter para não sincronizar os escritores
+                delay = base_delay * (2 ** (attempt - 1)) * (1 + random.random())
+                logger.warning('SQLite ocupado em %s (tentativa %s/%s), nova tentativa em %.3fs',
+                               func.__qualname__, attempt, attempts, delay)
+                time.sleep(delay)
+
+    return wrapper
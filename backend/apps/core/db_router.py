@@ -0,0 +1,67 @@
+# apps/core/db_router.py
+import contextvars
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+REPLICA_DB_ALIAS = 'replica'
+
+# Estado do escopo de leitura em réplica. `None` fora de `use_replica()`.
+# ContextVar funciona tanto em threads (WSGI) quanto em tarefas async (ASGI).
+_replica_scope = contextvars.ContextVar('replica_scope', default=None)
+
+
+def replica_configured():
+    return REPLICA_DB_ALIAS in settings.DATABASES
+
+
+@contextmanager
+def use_replica():
+    """
+    Envia as leituras feitas dentro do bloco para a réplica, se configurada.
+
+    Assim que houver uma escrita dentro do bloco, o escopo é fixado no
+    primário e as leituras seguintes também vão para o `default`
+    (read-after-write dentro da mesma requisição).
+    """
+    token = _replica_scope.set({'pinned': False})
+    try:
+        yield
+    finally:
+        _replica_scope.reset(token)
+
+
+def pin_primary():
+    """Fixa o escopo atual no primário (sem efeito fora de `use_replica()`)."""
+    scope = _replica_scope.get()
+    if scope is not None:
+        scope['pinned'] = True
+
+
+class PrimaryReplicaRouter:
+    """
+    Roteador primário/réplica.
+
+    - Escritas sempre vão para o `default`.
+    - Leituras vão para a réplica apenas dentro de `use_replica()`, com
+      a réplica configurada e sem escrita anterior no mesmo escopo.
+    - Fora desse escopo o comportamento é o padrão do Django.
+    """
+
+    def db_for_read(self, model, **hints):
+        scope = _replica_scope.get()
+        if scope is None or scope['pinned'] or not replica_configured():
+            return None
+        return REPLICA_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        pin_primary()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Primário e réplica contêm os mesmos dados
+        databases = {DEFAULT_DB_ALIAS, REPLICA_DB_ALIAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
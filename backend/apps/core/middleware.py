@@ -0,0 +1,36 @@
+# apps/core/middleware.py
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from .throttling import STATE_ATTR
+
+
+class RateLimitHeadersMiddleware:
+    """
+    Adiciona `X-RateLimit-Limit`, `X-RateLimit-Remaining` e
+    `X-RateLimit-Reset` (segundos até o balde encher) às respostas da API,
+    a partir do balde mais restritivo usado pelos throttles da requisição.
+    Híbrido: roda direto no modo (síncrono ou ASGI) do resto da cadeia.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.add_headers(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.add_headers(request, await self.get_response(request))
+
+    def add_headers(self, request, response):
+        state = getattr(request, STATE_ATTR, None)
+        if state is not None:
+            response['X-RateLimit-Limit'] = str(state['limit'])
+            response['X-RateLimit-Remaining'] = str(state['remaining'])
+            response['X-RateLimit-Reset'] = str(state['reset'])
+        return response
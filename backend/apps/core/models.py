@@ -1,6 +1,35 @@
 # apps/core/models.py
 import uuid
 from django.db import models
+from django.utils import timezone
+
+
+class SoftDeleteQuerySet(models.QuerySet):
+    """QuerySet com atalhos para o soft delete via `is_active`."""
+
+    def active(self):
+        return self.filter(is_active=True)
+
+    def inactive(self):
+        return self.filter(is_active=False)
+
+    def soft_delete(self):
+        return self.update(is_active=False, updated_at=timezone.now())
+
+
+class AllObjectsManager(models.Manager.from_queryset(SoftDeleteQuerySet)):
+    """Todos os registros, ativos e desativados (admin, relacionamentos, unicidade)."""
+
+
+class ActiveManager(AllObjectsManager):
+    """
+    Só registros ativos. O filtro `is_active = true` entra em toda consulta,
+    então os índices parciais (`condition=Q(is_active=True)`) são usados.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().active()
+
 
 class BaseModel(models.Model):
     """
@@ -12,6 +41,11 @@ class BaseModel(models.Model):
     - is_active: Para "soft delete" - desativar ao invés de deletar
     - created_at: Data/hora de criação automática
     - updated_at: Data/hora da última atualização automática
+
+    Managers:
+    - objects: só registros ativos (use nas consultas do dia a dia)
+    - all_objects: todos os registros; é o manager padrão, então admin e
+      relacionamentos (`seller.daily_sales`) continuam vendo tudo
     """
     id = models.AutoField(primary_key=True, verbose_name="ID")
     uuid = models.UUIDField(
@@ -28,6 +62,10 @@ class BaseModel(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Criado em")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Atualizado em")
+
+    # O primeiro manager declarado é o padrão
+    all_objects = AllObjectsManager()
+    objects = ActiveManager()
     
     class Meta:
         abstract = True
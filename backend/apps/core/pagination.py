@@ -1,6 +1,6 @@
 # apps/core/mixins.py
 
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 
 class StandardResultsSetPagination(PageNumberPagination):
     """
@@ -11,3 +11,17 @@ class StandardResultsSetPagination(PageNumberPagination):
     page_size = 10
     page_size_query_param = 'page_size'
     max_page_size = 100
+
+
+class StandardCursorPagination(CursorPagination):
+    """
+    Paginação por cursor (keyset) para listas grandes que só crescem.
+    O custo de cada página não depende da profundidade, ao contrário do
+    OFFSET da paginação por número.
+    Exemplo de uso:
+        pagination_class = StandardCursorPagination
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    ordering = '-id'
@@ -0,0 +1,49 @@
+# apps/core/streaming.py
+import contextvars
+from functools import partial
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+
+# Linhas por bloco enviado no servidor ASGI (uma ida à thread por bloco)
+STREAM_CHUNK_LINES = 1000
+
+
+class EchoBuffer:
+    """
+    "Arquivo" que só devolve o que recebe: permite usar `csv.writer` para
+    gerar linhas sob demanda (StreamingHttpResponse, exportações grandes).
+
+        writer = csv.writer(EchoBuffer())
+        line = writer.writerow(['a', 'b'])
+    """
+
+    def write(self, value):
+        return value
+
+
+def _next_chunk(context, iterator, size):
+    return context.run(''.join, islice(iterator, size))
+
+
+async def _async_chunks(lines, size):
+    iterator = iter(lines)
+    # Mesma thread (cursor e conexão do banco) e mesmo contexto (`use_replica`
+    # dentro do gerador) em todos os blocos
+    context = contextvars.copy_context()
+    next_chunk = sync_to_async(partial(_next_chunk, context, iterator, size), thread_sensitive=True)
+    while chunk := await next_chunk():
+        yield chunk
+
+
+def stream_content(request, lines):
+    """
+    Conteúdo de um StreamingHttpResponse a partir de um gerador síncrono de
+    linhas. Sob ASGI o Django consumiria um iterador síncrono inteiro antes
+    de enviar (`sync_to_async(list)`); aqui ele vira um iterador assíncrono
+    em blocos, e a memória continua constante. Sob WSGI, o próprio gerador.
+    """
+    if isinstance(getattr(request, '_request', request), ASGIRequest):
+        return _async_chunks(lines, STREAM_CHUNK_LINES)
+    return lines
@@ -1,3 +1,58 @@
-from django.test import TestCase
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.contrib.contenttypes.models import ContentType
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
 
-# Create your tests here.
+from apps.accounts.models import Account
+from apps.audit.buffer import _request_buffer
+from apps.audit.middleware import AuditMiddleware
+from apps.audit.models import ChangeEvent
+from .middleware import RateLimitHeadersMiddleware
+from .throttling import STATE_ATTR
+
+
+class HybridMiddlewareTests(TestCase):
+    """Middlewares próprios rodam direto no modo ASGI, sem adaptação para síncrono."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = Account.objects.create_user(
+            'admin', 'admin@example.com', 'x', user_type='ADMIN', document='1', is_staff=True,
+        )
+
+    def request(self):
+        request = RequestFactory().get('/')
+        request.user = self.admin
+        return request
+
+    async def test_audit_middleware_flushes_with_actor(self):
+        content_type = await sync_to_async(ContentType.objects.get_for_model)(Account)
+
+        async def view(request):
+            _request_buffer.get().append(ChangeEvent(
+                content_type=content_type, object_id=self.admin.pk, action=ChangeEvent.Action.UPDATE, changes={},
+                created_at=timezone.now(),
+            ))
+            return HttpResponse()
+
+        middleware = AuditMiddleware(view)
+        self.assertTrue(iscoroutinefunction(middleware))
+        await middleware(self.request())
+
+        event = await ChangeEvent.objects.aget()
+        self.assertEqual(event.actor_id, self.admin.pk)
+
+    async def test_rate_limit_headers_in_async_mode(self):
+        async def view(request):
+            setattr(request, STATE_ATTR, {'scope': 'user', 'limit': 10, 'remaining': 9, 'reset': 6})
+            return HttpResponse()
+
+        middleware = RateLimitHeadersMiddleware(view)
+        self.assertTrue(iscoroutinefunction(middleware))
+        response = await middleware(self.request())
+
+        self.assertEqual(
+            (response['X-RateLimit-Limit'], response['X-RateLimit-Remaining'], response['X-RateLimit-Reset']),
+            ('10', '9', '6'),
+        )
@@ -0,0 +1,190 @@
+# apps/core/throttling.py
+"""
+Throttling da API com token bucket.
+
+Cada chave (usuário ou IP + escopo) tem um balde com `capacity` fichas que
+se recarrega continuamente na taxa configurada; cada requisição gasta uma.
+Rajadas curtas passam enquanto houver fichas, uso contínuo fica limitado
+à taxa. As taxas seguem o formato do DRF em `DEFAULT_THROTTLE_RATES`:
+
+    'DEFAULT_THROTTLE_RATES': {
+        'user': '1200/min',          # orçamento geral por usuário
+        'anon': '60/min',            # por IP, sem autenticação
+        'sales': '600/min',          # throttle_scope da view
+        'exports': '20/hour',        # throttle_action_scopes da view
+    }
+
+Na view:
+    throttle_scope = 'sales'
+    throttle_action_scopes = {'export': 'exports'}
+
+Escopos sem taxa configurada não são limitados.
+
+Os baldes ficam em memória, por processo (`LocalBucketStore`): com N
+workers o limite efetivo é N vezes a taxa. Com `API_THROTTLE_CACHE` apontando
+para um cache compartilhado (ex.: Redis em `CACHES`), os workers dividem os
+mesmos baldes; a leitura + escrita no cache não é atômica, então rajadas
+concorrentes podem passar um pouco do limite.
+
+A verificação não consulta o banco: usa só o `request.user` já resolvido
+pela autenticação (com cache) e o IP. O `RateLimitHeadersMiddleware`
+copia o resultado para os headers `X-RateLimit-*` da resposta; o DRF
+responde 429 com `Retry-After` quando o balde está vazio.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+API_THROTTLE_CACHE = getattr(settings, 'API_THROTTLE_CACHE', None)
+API_THROTTLE_MAX_KEYS = getattr(settings, 'API_THROTTLE_MAX_KEYS', 10000)
+
+DURATIONS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+# Atributo do HttpRequest com o estado do balde mais restritivo
+STATE_ATTR = '_throttle_state'
+
+
+def parse_rate(rate):
+    """'100/min' -> (capacidade, fichas por segundo). None -> None."""
+    if rate is None:
+        return None
+    num, period = rate.split('/')
+    capacity = int(num)
+    return capacity, capacity / DURATIONS[period[0]]
+
+
+class LocalBucketStore:
+    """Baldes em memória do processo, com descarte LRU das chaves mais antigas."""
+
+    def __init__(self, maxsize=API_THROTTLE_MAX_KEYS):
+        self.maxsize = maxsize
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, rate, now):
+        """Gasta uma ficha. Retorna (permitido, fichas restantes)."""
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+            return allowed, tokens
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class CacheBucketStore:
+    """Baldes em um cache do Django compartilhado entre processos."""
+
+    def __init__(self, alias):
+        self.alias = alias
+
+    def take(self, key, capacity, rate, now):
+        cache = caches[self.alias]
+        tokens, updated = cache.get(key) or (capacity, now)
+        tokens = min(capacity, tokens + (now - updated) * rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        # Expira quando o balde já estaria cheio de novo
+        cache.set(key, (tokens, now), timeout=math.ceil((capacity - tokens) / rate) + 1)
+        return allowed, tokens
+
+    def clear(self):
+        caches[self.alias].clear()
+
+
+def _build_store():
+    if API_THROTTLE_CACHE:
+        return CacheBucketStore(API_THROTTLE_CACHE)
+    return LocalBucketStore()
+
+
+store = _build_store()
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Base dos throttles: subclasses definem `get_scope(request, view)`.
+    O relógio usa `time.time()` para valer entre processos no cache compartilhado.
+    """
+    timer = time.time
+
+    def get_scope(self, request, view):
+        raise NotImplementedError
+
+    def get_rate(self, scope):
+        return api_settings.DEFAULT_THROTTLE_RATES.get(scope)
+
+    def get_ident_key(self, request):
+        user = request.user
+        if user is not None and user.is_authenticated:
+            return f'user:{user.pk}'
+        return f'ip:{self.get_ident(request)}'
+
+    def allow_request(self, request, view):
+        scope = self.get_scope(request, view)
+        parsed = parse_rate(self.get_rate(scope)) if scope else None
+        if parsed is None:
+            return True
+
+        self.capacity, self.rate = parsed
+        now = self.timer()
+        allowed, tokens = store.take(
+            f'throttle:{scope}:{self.get_ident_key(request)}', self.capacity, self.rate, now,
+        )
+        self.tokens = tokens
+        self._remember(request, scope)
+        return allowed
+
+    def wait(self):
+        # Segundos até juntar uma ficha
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+    def _remember(self, request, scope):
+        """Guarda no HttpRequest o balde com menos fichas (para os headers)."""
+        state = {
+            'scope': scope,
+            'limit': self.capacity,
+            'remaining': max(0, int(self.tokens)),
+            'reset': math.ceil((self.capacity - self.tokens) / self.rate),
+        }
+        http_request = request._request
+        current = getattr(http_request, STATE_ATTR, None)
+        if current is None or state['remaining'] < current['remaining']:
+            setattr(http_request, STATE_ATTR, state)
+
+
+class UserBucketThrottle(TokenBucketThrottle):
+    """Orçamento geral: escopo 'user' (por usuário) ou 'anon' (por IP)."""
+
+    def get_scope(self, request, view):
+        user = request.user
+        return 'user' if user is not None and user.is_authenticated else 'anon'
+
+
+class ScopedBucketThrottle(TokenBucketThrottle):
+    """
+    Orçamento da view: `throttle_action_scopes[view.action]` quando a ação
+    tem escopo próprio, senão `throttle_scope`.
+    """
+
+    def get_scope(self, request, view):
+        action_scopes = getattr(view, 'throttle_action_scopes', {})
+        action = getattr(view, 'action', None)
+        if action in action_scopes:
+            return action_scopes[action]
+        return getattr(view, 'throttle_scope', None)
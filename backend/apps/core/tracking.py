@@ -0,0 +1,72 @@
+# apps/core/tracking.py
+"""
+Rastreamento de alterações de campos em instâncias de modelos.
+
+Ao carregar (post_init) guarda uma cópia dos valores; no pre_save compara
+com os valores atuais e deixa o diff em `instance._tracked_changes`
+({attname: (antes, depois)}), disponível para os receivers de post_save.
+
+Cada modelo é registrado uma única vez, no `ready()` do app dono
+(DailySales em `apps.sales`, MonthlyCommissionReport em `apps.commissions`);
+auditoria, dashboard, outbox e contadores só leem o diff:
+    track_changes(DailySales)
+"""
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models.signals import post_init, post_save, pre_save
+
+# Campos que mudam a cada save (ou nunca) e não interessam a quem lê o diff
+DEFAULT_EXCLUDE = ('id', 'created_at', 'updated_at')
+
+_tracked_models = {}
+
+
+def _tracked_fields(model, exclude=()):
+    return tuple(
+        field.attname for field in model._meta.concrete_fields
+        if field.name not in exclude and field.attname not in exclude
+    )
+
+
+def _snapshot(instance, fields):
+    # Campos adiados (.only/.defer) não estão no __dict__ e ficam de fora
+    values = instance.__dict__
+    return {name: values[name] for name in fields if name in values}
+
+
+def _on_init(sender, instance, **kwargs):
+    instance._tracked_initial = _snapshot(instance, _tracked_models[sender])
+
+
+def _on_pre_save(sender, instance, **kwargs):
+    instance._tracked_changes = changed_fields(instance)
+
+
+def _on_post_save(sender, instance, **kwargs):
+    # O estado salvo passa a ser a nova base de comparação
+    instance._tracked_initial = _snapshot(instance, _tracked_models[sender])
+
+
+def track_changes(model, exclude=DEFAULT_EXCLUDE):
+    """Passa a rastrear os campos concretos de `model` (menos `exclude`)."""
+    fields = _tracked_fields(model, exclude)
+    if model in _tracked_models:
+        if _tracked_models[model] != fields:
+            raise ImproperlyConfigured(f'{model._meta.label} já é rastreado com outros campos.')
+        return
+    _tracked_models[model] = fields
+    post_init.connect(_on_init, sender=model, weak=False, dispatch_uid=f'tracking_init_{model._meta.label}')
+    pre_save.connect(_on_pre_save, sender=model, weak=False, dispatch_uid=f'tracking_pre_{model._meta.label}')
+    post_save.connect(_on_post_save, sender=model, weak=False, dispatch_uid=f'tracking_post_{model._meta.label}')
+
+
+def changed_fields(instance):
+    """{attname: (valor anterior, valor atual)} dos campos alterados desde o carregamento."""
+    initial = getattr(instance, '_tracked_initial', {})
+    current = _snapshot(instance, _tracked_models.get(type(instance), ()))
+    if instance._state.adding:
+        return {name: (None, value) for name, value in current.items() if value is not None}
+    return {
+        name: (initial[name], value)
+        for name, value in current.items()
+        if name in initial and initial[name] != value
+    }
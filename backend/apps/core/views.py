@@ -1,3 +1,23 @@
-from django.shortcuts import render
+from .db_router import use_replica
 
-# Create your views here.
+
+class ReplicaReadMixin:
+    """
+    Mixin para views de leitura pesada (dashboard, análises, exportações).
+
+    Requisições seguras (GET/HEAD/OPTIONS) leem da réplica, se configurada.
+    Qualquer escrita durante a requisição fixa as leituras seguintes no
+    primário. Funciona com views do Django e APIViews do DRF.
+    """
+    replica_methods = ('GET', 'HEAD', 'OPTIONS')
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in self.replica_methods:
+            return super().dispatch(request, *args, **kwargs)
+        with use_replica():
+            response = super().dispatch(request, *args, **kwargs)
+            # TemplateResponse e Response do DRF renderizam depois do dispatch:
+            # renderiza aqui para que as consultas lazy também usem a réplica
+            if hasattr(response, 'render') and callable(response.render):
+                response.render()
+            return response
@@ -1,3 +1,10 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import PeriodSnapshot
+
+
+@admin.register(PeriodSnapshot)
+class PeriodSnapshotAdmin(admin.ModelAdmin):
+    list_display = ('id', 'year', 'month', 'created_at')
+    list_filter = ('year',)
+    readonly_fields = ('id', 'year', 'month', 'payload', 'created_at')
@@ -0,0 +1,63 @@
+from datetime import date, timedelta
+from rest_framework import serializers
+from apps.sales.archive import month_bounds
+from ..projection import DEFAULT_TRAILING_MONTHS
+from ..services import BUCKETS, DEFAULT_MAX_POINTS
+
+# Janela máxima aceita pela série temporal (evita varreduras sem limite)
+MAX_RANGE_DAYS = 366 * 10
+
+
+class TimeSeriesQuerySerializer(serializers.Serializer):
+    """
+    Valida os parâmetros de `/api/v1/analytics/timeseries/`.
+    - `start_date`/`end_date`: intervalo (padrão: mês corrente)
+    - `bucket`: day, week, month ou auto (padrão)
+    - `points`: número alvo de pontos quando `bucket=auto`
+    - `seller`: id do vendedor (ignorado para vendedores, que só veem os próprios dados)
+    """
+    start_date = serializers.DateField(required=False)
+    end_date = serializers.DateField(required=False)
+    bucket = serializers.ChoiceField(choices=BUCKETS + ("auto",), default="auto")
+    points = serializers.IntegerField(min_value=2, max_value=1000, default=DEFAULT_MAX_POINTS)
+    seller = serializers.IntegerField(required=False, min_value=1)
+
+    def validate(self, attrs):
+        today = date.today()
+        attrs.setdefault("start_date", today.replace(day=1))
+        attrs.setdefault("end_date", today)
+
+        if attrs["start_date"] > attrs["end_date"]:
+            raise serializers.ValidationError({"end_date": "Deve ser maior ou igual a start_date."})
+        if attrs["end_date"] - attrs["start_date"] > timedelta(days=MAX_RANGE_DAYS):
+            raise serializers.ValidationError({"start_date": "Intervalo máximo de 10 anos."})
+        return attrs
+
+
+class ProjectionQuerySerializer(serializers.Serializer):
+    """
+    Valida os parâmetros de `/api/v1/analytics/projection/`.
+    - `year`/`month`: mês projetado (padrão: mês corrente; meses futuros não são aceitos)
+    - `as_of`: último dia considerado (padrão: ontem, o último dia completo)
+    - `trailing_months`: meses de histórico para os métodos weekday e seasonal
+    - `seller`: id do vendedor (ignorado para vendedores, que só veem os próprios dados)
+    """
+    year = serializers.IntegerField(required=False, min_value=2000, max_value=2100)
+    month = serializers.IntegerField(required=False, min_value=1, max_value=12)
+    as_of = serializers.DateField(required=False)
+    trailing_months = serializers.IntegerField(min_value=0, max_value=24, default=DEFAULT_TRAILING_MONTHS)
+    seller = serializers.IntegerField(required=False, min_value=1)
+
+    def validate(self, attrs):
+        today = date.today()
+        attrs.setdefault("year", today.year)
+        attrs.setdefault("month", today.month)
+        first_day, following = month_bounds(attrs["year"], attrs["month"])
+
+        if first_day > today:
+            raise serializers.ValidationError({"month": "Não é possível projetar um mês futuro."})
+        if "as_of" not in attrs:
+            attrs["as_of"] = min(today - timedelta(days=1), following - timedelta(days=1))
+        elif not first_day <= attrs["as_of"] < following:
+            raise serializers.ValidationError({"as_of": "Deve estar dentro do mês projetado."})
+        return attrs
@@ -0,0 +1,9 @@
+from django.urls import path
+from .views import DashboardSummaryView, LiveDashboardView, SalesProjectionView, SalesTimeSeriesView
+
+urlpatterns = [
+    path('analytics/timeseries/', SalesTimeSeriesView.as_view(), name='analytics-timeseries'),  # -> /api/v1/analytics/timeseries/
+    path('analytics/projection/', SalesProjectionView.as_view(), name='analytics-projection'),  # -> /api/v1/analytics/projection/
+    path('analytics/dashboard/', DashboardSummaryView.as_view(), name='analytics-dashboard'),  # -> /api/v1/analytics/dashboard/ (async)
+    path('analytics/live/', LiveDashboardView.as_view(), name='analytics-live'),  # -> /api/v1/analytics/live/ (SSE, async)
+]
@@ -0,0 +1,233 @@
+# apps/dashboard/api/views.py
+from datetime import date
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views import View
+from rest_framework import exceptions, permissions
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.accounts.models import Account
+from apps.accounts.utils import is_vendedor
+from .. import live
+from apps.core.views import ReplicaReadMixin
+from apps.sales.models import DailySales
+from apps.core.db_router import use_replica
+from apps.stores.tenancy import resolve_store_id, scope_queryset
+from ..services import (
+    archived_sales, choose_bucket, compose_dashboard, dashboard_aggregates, run_concurrently, sales_timeseries,
+)
+from ..projection import month_projection
+from ..snapshots import snapshot_results
+from .serializers import ProjectionQuerySerializer, TimeSeriesQuerySerializer
+
+
+NOT_AUTHENTICATED = "As credenciais de autenticação não foram fornecidas."
+
+
+def _api_user(request):
+    """
+    Usuário autenticado pelas mesmas classes das views DRF (token, sessão,
+    basic), para as views assíncronas que são `View` do Django.
+    """
+    authenticators = [auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+    return Request(request, authenticators=authenticators).user
+
+
+async def authenticated_user(request):
+    """(usuário, resposta de erro): a resposta é None quando autenticado."""
+    try:
+        user = await sync_to_async(_api_user)(request)
+    except exceptions.AuthenticationFailed as exc:
+        return None, JsonResponse({"detail": str(exc.detail)}, status=401)
+    if not user.is_authenticated:
+        return None, JsonResponse({"detail": NOT_AUTHENTICATED}, status=401)
+    return user, None
+
+
+class SalesTimeSeriesView(ReplicaReadMixin, APIView):
+    """
+    Série temporal de vendas para gráficos.
+
+    Aceita qualquer intervalo e bucket (day/week/month). Com `bucket=auto`
+    escolhe o bucket mais fino que caiba em `points`. Dias sem vendas são
+    preenchidos com zero e a resposta vem em colunas:
+
+    /api/v1/analytics/timeseries/?start_date=2023-01-01&end_date=2025-12-31
+    {
+        "bucket": "week",
+        "labels": ["2022-12-26", ...],
+        "total_amount": [1520.0, ...],
+        "commission": [7.6, ...],
+        "entries": [3, ...]
+    }
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = 'analytics'
+
+    def get(self, request):
+        params = TimeSeriesQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+
+        # Loja primeiro: usa o índice (store, sale_date)
+        store_id = resolve_store_id(request)
+        sales_qs = scope_queryset(DailySales.objects.all(), store_id)
+        # Vendedor vê apenas seus próprios dados
+        seller_id = request.user.pk if is_vendedor(request.user) else data.get("seller")
+        if seller_id:
+            sales_qs = sales_qs.filter(seller_id=seller_id)
+
+        bucket = data["bucket"]
+        if bucket == "auto":
+            bucket = choose_bucket(data["start_date"], data["end_date"], data["points"])
+
+        # Meses arquivados vêm do arquivo frio
+        archived = archived_sales(data["start_date"], data["end_date"], seller_id or None, store_id)
+        return Response(sales_timeseries(sales_qs, data["start_date"], data["end_date"], bucket, archived))
+
+
+class SalesProjectionView(ReplicaReadMixin, APIView):
+    """
+    Projeção de fechamento do mês para todos os vendedores de uma vez
+    (run-rate, perfil por dia da semana e sazonal), com bandas de ~90%.
+    Resposta em colunas, uma posição por vendedor (ver `projection.py`).
+
+    /api/v1/analytics/projection/?year=2025&month=8
+    /api/v1/analytics/projection/?as_of=2025-08-15&trailing_months=6&seller=3
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = 'analytics'
+
+    def get(self, request):
+        params = ProjectionQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+
+        # Vendedor vê apenas a própria projeção
+        seller_id = request.user.pk if is_vendedor(request.user) else data.get("seller")
+        return Response(month_projection(
+            data["year"], data["month"], data["as_of"], data["trailing_months"], seller_id,
+            store_id=resolve_store_id(request),
+        ))
+
+
+class DashboardSummaryView(View):
+    """
+    Versão JSON e assíncrona do dashboard (servida pelo `vendapay/asgi.py`).
+
+    Os agregados independentes (mês atual, mês anterior, comissões, gráfico e
+    ranking) rodam ao mesmo tempo, cada um com sua conexão, então a latência é
+    a da consulta mais lenta e não a soma de todas.
+
+    /api/v1/analytics/dashboard/?year=2025&month=8&seller=3&status=PAID
+    """
+
+    async def get(self, request):
+        user, error = await authenticated_user(request)
+        if error is not None:
+            return error
+
+        today = date.today()
+        try:
+            year = int(request.GET.get("year", today.year))
+            month = int(request.GET.get("month", today.month))
+            date(year, month, 1)
+        except ValueError:
+            return JsonResponse({"detail": "Parâmetros year/month inválidos."}, status=400)
+        seller = request.GET.get("seller")
+        seller_id = int(seller) if seller and seller.isdigit() else None
+        status = request.GET.get("status", "ALL")
+        store_id = resolve_store_id(request, user)
+
+        with use_replica():
+            # Mês encerrado: snapshot (da loja); senão, agregados em paralelo
+            results = await sync_to_async(snapshot_results)(user, year, month, seller_id, status, store_id)
+            if results is None:
+                results = await run_concurrently(dashboard_aggregates(user, year, month, seller_id, status, store_id))
+        dashboard = compose_dashboard(results)
+
+        return JsonResponse({
+            "year": year,
+            "month": month,
+            "store": store_id,
+            "total_sales": float(dashboard["total_sales"]),
+            "prev_total_sales": float(dashboard["prev_total_sales"]),
+            "sales_growth": float(dashboard["sales_growth"]),
+            "total_commissions": float(dashboard["total_commissions"]),
+            "paid_commissions": float(dashboard["paid_commissions"]),
+            "pending_commissions": float(dashboard["pending_commissions"]),
+            "chart": dashboard["chart"],
+            "top_sellers": [
+                {
+                    "seller": seller["seller_id"],
+                    "name": " ".join(filter(None, [seller["seller__first_name"], seller["seller__last_name"]]))
+                    or seller["seller__username"],
+                    "total_sales": float(seller["total_sales_seller"]),
+                    "progress_percentage": seller["progress_percentage"],
+                }
+                for seller in dashboard["top_sellers"]
+            ],
+        })
+
+
+class LiveDashboardView(View):
+    """
+    Server-Sent Events com os deltas do dashboard (ver `apps/dashboard/live.py`).
+    Uma conexão longa por dashboard aberto, servida pelo `vendapay/asgi.py`;
+    sob WSGI responde 501 (cada conexão prenderia uma thread do worker).
+
+    /api/v1/analytics/live/            (admin/gestor: todos os vendedores da loja, ou da rede)
+    /api/v1/analytics/live/?store=2    (usuários da rede: uma loja)
+    /api/v1/analytics/live/?seller=3   (um vendedor; vendedores sempre recebem só o próprio)
+    """
+    heartbeat_seconds = 15
+
+    async def get(self, request):
+        if not isinstance(request, ASGIRequest):
+            return JsonResponse(
+                {"detail": "Atualizações ao vivo exigem o servidor ASGI (uvicorn vendapay.asgi:application)."},
+                status=501,
+            )
+        user, error = await authenticated_user(request)
+        if error is not None:
+            return error
+
+        seller = request.GET.get("seller")
+        store_id = resolve_store_id(request, user)
+        if is_vendedor(user):
+            scope = live.seller_scope(user.pk)
+        elif seller and seller.isdigit():
+            if store_id is not None and not await Account.objects.filter(pk=int(seller), store_id=store_id).aexists():
+                # Vendedor de outra loja
+                return JsonResponse({"detail": "Vendedor não encontrado."}, status=404)
+            scope = live.seller_scope(int(seller))
+        elif store_id is not None:
+            scope = live.store_scope(store_id)
+        else:
+            scope = live.SCOPE_ALL
+
+        await sync_to_async(live.ensure_listener)()
+        response = StreamingHttpResponse(self.stream(scope), content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"  # nginx: não segurar o stream
+        return response
+
+    async def stream(self, scope):
+        subscription = live.broker.subscribe(scope)
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                event = await subscription.get(self.heartbeat_seconds)
+                if event is None:
+                    # Comentário SSE: mantém proxies e o navegador com a conexão aberta
+                    yield ": ping\n\n"
+                    continue
+                kind, data = event
+                yield f"event: {kind}\ndata: {data}\n\n"
+        finally:
+            live.broker.unsubscribe(subscription)
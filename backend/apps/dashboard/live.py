@@ -0,0 +1,327 @@
+# apps/dashboard/live.py
+"""
+Atualizações ao vivo do dashboard (Server-Sent Events).
+
+Os signals de `DailySales` e `MonthlyCommissionReport` viram deltas
+pequenos publicados após o commit em um pub/sub em memória (`broker`).
+Cada dashboard aberto mantém uma conexão SSE (`LiveDashboardView`) inscrita
+no seu escopo. A conexão fica aberta indefinidamente, então só é servida
+sob ASGI (`uvicorn vendapay.asgi:application`): sob WSGI ela prenderia uma
+thread do worker para sempre, e a view responde 501. A página do dashboard
+só liga o SSE quando `live_available()` (ASGI, ou `DASHBOARD_LIVE_ENABLED`
+quando as rotas /api/v1/analytics/ vão para um servidor ASGI separado).
+
+Escopos:
+- "all": usuários da rede sem filtro de loja nem de vendedor
+- "store:<id>": administradores e gestores de uma loja (ou rede filtrando a loja)
+- "seller:<id>": vendedor logado ou filtro por vendedor
+
+Eventos:
+    event: sale
+    data: {"id": 42, "seller_id": 3, "store_id": 1, "action": "created",
+           "deltas": [{"date": "2025-08-14", "amount": "150.00", "commission": "0.75"}]}
+
+    (venda que muda de vendedor ou de loja gera dois eventos: a saída, com
+    o vendedor/loja antigos, e a entrada, com os novos)
+
+    event: report
+    data: {"id": 7, "seller_id": 3, "store_id": 1, "year": 2025, "month": 8, "status": "PAID",
+           "previous_status": "APPROVED", "delta_total": "0.00", "delta_paid": "12.50"}
+
+    event: resync      (fila do cliente estourou: recarregar os agregados)
+
+Com vários workers, `DASHBOARD_LIVE_NOTIFY = True` no PostgreSQL faz a
+publicação passar por `pg_notify` (entregue no commit); cada processo
+escuta o canal com uma conexão própria e repassa ao broker local.
+Alterações feitas com UPDATE direto (ações em massa do admin) não geram
+eventos; o dashboard volta a ficar correto no próximo carregamento.
+"""
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+from collections import defaultdict
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from apps.commissions.models import MonthlyCommissionReport
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = 'dashboard_live'
+SCOPE_ALL = 'all'
+SUBSCRIBER_QUEUE_SIZE = 256
+
+
+def live_available(request):
+    """
+    O SSE pode ser usado a partir desta requisição? `DASHBOARD_LIVE_ENABLED`
+    decide quando definido; senão, só se esta requisição veio pelo ASGI.
+    """
+    enabled = getattr(settings, 'DASHBOARD_LIVE_ENABLED', None)
+    return isinstance(request, ASGIRequest) if enabled is None else enabled
+
+
+def seller_scope(seller_id):
+    return f'seller:{seller_id}'
+
+
+def store_scope(store_id):
+    return f'store:{store_id}'
+
+
+class Subscription:
+    """Fila de eventos de um cliente SSE, ligada ao event loop dele."""
+
+    def __init__(self, scope, loop, maxsize=SUBSCRIBER_QUEUE_SIZE):
+        self.scope = scope
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize)
+        self.overflowed = False
+
+    def _put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Cliente lento: descarta e pede para recarregar
+            self.overflowed = True
+
+    def push(self, event):
+        """Chamado de qualquer thread."""
+        self.loop.call_soon_threadsafe(self._put, event)
+
+    async def get(self, timeout):
+        """Próximo (tipo, dados em JSON), ('resync', '{}') se houve descarte, ou None no timeout."""
+        if self.overflowed:
+            self.overflowed = False
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            return ('resync', '{}')
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class Broker:
+    """Pub/sub em memória por escopo."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def subscribe(self, scope):
+        subscription = Subscription(scope, asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers[scope].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.scope)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.scope]
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def publish(self, scopes, event):
+        with self._lock:
+            targets = [sub for scope in scopes for sub in self._subscribers.get(scope, ())]
+        for subscription in targets:
+            try:
+                subscription.push(event)
+            except RuntimeError:
+                # Event loop do cliente já foi fechado
+                self.unsubscribe(subscription)
+
+
+broker = Broker()
+
+
+# ------------------------------------------
+# Publicação
+# ------------------------------------------
+def notify_enabled(using=DEFAULT_DB_ALIAS):
+    return getattr(settings, 'DASHBOARD_LIVE_NOTIFY', False) and connections[using].vendor == 'postgresql'
+
+
+def _scopes(seller_id, store_id):
+    return (SCOPE_ALL, store_scope(store_id), seller_scope(seller_id))
+
+
+def publish(kind, data, using=DEFAULT_DB_ALIAS):
+    """
+    Publica o evento quando a transação corrente for confirmada. Com
+    LISTEN/NOTIFY, o próprio NOTIFY só é entregue no commit.
+    """
+    message = json.dumps({'kind': kind, 'data': data}, cls=DjangoJSONEncoder)
+    if notify_enabled(using):
+        with connections[using].cursor() as cursor:
+            cursor.execute('SELECT pg_notify(%s, %s)', [NOTIFY_CHANNEL, message])
+        return
+    transaction.on_commit(lambda: dispatch(message), using=using)
+
+
+def dispatch(message):
+    """Entrega uma mensagem publicada aos inscritos deste processo."""
+    payload = json.loads(message)
+    # Serializado uma vez; os inscritos só repassam o texto
+    data = payload['data']
+    broker.publish(_scopes(data['seller_id'], data['store_id']), (payload['kind'], json.dumps(data)))
+
+
+# ------------------------------------------
+# Deltas a partir das instâncias
+# ------------------------------------------
+ZERO = Decimal('0.00')
+
+
+def _amount(active, value):
+    return (value or ZERO) if active else ZERO
+
+
+def _before(instance, action):
+    """Valor de um campo antes do save (via `_tracked_changes` do apps.core.tracking)."""
+    changes = getattr(instance, '_tracked_changes', {}) if action == 'updated' else {}
+    return lambda attname: changes[attname][0] if attname in changes else getattr(instance, attname)
+
+
+def sale_events(instance, action):
+    """
+    Eventos de uma venda (criada, alterada, desativada, excluída ou mudada de
+    dia), um por (vendedor, loja) afetado: se a venda mudou de vendedor ou de
+    loja, a saída vai para os escopos antigos e a entrada para os novos.
+    Eventos sem deltas ficam de fora.
+    """
+    # (vendedor, loja) -> dia -> (valor, comissão)
+    deltas = defaultdict(dict)
+    if action != 'created':
+        before = _before(instance, action)
+        old_active = before('is_active')
+        deltas[(before('seller_id'), before('store_id'))][before('sale_date')] = (
+            -_amount(old_active, before('total_amount')),
+            -_amount(old_active, before('calculated_commission')),
+        )
+    new_active = instance.is_active and action != 'deleted'
+    new = (_amount(new_active, instance.total_amount), _amount(new_active, instance.calculated_commission))
+    days = deltas[(instance.seller_id, instance.store_id)]
+    amount, commission = days.get(instance.sale_date, (ZERO, ZERO))
+    days[instance.sale_date] = (amount + new[0], commission + new[1])
+
+    events = []
+    for (seller_id, store_id), days in deltas.items():
+        changes = [
+            {'date': day, 'amount': amount, 'commission': commission}
+            for day, (amount, commission) in sorted(days.items())
+            if amount or commission
+        ]
+        if changes:
+            events.append({
+                'id': instance.pk,
+                'seller_id': seller_id,
+                'store_id': store_id,
+                'action': action,
+                'deltas': changes,
+            })
+    return events
+
+
+def report_event(report_id, seller_id, store_id, year, month, status, previous_status, old_commission, new_commission):
+    paid = MonthlyCommissionReport.Status.PAID
+    return {
+        'id': report_id,
+        'seller_id': seller_id,
+        'store_id': store_id,
+        'year': year,
+        'month': month,
+        'status': status,
+        'previous_status': previous_status,
+        'delta_total': new_commission - old_commission,
+        'delta_paid': (new_commission if status == paid else ZERO) - (old_commission if previous_status == paid else ZERO),
+    }
+
+
+def report_instance_event(instance, action):
+    """Evento de um relatório salvo ou excluído; None se nada relevante mudou."""
+    changes = getattr(instance, '_tracked_changes', {})
+    if action == 'updated' and not {'status', 'total_commission', 'is_active'} & set(changes):
+        return None
+    old_commission, previous_status = ZERO, None
+    if action != 'created':
+        before = _before(instance, action)
+        if before('is_active'):
+            old_commission, previous_status = before('total_commission'), before('status')
+    new_active = instance.is_active and action != 'deleted'
+    return report_event(
+        instance.pk, instance.seller_id, instance.store_id, instance.year, instance.month,
+        instance.status if new_active else None, previous_status,
+        old_commission, _amount(new_active, instance.total_commission),
+    )
+
+
+# ------------------------------------------
+# LISTEN/NOTIFY (vários workers)
+# ------------------------------------------
+_listener_lock = threading.Lock()
+_listener = None
+
+
+def _notifications(raw):
+    if callable(getattr(raw, 'notifies', None)):
+        # psycopg 3
+        raw.autocommit = True
+        raw.execute(f'LISTEN {NOTIFY_CHANNEL}')
+        for notify in raw.notifies():
+            yield notify.payload
+    else:
+        # psycopg2
+        raw.autocommit = True
+        raw.cursor().execute(f'LISTEN {NOTIFY_CHANNEL}')
+        while True:
+            if select.select([raw], [], [], 5) == ([], [], []):
+                continue
+            raw.poll()
+            while raw.notifies:
+                yield raw.notifies.pop(0).payload
+
+
+def _listen_forever(using):
+    wrapper = connections[using]
+    while True:
+        raw = None
+        try:
+            raw = wrapper.get_new_connection(wrapper.get_connection_params())
+            for payload in _notifications(raw):
+                dispatch(payload)
+        except Exception:
+            logger.exception('Listener de %s caiu; reconectando', NOTIFY_CHANNEL)
+            time.sleep(1)
+        finally:
+            if raw is not None:
+                try:
+                    raw.close()
+                except Exception:
+                    pass
+
+
+def ensure_listener(using=DEFAULT_DB_ALIAS):
+    """Sobe (uma vez por processo) a thread que escuta o canal do PostgreSQL."""
+    global _listener
+    if not notify_enabled(using):
+        return
+    with _listener_lock:
+        if _listener is None or not _listener.is_alive():
+            _listener = threading.Thread(
+                target=_listen_forever, args=(using,), name='dashboard-live-listener', daemon=True,
+            )
+            _listener.start()
@@ -0,0 +1,63 @@
+# apps/dashboard/management/commands/bench_dashboard.py
+import asyncio
+import statistics
+import time
+from datetime import date
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, override_settings
+
+from apps.accounts.models import Account
+from apps.dashboard.services import dashboard_aggregates, run_concurrently, run_serially
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara a latência dos agregados do dashboard em série (view HTML) "
+        "e em paralelo (API assíncrona), ambos executados no loop ASGI."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', required=True, help='username usado nas consultas (define o escopo)')
+        parser.add_argument('--year', type=int, default=date.today().year)
+        parser.add_argument('--month', type=int, default=date.today().month)
+        parser.add_argument('--iterations', type=int, default=20)
+
+    def handle(self, *args, **options):
+        try:
+            user = Account.objects.get(username=options['user'])
+        except Account.DoesNotExist:
+            raise CommandError(f"Usuário '{options['user']}' não encontrado.")
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+            asyncio.run(self.bench(user, options['year'], options['month'], options['iterations']))
+
+    async def bench(self, user, year, month, iterations):
+        def aggregates():
+            return dashboard_aggregates(user, year, month)
+
+        serial = sync_to_async(lambda: run_serially(aggregates()), thread_sensitive=False)
+
+        async def concurrent():
+            return await run_concurrently(aggregates())
+
+        # Requisição completa pelo handler ASGI (autenticação + JSON)
+        client = AsyncClient()
+        await client.aforce_login(user)
+
+        async def endpoint():
+            response = await client.get('/api/v1/analytics/dashboard/', {'year': year, 'month': month})
+            assert response.status_code == 200, response.status_code
+
+        for label, runner in (('série', serial), ('paralelo', concurrent), ('endpoint ASGI', endpoint)):
+            await runner()  # aquecimento (conexões, caches do banco)
+            timings = []
+            for _ in range(iterations):
+                started = time.perf_counter()
+                await runner()
+                timings.append((time.perf_counter() - started) * 1000)
+            self.stdout.write(
+                f"{label:>14}: mediana={statistics.median(timings):.1f}ms "
+                f"p95={sorted(timings)[int(len(timings) * 0.95) - 1]:.1f}ms"
+            )
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PeriodSnapshot',
+            fields=[
+                ('id', models.PositiveIntegerField(primary_key=True, serialize=False, verbose_name='Período (AAAAMM)')),
+                ('year', models.PositiveIntegerField(verbose_name='Ano')),
+                ('month', models.PositiveSmallIntegerField(verbose_name='Mês')),
+                ('payload', models.JSONField(verbose_name='Dados do dashboard')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Gerado em')),
+            ],
+            options={
+                'verbose_name': 'Snapshot de Período',
+                'verbose_name_plural': 'Snapshots de Períodos',
+                'ordering': ['-id'],
+            },
+        ),
+    ]
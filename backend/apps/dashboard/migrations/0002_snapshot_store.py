@@ -0,0 +1,25 @@
+# Generated by Django 5.2.5 on 2026-10-19 16:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0001_period_snapshot'),
+        ('stores', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='periodsnapshot',
+            name='store',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='stores.store', verbose_name='Loja'),
+        ),
+        migrations.AlterField(
+            model_name='periodsnapshot',
+            name='id',
+            field=models.PositiveBigIntegerField(primary_key=True, serialize=False, verbose_name='Loja + período (AAAAMM)'),
+        ),
+    ]
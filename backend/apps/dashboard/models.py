@@ -1,3 +1,29 @@
 from django.db import models
 
-# Create your models here.
+
+class PeriodSnapshot(models.Model):
+    """
+    Payload do dashboard de um mês encerrado (todos os relatórios pagos ou
+    cancelados), calculado uma vez por loja e lido por chave primária.
+
+    A chave é `LLLLAAAAMM`: id da loja (0 = rede toda) seguido do período
+    (`snapshots.key_for`); o conteúdo está descrito em `apps/dashboard/snapshots.py`.
+    """
+    id = models.PositiveBigIntegerField(primary_key=True, verbose_name="Loja + período (AAAAMM)")
+    store = models.ForeignKey(
+        'stores.Store',
+        on_delete=models.CASCADE, null=True, blank=True,
+        related_name='+', verbose_name="Loja"
+    )
+    year = models.PositiveIntegerField(verbose_name="Ano")
+    month = models.PositiveSmallIntegerField(verbose_name="Mês")
+    payload = models.JSONField(verbose_name="Dados do dashboard")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Gerado em")
+
+    def __str__(self):
+        return f"Snapshot {self.month:02d}/{self.year}"
+
+    class Meta:
+        verbose_name = "Snapshot de Período"
+        verbose_name_plural = "Snapshots de Períodos"
+        ordering = ['-id']
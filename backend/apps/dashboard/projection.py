@@ -0,0 +1,317 @@
+# apps/dashboard/projection.py
+"""
+Projeção de fechamento do mês por vendedor.
+
+Carrega a série diária do mês (uma consulta) em uma matriz NumPy
+vendedores x dias, e da mesma forma os últimos `trailing_months` meses
+(tabela ou colunas do arquivo frio), que ficam em cache por processo
+(`history_cache`, invalidado pelos signals de vendas). A partir daí todos
+os vendedores são projetados de uma vez, por três métodos:
+
+- run_rate: média diária do mês até `as_of` vezes os dias que faltam
+- weekday: média de cada dia da semana (histórico + mês) somada aos dias que faltam
+- seasonal: vendido até agora vezes a razão fechamento/parcial do
+  mesmo ponto nos meses anteriores
+
+Cada método traz uma banda de confiança (~90%): desvio dos valores
+diários (run_rate), dos resíduos em relação ao perfil semanal (weekday)
+ou das razões mês a mês (seasonal). A comissão projetada usa a taxa
+efetiva do mês (ou a do cadastro, para quem ainda não vendeu).
+
+Com `store_id` só entram os vendedores e as vendas da loja (índice
+`(store, sale_date)`), e o cache do histórico é separado por loja.
+"""
+from datetime import date, timedelta
+
+import numpy as np
+from django.conf import settings
+from django.db.models import FloatField
+from django.db.models.functions import Cast
+
+from apps.accounts.models import Account
+from apps.core.cache import TTLCache
+from apps.sales.archive import archived_months, month_bounds, read_columns, seller_store_ids
+from apps.sales.models import DailySales
+
+CONFIDENCE = 0.9
+CONFIDENCE_Z = 1.645
+DEFAULT_TRAILING_MONTHS = 3
+METHODS = ('run_rate', 'weekday', 'seasonal')
+
+# Meses anteriores mudam pouco: ficam em memória por até PROJECTION_HISTORY_TTL segundos
+PROJECTION_HISTORY_TTL = getattr(settings, 'PROJECTION_HISTORY_TTL', 3600)
+PROJECTION_CACHE_SIZE = getattr(settings, 'PROJECTION_CACHE_SIZE', 48)
+
+
+def _months_back(year, month, count):
+    index = year * 12 + month - 1 - count
+    return index // 12, index % 12 + 1
+
+
+def _positions(seller_ids, ids):
+    """Posição de cada id em `seller_ids` (ordenado), ou -1 se não estiver lá."""
+    ids = np.asarray(ids, dtype=np.int64)
+    if not len(seller_ids) or not len(ids):
+        return np.full(len(ids), -1)
+    positions = np.minimum(np.searchsorted(seller_ids, ids), len(seller_ids) - 1)
+    return np.where(seller_ids[positions] == ids, positions, -1)
+
+
+# ------------------------------------------
+# Carga
+# ------------------------------------------
+# Matrizes diárias dos meses do histórico: (ano, mês, vendedor, loja) -> (ano, mês, ids, vendas)
+history_cache = TTLCache(maxsize=PROJECTION_CACHE_SIZE, ttl=PROJECTION_HISTORY_TTL)
+
+
+def invalidate(*periods):
+    """Descarta do cache deste processo as matrizes dos (ano, mês) informados."""
+    periods = set(periods)
+    history_cache.delete_where(lambda entry: entry[:2] in periods)
+
+
+def load_sellers(seller_id=None, store_id=None):
+    accounts = Account.active_objects.filter(user_type=Account.UserType.SELLER)
+    if seller_id is not None:
+        accounts = accounts.filter(pk=seller_id)
+    if store_id is not None:
+        accounts = accounts.filter(store_id=store_id)
+    rows = list(accounts.order_by('pk').values_list('pk', 'first_name', 'last_name', 'username', 'commission_rate'))
+    seller_ids = np.array([row[0] for row in rows], dtype=np.int64)
+    names = [' '.join(filter(None, row[1:3])) or row[3] for row in rows]
+    rates = np.array([float(row[4]) / 100 for row in rows], dtype=float)
+    return seller_ids, names, rates
+
+
+def _matrix(sellers, days_index, sales, commissions, days):
+    """Linhas soltas -> (ids ordenados, vendas, comissões) vendedores x dias."""
+    ids, rows = np.unique(sellers, return_inverse=True)
+    sales_matrix = np.zeros((len(ids), days))
+    commission_matrix = np.zeros((len(ids), days))
+    np.add.at(sales_matrix, (rows, days_index), sales)
+    np.add.at(commission_matrix, (rows, days_index), commissions)
+    return ids, sales_matrix, commission_matrix
+
+
+def load_daily(year, month, until=None, seller_id=None, store_id=None):
+    """
+    Vendas ativas do mês até o dia `until` (padrão: o mês todo) em
+    matrizes vendedores x dias, lidas da tabela em uma consulta ou das
+    colunas do arquivo frio. Retorna (ids dos vendedores, vendas, comissões).
+    """
+    first_day, following = month_bounds(year, month)
+    days = (following - first_day).days
+    until = days if until is None else until
+
+    archived = archived_months(first_day, first_day).get((year, month))
+    if archived is not None:
+        meta, columns = read_columns(archived)
+        sellers = np.asarray(meta['sellers'], dtype=np.int64)[np.asarray(columns['seller'], dtype=np.int64)]
+        day = np.asarray(columns['day'], dtype=np.int64)
+        keep = np.asarray(columns['is_active']).astype(bool) & (day <= until)
+        if seller_id is not None:
+            keep &= sellers == seller_id
+        if store_id is not None and 'store' in columns:
+            keep &= np.asarray(columns['store'], dtype=np.int64) == store_id
+        elif store_id is not None:
+            # Arquivo anterior às lojas: pela loja do vendedor
+            keep &= np.isin(sellers, list(seller_store_ids(store_id)))
+        return _matrix(
+            sellers[keep], day[keep] - 1,
+            np.asarray(columns['total_amount'], dtype=float)[keep] / 100,
+            np.asarray(columns['commission'], dtype=float)[keep] / 100,
+            days,
+        )
+
+    sales_qs = DailySales.objects.filter(sale_date__gte=first_day, sale_date__lt=first_day + timedelta(days=until))
+    if seller_id is not None:
+        sales_qs = sales_qs.filter(seller_id=seller_id)
+    if store_id is not None:
+        sales_qs = sales_qs.filter(store_id=store_id)
+    rows = list(sales_qs.order_by().values_list(
+        'seller_id', 'sale_date', Cast('total_amount', FloatField()), Cast('calculated_commission', FloatField()),
+    ))
+    if not rows:
+        return np.zeros(0, dtype=np.int64), np.zeros((0, days)), np.zeros((0, days))
+    sellers, sale_dates, sales, commissions = zip(*rows)
+    return _matrix(
+        np.array(sellers, dtype=np.int64), np.array([value.day - 1 for value in sale_dates]),
+        np.array(sales, dtype=float), np.array(commissions, dtype=float), days,
+    )
+
+
+def _align(seller_ids, ids, matrix):
+    """Reordena as linhas de `matrix` (vendedores `ids`) para a ordem de `seller_ids`."""
+    aligned = np.zeros((len(seller_ids), matrix.shape[1]))
+    positions = _positions(seller_ids, ids)
+    known = positions >= 0
+    aligned[positions[known]] = matrix[known]
+    return aligned
+
+
+def load_month(seller_ids, year, month, elapsed, seller_id=None, store_id=None):
+    """Matrizes (vendas, comissões) do mês até o dia `elapsed`, na ordem de `seller_ids`."""
+    ids, sales, commissions = load_daily(year, month, elapsed, seller_id, store_id)
+    return _align(seller_ids, ids, sales), _align(seller_ids, ids, commissions)
+
+
+def _history_month(year, month, seller_id=None, store_id=None):
+    key = (year, month, seller_id, store_id)
+    entry = history_cache.get(key)
+    if entry is None:
+        ids, sales, _ = load_daily(year, month, seller_id=seller_id, store_id=store_id)
+        entry = (year, month, ids, sales)
+        history_cache.set(key, entry)
+    return entry[2], entry[3]
+
+
+def load_history(seller_ids, year, month, trailing_months, elapsed, seller_id=None, store_id=None):
+    """
+    Histórico dos `trailing_months` meses anteriores (meses já fechados
+    ficam no `history_cache`, então só a primeira projeção do período lê o banco):
+    - full/partial: vendedores x meses, total do mês e total até o dia `elapsed`
+    - weekday_totals: vendedores x 7, soma por dia da semana
+    - weekday_days: 7, quantos dias de cada dia da semana o histórico cobre
+    """
+    count = len(seller_ids)
+    full = np.zeros((count, trailing_months))
+    partial = np.zeros((count, trailing_months))
+    weekday_totals = np.zeros((count, 7))
+    weekday_days = np.zeros(7)
+
+    for index in range(trailing_months):
+        past_year, past_month = _months_back(year, month, trailing_months - index)
+        ids, daily = _history_month(past_year, past_month, seller_id, store_id)
+        daily = _align(seller_ids, ids, daily)
+        first_day = date(past_year, past_month, 1)
+        full[:, index] = daily.sum(axis=1)
+        partial[:, index] = daily[:, :elapsed].sum(axis=1)
+        one_hot = np.eye(7)[(first_day.weekday() + np.arange(daily.shape[1])) % 7]
+        weekday_totals += daily @ one_hot
+        weekday_days += one_hot.sum(axis=0)
+
+    return full, partial, weekday_totals, weekday_days
+
+
+# ------------------------------------------
+# Cálculo (todos os vendedores de uma vez)
+# ------------------------------------------
+def project(sales, commissions, full, partial, weekday_totals, weekday_days, first_weekday, elapsed, rates, z=CONFIDENCE_Z):
+    """
+    Projeções por método: {método: (vendas, meia largura da banda)}, além
+    do vendido até agora e da taxa de comissão usada. Arrays de tamanho
+    igual ao número de vendedores.
+    """
+    count, days = sales.shape
+    remaining = days - elapsed
+    weekdays = (first_weekday + np.arange(days)) % 7
+    done = sales[:, :elapsed]
+    mtd = done.sum(axis=1)
+    mtd_commission = commissions[:, :elapsed].sum(axis=1)
+    # Taxa efetiva do mês; sem vendas no mês, a do cadastro
+    rates = np.divide(mtd_commission, mtd, out=rates.astype(float), where=mtd > 0)
+
+    projections = {}
+
+    # Run-rate
+    if elapsed:
+        daily = mtd / elapsed
+        spread = done.std(axis=1, ddof=1) if elapsed > 1 else np.zeros(count)
+    else:
+        daily = spread = np.zeros(count)
+    projections['run_rate'] = (mtd + daily * remaining, z * spread * np.sqrt(remaining))
+
+    # Perfil por dia da semana: média diária de cada dia, histórico + mês
+    one_hot = np.eye(7)[weekdays[:elapsed]]
+    totals = weekday_totals + done @ one_hot
+    day_counts = weekday_days + one_hot.sum(axis=0)
+    profile = np.divide(totals, day_counts, out=np.zeros_like(totals), where=day_counts > 0)
+    expected = profile[:, weekdays[elapsed:]].sum(axis=1)
+    if elapsed:
+        residual_var = ((done - profile[:, weekdays[:elapsed]]) ** 2).mean(axis=1)
+    else:
+        residual_var = np.zeros(count)
+    projections['weekday'] = (mtd + expected, z * np.sqrt(residual_var * remaining))
+
+    # Sazonal: razão fechamento / parcial nos meses anteriores
+    valid = partial > 0
+    ratios = np.divide(full, partial, out=np.zeros_like(full), where=valid)
+    months = valid.sum(axis=1)
+    if valid.any():
+        overall = full[valid].sum() / partial[valid].sum()
+    else:
+        overall = days / elapsed if elapsed else 1.0
+    ratio = np.divide(ratios.sum(axis=1), months, out=np.full(count, overall), where=months > 0)
+    deviations = np.where(valid, ratios - ratio[:, None], 0.0)
+    ratio_std = np.sqrt(np.divide((deviations ** 2).sum(axis=1), months - 1, out=np.zeros(count), where=months > 1))
+    band = z * mtd * ratio_std * np.sqrt(1 + np.divide(1.0, months, out=np.zeros(count), where=months > 0))
+    projections['seasonal'] = (mtd * ratio, band)
+
+    if not remaining:
+        # Mês encerrado: a projeção é o realizado
+        projections = {method: (mtd, np.zeros(count)) for method in projections}
+    return mtd, mtd_commission, rates, projections
+
+
+# ------------------------------------------
+# Resposta
+# ------------------------------------------
+def _column(values):
+    return np.round(values, 2).tolist()
+
+
+def month_projection(year, month, as_of, trailing_months=DEFAULT_TRAILING_MONTHS, seller_id=None, store_id=None):
+    """
+    Projeção em colunas (uma posição por vendedor, como a série temporal):
+    {
+        "sellers": [3, 5, ...], "names": ["Bruno Vidal", ...],
+        "mtd_sales": [...], "mtd_commission": [...],
+        "projections": {"run_rate": {"sales": [...], "commission": [...], "low": [...], "high": [...]}, ...},
+        "totals": {"mtd_sales": 1520.0, "run_rate": {"sales": ..., "commission": ..., "low": ..., "high": ...}, ...}
+    }
+    """
+    first_day, following = month_bounds(year, month)
+    days = (following - first_day).days
+    elapsed = min(max((as_of - first_day).days + 1, 0), days)
+
+    seller_ids, names, rates = load_sellers(seller_id, store_id)
+    sales, commissions = load_month(seller_ids, year, month, elapsed, seller_id, store_id)
+    history = load_history(seller_ids, year, month, trailing_months, elapsed, seller_id, store_id)
+    mtd, mtd_commission, rates, projections = project(
+        sales, commissions, *history, first_day.weekday(), elapsed, rates,
+    )
+
+    result = {
+        'year': year,
+        'month': month,
+        'as_of': (first_day + timedelta(days=elapsed - 1)).isoformat() if elapsed else None,
+        'days_in_month': days,
+        'elapsed_days': elapsed,
+        'trailing_months': trailing_months,
+        'confidence': CONFIDENCE,
+        'sellers': seller_ids.tolist(),
+        'names': names,
+        'mtd_sales': _column(mtd),
+        'mtd_commission': _column(mtd_commission),
+        'projections': {},
+        'totals': {'mtd_sales': round(float(mtd.sum()), 2), 'mtd_commission': round(float(mtd_commission.sum()), 2)},
+    }
+    for method, (projected, band) in projections.items():
+        low = np.maximum(projected - band, mtd)  # não fica abaixo do já vendido
+        high = projected + band
+        result['projections'][method] = {
+            'sales': _column(projected),
+            'commission': _column(projected * rates),
+            'low': _column(low),
+            'high': _column(high),
+        }
+        # Bandas independentes somam em quadratura
+        total_band = float(np.sqrt((band ** 2).sum()))
+        total = float(projected.sum())
+        result['totals'][method] = {
+            'sales': round(total, 2),
+            'commission': round(float((projected * rates).sum()), 2),
+            'low': round(max(total - total_band, float(mtd.sum())), 2),
+            'high': round(total + total_band, 2),
+        }
+    return result
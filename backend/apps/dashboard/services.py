@@ -0,0 +1,345 @@
+# apps/dashboard/services.py
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from decimal import Decimal
+from functools import partial
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncMonth, TruncWeek
+
+from apps.accounts.models import Account
+from apps.accounts.utils import is_administrador, is_vendedor
+from apps.commissions.models import MonthlyCommissionReport
+from apps.sales.archive import archived_month_totals, archived_rows
+from apps.sales.models import DailySales
+
+
+BUCKET_DAY = "day"
+BUCKET_WEEK = "week"
+BUCKET_MONTH = "month"
+BUCKETS = (BUCKET_DAY, BUCKET_WEEK, BUCKET_MONTH)
+
+# Número de pontos padrão quando o bucket é escolhido automaticamente
+DEFAULT_MAX_POINTS = 120
+
+
+def bucket_start(value, bucket):
+    """Retorna o início do bucket (dia, segunda-feira da semana ou dia 1 do mês)."""
+    if bucket == BUCKET_WEEK:
+        return value - timedelta(days=value.weekday())
+    if bucket == BUCKET_MONTH:
+        return value.replace(day=1)
+    return value
+
+
+def next_bucket(value, bucket):
+    """Avança um bucket a partir do início de um bucket."""
+    if bucket == BUCKET_WEEK:
+        return value + timedelta(days=7)
+    if bucket == BUCKET_MONTH:
+        return date(value.year + value.month // 12, value.month % 12 + 1, 1)
+    return value + timedelta(days=1)
+
+
+def iter_buckets(start, end, bucket):
+    """Gera o início de todos os buckets entre `start` e `end` (inclusive)."""
+    current = bucket_start(start, bucket)
+    while current <= end:
+        yield current
+        current = next_bucket(current, bucket)
+
+
+def count_buckets(start, end, bucket):
+    """Quantidade de buckets no intervalo, sem iterar."""
+    if bucket == BUCKET_WEEK:
+        return (bucket_start(end, bucket) - bucket_start(start, bucket)).days // 7 + 1
+    if bucket == BUCKET_MONTH:
+        return (end.year - start.year) * 12 + end.month - start.month + 1
+    return (end - start).days + 1
+
+
+def choose_bucket(start, end, max_points=DEFAULT_MAX_POINTS):
+    """
+    Escolhe o bucket mais fino cujo número de pontos cabe em `max_points`.
+    Intervalos longos caem para semana e depois para mês.
+    """
+    for bucket in (BUCKET_DAY, BUCKET_WEEK):
+        if count_buckets(start, end, bucket) <= max_points:
+            return bucket
+    return BUCKET_MONTH
+
+
+def sales_timeseries(sales_qs, start, end, bucket, archived=None):
+    """
+    Série temporal de vendas em colunas, com buckets vazios preenchidos com zero.
+
+    Executa uma única consulta agrupada sobre `sales_qs` e devolve listas
+    paralelas (labels, total_amount, commission, entries) em vez de um objeto
+    por ponto, o que mantém a resposta pequena mesmo para vários anos.
+
+    `archived` (callable, ver `archived_sales`) soma as vendas dos meses
+    arquivados, que já não estão na tabela.
+    """
+    sales_qs = sales_qs.filter(sale_date__gte=start, sale_date__lte=end)
+
+    # `sale_date` já é diário: para dias agrupamos direto pela coluna
+    truncs = {BUCKET_WEEK: TruncWeek("sale_date"), BUCKET_MONTH: TruncMonth("sale_date")}
+    rows = (
+        sales_qs.values(bucket=truncs.get(bucket, F("sale_date")))
+        .annotate(
+            total=Sum("total_amount"),
+            commission=Sum("calculated_commission"),
+            entries=Count("id"),
+        )
+        .order_by("bucket")
+    )
+    by_bucket = {row["bucket"]: row for row in rows}
+    for sale in archived() if archived else ():
+        row = by_bucket.setdefault(
+            bucket_start(sale["sale_date"], bucket), {"total": 0, "commission": 0, "entries": 0},
+        )
+        row["total"] += sale["total_amount"]
+        row["commission"] += sale["calculated_commission"]
+        row["entries"] += 1
+
+    labels, totals, commissions, entries = [], [], [], []
+    for current in iter_buckets(start, end, bucket):
+        row = by_bucket.get(current)
+        labels.append(current.isoformat())
+        totals.append(float(row["total"]) if row else 0.0)
+        commissions.append(float(row["commission"]) if row else 0.0)
+        entries.append(row["entries"] if row else 0)
+
+    return {
+        "bucket": bucket,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "labels": labels,
+        "total_amount": totals,
+        "commission": commissions,
+        "entries": entries,
+    }
+
+
+# ------------------------------------------
+# 📊 Agregados do dashboard
+# ------------------------------------------
+
+def month_range(year, month):
+    """Primeiro e último dia do mês (filtro por intervalo usa o índice de sale_date)."""
+    first_day = date(year, month, 1)
+    return first_day, next_bucket(first_day, BUCKET_MONTH) - timedelta(days=1)
+
+
+def previous_month(year, month):
+    return (year - 1, 12) if month == 1 else (year, month - 1)
+
+
+def dashboard_querysets(user, year, month, seller_id=None, status="ALL", store_id=None):
+    """
+    Querysets base do dashboard (vendas do mês, vendas do mês anterior e
+    relatórios de comissão), já filtrados por loja, permissão e pelos filtros da tela.
+    """
+    first_day, last_day = month_range(year, month)
+    prev_first_day, prev_last_day = month_range(*previous_month(year, month))
+
+    sales_qs = DailySales.objects.filter(sale_date__range=(first_day, last_day))
+    prev_sales_qs = DailySales.objects.filter(sale_date__range=(prev_first_day, prev_last_day))
+    reports_qs = MonthlyCommissionReport.objects.filter(year=year, month=month)
+
+    if store_id is not None:
+        # Índices (store, sale_date) e (store, year, month, status)
+        sales_qs = sales_qs.filter(store_id=store_id)
+        prev_sales_qs = prev_sales_qs.filter(store_id=store_id)
+        reports_qs = reports_qs.filter(store_id=store_id)
+
+    if is_vendedor(user):
+        # Vendedor vê apenas seus próprios dados
+        sales_qs = sales_qs.filter(seller=user)
+        prev_sales_qs = prev_sales_qs.filter(seller=user)
+        reports_qs = reports_qs.filter(seller=user)
+    elif seller_id:
+        # Admin ou gestor filtrando por vendedor específico
+        sales_qs = sales_qs.filter(seller_id=seller_id)
+        prev_sales_qs = prev_sales_qs.filter(seller_id=seller_id)
+        reports_qs = reports_qs.filter(seller_id=seller_id)
+
+    # Filtro por status da comissão
+    if status != "ALL":
+        reports_qs = reports_qs.filter(status=status)
+
+    return sales_qs, prev_sales_qs, reports_qs
+
+
+def archived_sales(start, end, seller_id=None, store_id=None):
+    """
+    Callable que lê as vendas ativas dos meses arquivados do intervalo
+    (`apps/sales/archive.py`). Preguiçoso para rodar na thread do agregado.
+    """
+    return partial(archived_rows, start, end, seller_id, store_id)
+
+
+def _archived_seller_amounts(year, month, seller_id=None, store_id=None):
+    amounts = {}
+    for (_, seller), (amount, _) in archived_month_totals(year, month, seller_id, store_id).items():
+        amounts[seller] = amounts.get(seller, Decimal("0.00")) + amount
+    return amounts
+
+
+def archived_totals(year, month, seller_id=None, store_id=None):
+    """
+    Callable com {seller_id: total vendido} do mês, se ele estiver arquivado,
+    pelo resumo gravado no arquivamento: totais e ranking não abrem o arquivo.
+    """
+    return partial(_archived_seller_amounts, year, month, seller_id, store_id)
+
+
+def sales_total(sales_qs, archived_amounts=None):
+    total = sales_qs.aggregate(total=Sum("total_amount"))["total"] or Decimal("0.00")
+    if archived_amounts:
+        total += sum(archived_amounts().values(), Decimal("0.00"))
+    return total
+
+
+def commission_totals(reports_qs):
+    """Comissão total e paga em uma única consulta."""
+    totals = reports_qs.aggregate(
+        total=Sum("total_commission"),
+        paid=Sum("total_commission", filter=Q(status=MonthlyCommissionReport.Status.PAID)),
+    )
+    return totals["total"] or Decimal("0.00"), totals["paid"] or Decimal("0.00")
+
+
+def _merge_archived_ranking(sales_qs, archived_seller_amounts, limit):
+    """Ranking somando tabela e arquivo: totais por vendedor, nomes só do top."""
+    totals = dict(sales_qs.values_list("seller_id").annotate(total=Sum("total_amount")).order_by())
+    for seller, amount in archived_seller_amounts.items():
+        totals[seller] = totals.get(seller, Decimal("0.00")) + amount
+    top = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:limit]
+    names = {
+        row["pk"]: row
+        for row in Account.all_objects.filter(pk__in=[seller for seller, _ in top])
+        .values("pk", "first_name", "last_name", "username")
+    }
+    return [
+        {
+            "seller_id": seller,
+            "seller__first_name": names.get(seller, {}).get("first_name"),
+            "seller__last_name": names.get(seller, {}).get("last_name"),
+            "seller__username": names.get(seller, {}).get("username"),
+            "total_sales_seller": total,
+        }
+        for seller, total in top
+    ]
+
+
+def top_sellers(sales_qs, limit=5, archived_amounts=None):
+    """Ranking dos vendedores do período com o percentual em relação ao primeiro."""
+    archived_seller_amounts = archived_amounts() if archived_amounts else {}
+    if archived_seller_amounts:
+        ranking = _merge_archived_ranking(sales_qs, archived_seller_amounts, limit)
+    else:
+        ranking = list(
+            sales_qs.values("seller_id", "seller__first_name", "seller__last_name", "seller__username")
+            .annotate(total_sales_seller=Sum("total_amount"))
+            .order_by("-total_sales_seller")[:limit]
+        )
+    max_sales = ranking[0]["total_sales_seller"] if ranking else Decimal("0.00")
+    for seller in ranking:
+        seller["progress_percentage"] = int(
+            (seller["total_sales_seller"] / max_sales * 100) if max_sales > 0 else 0
+        )
+    return ranking
+
+
+def daily_chart(sales_qs, year, month, archived=None):
+    """Série diária do mês inteiro, com dias sem vendas zerados."""
+    return sales_timeseries(sales_qs, *month_range(year, month), BUCKET_DAY, archived)
+
+
+def dashboard_aggregates(user, year, month, seller_id=None, status="ALL", store_id=None):
+    """
+    Consultas independentes do dashboard, como callables sem argumentos.
+
+    A view HTML executa em série (`run_serially`); a API assíncrona executa
+    todas ao mesmo tempo (`run_concurrently`).
+    """
+    sales_qs, prev_sales_qs, reports_qs = dashboard_querysets(user, year, month, seller_id, status, store_id)
+    # Meses arquivados já saíram da tabela (normalmente o mês anterior):
+    # totais e ranking pelo resumo do arquivamento; só o gráfico lê o arquivo
+    seller = user.pk if is_vendedor(user) else seller_id
+    amounts = archived_totals(year, month, seller, store_id)
+    prev_amounts = archived_totals(*previous_month(year, month), seller, store_id)
+    aggregates = {
+        "total_sales": partial(sales_total, sales_qs, amounts),
+        "prev_total_sales": partial(sales_total, prev_sales_qs, prev_amounts),
+        "commissions": partial(commission_totals, reports_qs),
+        "chart": partial(daily_chart, sales_qs, year, month, archived_sales(*month_range(year, month), seller, store_id)),
+    }
+    if is_administrador(user):
+        aggregates["top_sellers"] = partial(top_sellers, sales_qs, archived_amounts=amounts)
+    return aggregates
+
+
+def run_serially(aggregates):
+    return {name: aggregate() for name, aggregate in aggregates.items()}
+
+
+# Pool de threads dedicado: cada thread mantém a própria conexão aberta,
+# então o número de conexões extras por processo é limitado a `max_workers`.
+_query_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, "DASHBOARD_QUERY_WORKERS", 5),
+    thread_name_prefix="dashboard-query",
+)
+
+
+def _run_in_own_connection(aggregate):
+    # Fora do ciclo de requisição ninguém fecha a conexão da thread: antes e
+    # depois de cada tarefa descarta a que passou de CONN_MAX_AGE ou quebrou
+    close_old_connections()
+    try:
+        return aggregate()
+    finally:
+        close_old_connections()
+
+
+async def run_concurrently(aggregates):
+    """
+    Executa os agregados em paralelo, cada um em uma thread do pool com sua
+    própria conexão. A latência passa a ser a da consulta mais lenta.
+    O contexto (ex.: `use_replica()`) é propagado para as threads.
+    """
+    loop = asyncio.get_running_loop()
+    results = await asyncio.gather(*(
+        loop.run_in_executor(_query_executor, contextvars.copy_context().run, _run_in_own_connection, aggregate)
+        for aggregate in aggregates.values()
+    ))
+    return dict(zip(aggregates, results))
+
+
+def compose_dashboard(results):
+    """Monta o payload do dashboard a partir dos resultados dos agregados."""
+    total_sales = results["total_sales"]
+    prev_total_sales = results["prev_total_sales"]
+    total_commissions, paid_commissions = results["commissions"]
+
+    # Crescimento das vendas em relação ao mês anterior
+    sales_growth = (
+        ((total_sales - prev_total_sales) / prev_total_sales) * 100
+        if prev_total_sales > 0 else 0
+    )
+
+    return {
+        "total_sales": total_sales,
+        "prev_total_sales": prev_total_sales,
+        "total_commissions": total_commissions,
+        "paid_commissions": paid_commissions,
+        "pending_commissions": total_commissions - paid_commissions,
+        "sales_growth": round(sales_growth, 2),
+        "chart": results["chart"],
+        "top_sellers": results.get("top_sellers", []),
+    }
@@ -0,0 +1,105 @@
+# apps/dashboard/signals.py
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from apps.commissions.models import MonthlyCommissionReport
+from apps.commissions.signals import reports_transitioned
+from apps.sales.models import DailySales
+from . import live, projection, snapshots
+
+
+def _sale_periods(instance):
+    """Meses afetados por uma venda: o dela e o seguinte (que usa o anterior no crescimento)."""
+    previous = getattr(instance, '_tracked_changes', {}).get('sale_date', (None, None))[0]
+    dates = {instance.sale_date, previous}
+    periods = set()
+    for value in filter(None, dates):
+        periods.add((value.year, value.month))
+        periods.add(snapshots.next_month(value.year, value.month))
+    return periods
+
+
+def invalidate_sale_periods(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    periods = _sale_periods(instance)
+    # Só a loja da venda (e a antiga, se mudou; e a rede); as outras lojas continuam com o snapshot
+    previous_store = getattr(instance, '_tracked_changes', {}).get('store_id', (None, None))[0]
+    for store_id in {instance.store_id, previous_store} - {None}:
+        snapshots.invalidate(*periods, store_id=store_id)
+    projection.invalidate(*periods)
+
+
+def _refresh_after_commit(year, month, store_id):
+    """Snapshot da loja e o da rede (cada um fecha quando os seus relatórios fecham)."""
+    for scope in (store_id, None):
+        transaction.on_commit(partial(snapshots.refresh_snapshot, year, month, scope))
+
+
+def refresh_report_period(sender, instance, raw=False, **kwargs):
+    """
+    Qualquer mudança em relatório invalida o mês; se o relatório ficou pago
+    ou cancelado o mês pode ter fechado e o snapshot é refeito após o commit.
+    """
+    if raw:
+        return
+    snapshots.invalidate((instance.year, instance.month), store_id=instance.store_id)
+    if instance.status not in snapshots.OPEN_STATUSES:
+        _refresh_after_commit(instance.year, instance.month, instance.store_id)
+
+
+def refresh_transitioned_periods(sender, previous, status, **kwargs):
+    """Transição em lote (UPDATE direto): mesma regra, por loja e mês afetados."""
+    periods = set(
+        MonthlyCommissionReport.all_objects.filter(pk__in=list(previous))
+        .values_list('store_id', 'year', 'month').distinct()
+    )
+    for store_id, year, month in periods:
+        snapshots.invalidate((year, month), store_id=store_id)
+        if status not in snapshots.OPEN_STATUSES:
+            _refresh_after_commit(year, month, store_id)
+
+
+# ------------------------------------------
+# Eventos ao vivo (SSE)
+# ------------------------------------------
+def publish_sale(sender, instance, created=False, raw=False, using=None, **kwargs):
+    if raw:
+        return
+    action = 'created' if created else ('deleted' if kwargs.get('signal') is post_delete else 'updated')
+    for event in live.sale_events(instance, action):
+        live.publish('sale', event, using=using)
+
+
+def publish_report(sender, instance, created=False, raw=False, using=None, **kwargs):
+    if raw:
+        return
+    action = 'created' if created else ('deleted' if kwargs.get('signal') is post_delete else 'updated')
+    event = live.report_instance_event(instance, action)
+    if event is not None:
+        live.publish('report', event, using=using)
+
+
+def publish_transitioned_reports(sender, previous, status, **kwargs):
+    rows = MonthlyCommissionReport.all_objects.filter(pk__in=list(previous)).values(
+        'id', 'seller_id', 'store_id', 'year', 'month', 'total_commission',
+    )
+    for row in rows:
+        live.publish('report', live.report_event(
+            row['id'], row['seller_id'], row['store_id'], row['year'], row['month'], status, previous[row['id']]['status'],
+            row['total_commission'], row['total_commission'],
+        ))
+
+
+post_save.connect(invalidate_sale_periods, sender=DailySales, dispatch_uid='snapshot_sale_save')
+post_delete.connect(invalidate_sale_periods, sender=DailySales, dispatch_uid='snapshot_sale_delete')
+post_save.connect(refresh_report_period, sender=MonthlyCommissionReport, dispatch_uid='snapshot_report_save')
+post_delete.connect(refresh_report_period, sender=MonthlyCommissionReport, dispatch_uid='snapshot_report_delete')
+reports_transitioned.connect(refresh_transitioned_periods, dispatch_uid='snapshot_reports_transitioned')
+post_save.connect(publish_sale, sender=DailySales, dispatch_uid='live_sale_save')
+post_delete.connect(publish_sale, sender=DailySales, dispatch_uid='live_sale_delete')
+post_save.connect(publish_report, sender=MonthlyCommissionReport, dispatch_uid='live_report_save')
+post_delete.connect(publish_report, sender=MonthlyCommissionReport, dispatch_uid='live_report_delete')
+reports_transitioned.connect(publish_transitioned_reports, dispatch_uid='live_reports_transitioned')
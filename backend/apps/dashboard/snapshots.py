@@ -0,0 +1,307 @@
+# apps/dashboard/snapshots.py
+"""
+Snapshots do dashboard para meses encerrados.
+
+Um mês está encerrado quando já terminou, tem relatórios de comissão e
+nenhum deles está PENDING ou APPROVED (mesma regra do arquivamento). Para
+esses meses o payload do dashboard é calculado uma vez e gravado em
+`PeriodSnapshot`; as leituras seguintes fazem um único SELECT por chave
+primária, qualquer que seja o filtro de vendedor/status.
+
+Há um snapshot por loja e um da rede toda (loja 0 na chave `LLLLAAAAMM`):
+cada loja fecha o mês quando os relatórios dela estão encerrados.
+
+Payload (valores monetários em string para não perder precisão):
+    {
+        "days": 31,
+        "sales": "1520.00", "prev_sales": "1300.00",
+        "commissions": {"PAID": "7.60", "CANCELLED": "0.00"},
+        "chart": {"total_amount": [...], "commission": [...], "entries": [...]},
+        "sellers": {
+            "3": {
+                "name": ["Bruno", "Vidal", "bruno"],
+                "sales": "900.00", "prev_sales": "850.00",
+                "commissions": {"PAID": "4.50"},
+                "days": [[1, 120.0, 0.6, 1], ...]     # dia, total, comissão, lançamentos
+            }
+        },
+        "leaderboard": [3, 5, ...]                       # ids por vendas do mês
+    }
+
+As vendas vêm de `iter_sales_rows`, então meses já arquivados também
+geram o snapshot correto. Alterações em relatórios ou vendas do mês (e
+vendas do mês anterior, usadas no crescimento) removem o snapshot; ele é
+refeito ao fechar o mês de novo ou na primeira leitura. Uma alteração em
+uma loja remove o snapshot dela e o da rede, nunca o das outras lojas.
+"""
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q, Sum
+
+from apps.accounts.models import Account
+from apps.accounts.utils import is_administrador, is_vendedor
+from apps.commissions.models import MonthlyCommissionReport
+from apps.sales.archive import iter_sales_rows, month_bounds
+from .models import PeriodSnapshot
+from .services import BUCKET_DAY, previous_month
+
+OPEN_STATUSES = (MonthlyCommissionReport.Status.PENDING, MonthlyCommissionReport.Status.APPROVED)
+TOP_SELLERS_LIMIT = 5
+ZERO = Decimal('0.00')
+# Chave: loja * STORE_KEY_FACTOR + AAAAMM (loja 0 = rede toda)
+STORE_KEY_FACTOR = 1_000_000
+
+
+def key_for(year, month, store_id=None):
+    return (store_id or 0) * STORE_KEY_FACTOR + year * 100 + month
+
+
+def next_month(year, month):
+    return (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def is_closed(year, month, store_id=None):
+    if month_bounds(year, month)[1] > date.today():
+        return False
+    reports = MonthlyCommissionReport.objects.filter(year=year, month=month)
+    if store_id is not None:
+        reports = reports.filter(store_id=store_id)
+    return reports.exists() and not reports.filter(status__in=OPEN_STATUSES).exists()
+
+
+# ------------------------------------------
+# Geração
+# ------------------------------------------
+def _seller_entry():
+    return {'sales': ZERO, 'prev_sales': ZERO, 'commissions': {}, 'days': {}}
+
+
+def build_payload(year, month, store_id=None):
+    first_day, following = month_bounds(year, month)
+    days = (following - first_day).days
+    sellers = defaultdict(_seller_entry)
+    totals = [ZERO] * days
+    commissions = [ZERO] * days
+    entries = [0] * days
+
+    for row in iter_sales_rows(first_day, following - timedelta(days=1), store_id=store_id):
+        index = row['sale_date'].day - 1
+        seller = sellers[row['seller_id']]
+        seller['sales'] += row['total_amount']
+        day = seller['days'].setdefault(index + 1, [ZERO, ZERO, 0])
+        day[0] += row['total_amount']
+        day[1] += row['calculated_commission']
+        day[2] += 1
+        totals[index] += row['total_amount']
+        commissions[index] += row['calculated_commission']
+        entries[index] += 1
+
+    # Leaderboard: quem vendeu no mês, do maior para o menor
+    leaderboard = sorted(sellers, key=lambda pk: sellers[pk]['sales'], reverse=True)
+
+    prev_first, prev_following = month_bounds(*previous_month(year, month))
+    prev_sales = ZERO
+    for row in iter_sales_rows(prev_first, prev_following - timedelta(days=1), store_id=store_id):
+        sellers[row['seller_id']]['prev_sales'] += row['total_amount']
+        prev_sales += row['total_amount']
+
+    report_totals = defaultdict(lambda: ZERO)
+    reports = MonthlyCommissionReport.objects.filter(year=year, month=month)
+    if store_id is not None:
+        reports = reports.filter(store_id=store_id)
+    rows = (
+        reports.values('seller_id', 'status').annotate(total=Sum('total_commission')).order_by()
+    )
+    for row in rows:
+        total = row['total'] or ZERO
+        sellers[row['seller_id']]['commissions'][row['status']] = str(total)
+        report_totals[row['status']] += total
+
+    names = Account.objects.filter(pk__in=list(sellers)).values_list('pk', 'first_name', 'last_name', 'username')
+    names = {pk: [first_name, last_name, username] for pk, first_name, last_name, username in names}
+
+    return {
+        'days': days,
+        'sales': str(sum(totals, ZERO)),
+        'prev_sales': str(prev_sales),
+        'commissions': {status: str(total) for status, total in report_totals.items()},
+        'chart': {
+            'total_amount': [float(value) for value in totals],
+            'commission': [float(value) for value in commissions],
+            'entries': entries,
+        },
+        'sellers': {
+            str(pk): {
+                'name': names.get(pk, ['', '', '']),
+                'sales': str(seller['sales']),
+                'prev_sales': str(seller['prev_sales']),
+                'commissions': seller['commissions'],
+                'days': [
+                    [day, float(total), float(commission), count]
+                    for day, (total, commission, count) in sorted(seller['days'].items())
+                ],
+            }
+            for pk, seller in sellers.items()
+        },
+        'leaderboard': leaderboard,
+    }
+
+
+def build_snapshot(year, month, store_id=None):
+    """(Re)gera o snapshot do mês (da loja). Não verifica se o mês está encerrado."""
+    snapshot, _ = PeriodSnapshot.objects.update_or_create(
+        pk=key_for(year, month, store_id),
+        defaults={
+            'year': year, 'month': month, 'store_id': store_id,
+            'payload': build_payload(year, month, store_id),
+        },
+    )
+    return snapshot
+
+
+def refresh_snapshot(year, month, store_id=None):
+    """Gera o snapshot se o mês estiver encerrado e ainda não tiver um."""
+    if PeriodSnapshot.objects.filter(pk=key_for(year, month, store_id)).exists():
+        # Vários pagamentos na mesma transação agendam várias chamadas
+        return None
+    if is_closed(year, month, store_id):
+        return build_snapshot(year, month, store_id)
+    return None
+
+
+def invalidate(*periods, store_id=None):
+    """
+    Remove os snapshots dos (ano, mês) informados (um DELETE): os da loja e
+    o da rede com `store_id`, ou os de todas as lojas sem ele.
+    """
+    if not periods:
+        return
+    if store_id is not None:
+        keys = {key_for(year, month, scope) for year, month in periods for scope in (store_id, None)}
+        PeriodSnapshot.objects.filter(pk__in=keys).delete()
+        return
+    months = Q()
+    for year, month in set(periods):
+        months |= Q(year=year, month=month)
+    PeriodSnapshot.objects.filter(months).delete()
+
+
+def invalidate_sales(sales_qs):
+    """Invalida os meses de vendas que serão alteradas por UPDATE direto (sem signals)."""
+    periods = set()
+    for value in sales_qs.dates('sale_date', 'month'):
+        periods.add((value.year, value.month))
+        periods.add(next_month(value.year, value.month))
+    invalidate(*periods)
+
+
+def get_snapshot(year, month, store_id=None):
+    """
+    Payload do mês encerrado (da loja, ou da rede sem `store_id`) ou None.
+    Meses que ainda não terminaram nem consultam a tabela; se o mês está
+    encerrado e sem snapshot, gera agora.
+    """
+    if month_bounds(year, month)[1] > date.today():
+        return None
+    key = key_for(year, month, store_id)
+    snapshot = PeriodSnapshot.objects.filter(pk=key).values_list('payload', flat=True).first()
+    if snapshot is not None:
+        return snapshot
+    if not is_closed(year, month, store_id):
+        return None
+    try:
+        with transaction.atomic():
+            return build_snapshot(year, month, store_id).payload
+    except IntegrityError:
+        # Outra requisição gerou o mesmo snapshot ao mesmo tempo
+        return PeriodSnapshot.objects.get(pk=key).payload
+
+
+# ------------------------------------------
+# Leitura no formato dos agregados do dashboard
+# ------------------------------------------
+def _commissions(commissions, status):
+    """(total, pago) como em `services.commission_totals`, aplicando o filtro de status."""
+    if status != 'ALL':
+        commissions = {status: commissions[status]} if status in commissions else {}
+    total = sum((Decimal(value) for value in commissions.values()), ZERO)
+    paid = Decimal(commissions.get(MonthlyCommissionReport.Status.PAID, ZERO))
+    return total, paid
+
+
+def _chart(payload, year, month, seller=None):
+    first_day, following = month_bounds(year, month)
+    days = payload['days']
+    if seller is None:
+        series = payload['chart']
+    else:
+        series = {'total_amount': [0.0] * days, 'commission': [0.0] * days, 'entries': [0] * days}
+        for day, total, commission, count in seller['days']:
+            series['total_amount'][day - 1] = total
+            series['commission'][day - 1] = commission
+            series['entries'][day - 1] = count
+    return {
+        'bucket': BUCKET_DAY,
+        'start': first_day.isoformat(),
+        'end': (following - timedelta(days=1)).isoformat(),
+        'labels': [(first_day + timedelta(days=offset)).isoformat() for offset in range(days)],
+        'total_amount': series['total_amount'],
+        'commission': series['commission'],
+        'entries': series['entries'],
+    }
+
+
+def _top_sellers(payload, seller_ids):
+    ranking = []
+    for pk in seller_ids[:TOP_SELLERS_LIMIT]:
+        seller = payload['sellers'][str(pk)]
+        first_name, last_name, username = seller['name']
+        ranking.append({
+            'seller_id': pk,
+            'seller__first_name': first_name,
+            'seller__last_name': last_name,
+            'seller__username': username,
+            'total_sales_seller': Decimal(seller['sales']),
+        })
+    max_sales = ranking[0]['total_sales_seller'] if ranking else ZERO
+    for seller in ranking:
+        seller['progress_percentage'] = int(
+            (seller['total_sales_seller'] / max_sales * 100) if max_sales > 0 else 0
+        )
+    return ranking
+
+
+def snapshot_results(user, year, month, seller_id=None, status='ALL', store_id=None):
+    """
+    Resultados no mesmo formato de `run_serially(dashboard_aggregates(...))`
+    lidos do snapshot, ou None se o mês não tem snapshot.
+    """
+    payload = get_snapshot(year, month, store_id)
+    if payload is None:
+        return None
+
+    if is_vendedor(user):
+        seller_id = user.pk
+    if seller_id:
+        seller = payload['sellers'].get(str(seller_id)) or {
+            'sales': '0.00', 'prev_sales': '0.00', 'commissions': {}, 'days': [],
+        }
+        scope = seller
+        leaderboard = [pk for pk in payload['leaderboard'] if pk == seller_id]
+    else:
+        seller = None
+        scope = payload
+        leaderboard = payload['leaderboard']
+
+    results = {
+        'total_sales': Decimal(scope['sales']),
+        'prev_total_sales': Decimal(scope['prev_sales']),
+        'commissions': _commissions(scope['commissions'], status),
+        'chart': _chart(payload, year, month, seller),
+    }
+    if is_administrador(user):
+        results['top_sellers'] = _top_sellers(payload, leaderboard)
+    return results
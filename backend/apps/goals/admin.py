@@ -0,0 +1,20 @@
+from django.contrib import admin
+
+from apps.core.admin import AutocompleteFilter
+from apps.stores.mixins import StoreScopedAdminMixin
+from .models import SalesGoal
+
+
+@admin.register(SalesGoal)
+class SalesGoalAdmin(StoreScopedAdminMixin, admin.ModelAdmin):
+    list_display = ('__str__', 'store', 'year', 'month', 'target_amount', 'created_by', 'is_active')
+    list_filter = ('store', ('seller', AutocompleteFilter), 'year', 'month', 'is_active')
+    list_select_related = ('seller', 'store', 'created_by')
+    autocomplete_fields = ('seller',)
+    readonly_fields = ('created_by',)
+    ordering = ('-year', '-month')
+
+    def save_model(self, request, obj, form, change):
+        if not change:
+            obj.created_by = request.user
+        super().save_model(request, obj, form, change)
@@ -0,0 +1,65 @@
+from datetime import date
+
+from rest_framework import serializers
+
+from apps.stores.tenancy import user_store_id
+from ..models import SalesGoal
+
+
+class SalesGoalSerializer(serializers.ModelSerializer):
+    created_by = serializers.StringRelatedField(read_only=True)
+    seller_name = serializers.SerializerMethodField()
+
+    class Meta:
+        model = SalesGoal
+        fields = [
+            'id', 'seller', 'seller_name', 'store', 'year', 'month', 'target_amount',
+            'notes', 'created_by', 'created_at', 'updated_at',
+        ]
+        read_only_fields = ['created_by']
+        # Unicidade por vendedor/mês é validada abaixo (as constraints são parciais)
+        validators = []
+
+    def get_seller_name(self, obj):
+        return obj.seller.get_full_name() if obj.seller_id else "Equipe"
+
+    def validate(self, attrs):
+        instance = self.instance
+        seller = attrs.get('seller', instance.seller if instance else None)
+        year = attrs.get('year', instance.year if instance else None)
+        month = attrs.get('month', instance.month if instance else None)
+        duplicates = SalesGoal.objects.filter(seller=seller, year=year, month=month)
+        if seller is None:
+            # Meta de equipe: uma por loja (a do usuário, se ele for de uma loja)
+            request = self.context.get('request')
+            store_id = user_store_id(request.user) if request else None
+            if store_id is None:
+                store = attrs.get('store', instance.store if instance else None)
+                store_id = store.pk if store else None
+            duplicates = duplicates.filter(store_id=store_id)
+        if instance is not None:
+            duplicates = duplicates.exclude(pk=instance.pk)
+        if duplicates.exists():
+            raise serializers.ValidationError("Já existe uma meta ativa para este vendedor (ou equipe) neste mês.")
+        return attrs
+
+
+class GoalProgressQuerySerializer(serializers.Serializer):
+    """
+    Valida os parâmetros de `/api/v1/goals/progress/`.
+    - `year`/`month`: mês das metas (padrão: mês corrente)
+    - `as_of`: último dia completo considerado (padrão: ontem, dentro do mês)
+    - `seller`: só as metas do vendedor e da equipe (ignorado para vendedores)
+    """
+    year = serializers.IntegerField(required=False, min_value=2000, max_value=2100)
+    month = serializers.IntegerField(required=False, min_value=1, max_value=12)
+    as_of = serializers.DateField(required=False)
+    seller = serializers.IntegerField(required=False, min_value=1)
+
+    def validate(self, attrs):
+        today = date.today()
+        attrs.setdefault("year", today.year)
+        attrs.setdefault("month", today.month)
+        if "as_of" in attrs and (attrs["as_of"].year, attrs["as_of"].month) != (attrs["year"], attrs["month"]):
+            raise serializers.ValidationError({"as_of": "Deve estar dentro do mês das metas."})
+        return attrs
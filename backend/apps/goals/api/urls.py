@@ -0,0 +1,8 @@
+# apps/goals/api/urls.py
+from rest_framework.routers import DefaultRouter
+from .views import SalesGoalViewSet
+
+router = DefaultRouter()
+router.register(r'goals', SalesGoalViewSet, basename='goal')
+
+urlpatterns = router.urls
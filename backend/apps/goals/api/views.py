@@ -0,0 +1,77 @@
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import filters, permissions, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from apps.accounts.utils import is_vendedor
+from apps.core.db_router import use_replica
+from apps.stores.mixins import StoreScopedViewMixin
+from apps.stores.tenancy import user_store_id
+from ..models import SalesGoal
+from ..progress import goal_progress
+from .serializers import GoalProgressQuerySerializer, SalesGoalSerializer
+
+
+class IsManagerOrReadOnly(permissions.BasePermission):
+    message = "Apenas gerentes e administradores podem alterar metas."
+
+    def has_permission(self, request, view):
+        if not request.user.is_authenticated:
+            return False
+        return request.method in permissions.SAFE_METHODS or not is_vendedor(request.user)
+
+
+class SalesGoalViewSet(StoreScopedViewMixin, viewsets.ModelViewSet):
+    """
+    Metas de vendas mensais, por vendedor ou da equipe (`seller` vazio) da
+    loja (`store`; vazio = rede toda), restritas à loja da requisição.
+
+    GET  /api/v1/goals/?year=2025&month=8
+    POST /api/v1/goals/ {"seller": 3, "year": 2025, "month": 8, "target_amount": "50000.00"}
+    GET  /api/v1/goals/progress/?year=2025&month=8   atingimento, gap e ritmo necessário
+    """
+    queryset = SalesGoal.objects.select_related('seller', 'created_by')
+    store_related_fields = {'seller': 'store'}
+    serializer_class = SalesGoalSerializer
+    permission_classes = [IsManagerOrReadOnly]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_fields = ['seller', 'store', 'year', 'month']
+    ordering_fields = ['year', 'month', 'target_amount']
+
+    throttle_scope = 'goals'
+    throttle_action_scopes = {'progress': 'analytics'}
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if is_vendedor(self.request.user):
+            # Vendedor vê as próprias metas e as da equipe
+            queryset = queryset.filter(seller=self.request.user) | queryset.filter(seller__isnull=True)
+        return queryset
+
+    def _store_kwargs(self):
+        # Gerente de uma loja só cria metas de equipe da própria loja
+        store_id = user_store_id(self.request.user)
+        return {} if store_id is None else {'store_id': store_id}
+
+    def perform_create(self, serializer):
+        serializer.save(created_by=self.request.user, **self._store_kwargs())
+
+    def perform_update(self, serializer):
+        serializer.save(**self._store_kwargs())
+
+    @action(detail=False, methods=['get'])
+    def progress(self, request):
+        """
+        Progresso de todas as metas do mês, calculado com uma consulta agrupada.
+        GET /api/v1/goals/progress/?year=2025&month=8&as_of=2025-08-15
+        """
+        params = GoalProgressQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+
+        # Vendedor vê apenas as próprias metas (e as da equipe)
+        seller_id = request.user.pk if is_vendedor(request.user) else data.get("seller")
+        with use_replica():
+            return Response(goal_progress(
+                data["year"], data["month"], data.get("as_of"), seller_id, store_id=self.store_id,
+            ))
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.5 on 2026-10-19 16:11
+
+import django.core.validators
+import django.db.models.deletion
+import django.db.models.manager
+import uuid
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SalesGoal',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False, verbose_name='ID')),
+                ('uuid', models.UUIDField(default=uuid.uuid4, editable=False, help_text='Identificador único usado em URLs públicas', unique=True, verbose_name='UUID')),
+                ('is_active', models.BooleanField(default=True, help_text='Desmarque para desativar o registro em vez de excluí-lo', verbose_name='Ativo')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Atualizado em')),
+                ('year', models.PositiveIntegerField(validators=[django.core.validators.MinValueValidator(2024), django.core.validators.MaxValueValidator(2100)], verbose_name='Ano')),
+                ('month', models.PositiveIntegerField(validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(12)], verbose_name='Mês')),
+                ('target_amount', models.DecimalField(decimal_places=2, max_digits=14, validators=[django.core.validators.MinValueValidator(Decimal('0.01'))], verbose_name='Meta (R$)')),
+                ('notes', models.TextField(blank=True, verbose_name='Observações')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='goals_created', to=settings.AUTH_USER_MODEL, verbose_name='Criada por')),
+                ('seller', models.ForeignKey(blank=True, help_text='Deixe em branco para uma meta da equipe', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='sales_goals', to=settings.AUTH_USER_MODEL, verbose_name='Vendedor')),
+            ],
+            options={
+                'verbose_name': 'Meta de Vendas',
+                'verbose_name_plural': 'Metas de Vendas',
+                'ordering': ['-year', '-month', 'seller_id'],
+                'indexes': [models.Index(condition=models.Q(('is_active', True)), fields=['year', 'month'], name='goals_period_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('is_active', True)), fields=('seller', 'year', 'month'), name='goals_unique_seller_period'), models.UniqueConstraint(condition=models.Q(('is_active', True), ('seller__isnull', True)), fields=('year', 'month'), name='goals_unique_team_period')],
+            },
+            managers=[
+                ('all_objects', django.db.models.manager.Manager()),
+            ],
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.5 on 2026-10-19 16:17
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_store(apps, schema_editor):
+    # Metas de vendedor herdam a loja dele; metas de equipe existentes
+    # continuam da rede toda
+    Account = apps.get_model('accounts', 'Account')
+    SalesGoal = apps.get_model('goals', 'SalesGoal')
+    seller_store = Account._default_manager.filter(pk=OuterRef('seller_id')).values('store_id')[:1]
+    SalesGoal._default_manager.filter(seller__isnull=False).update(store_id=Subquery(seller_store))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0001_sales_goals'),
+        ('stores', '0001_initial'),
+        ('accounts', '0009_account_store'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='salesgoal',
+            name='goals_unique_team_period',
+        ),
+        migrations.AddField(
+            model_name='salesgoal',
+            name='store',
+            field=models.ForeignKey(blank=True, help_text='Metas de equipe: loja da equipe (vazio = rede toda)', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='sales_goals', to='stores.store', verbose_name='Loja'),
+        ),
+        migrations.RunPython(backfill_store, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='salesgoal',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['store', 'year', 'month'], name='goals_store_period_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='salesgoal',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_active', True), ('seller__isnull', True)), fields=('store', 'year', 'month'), name='goals_unique_team_period'),
+        ),
+        migrations.AddConstraint(
+            model_name='salesgoal',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_active', True), ('seller__isnull', True), ('store__isnull', True)), fields=('year', 'month'), name='goals_unique_network_period'),
+        ),
+    ]
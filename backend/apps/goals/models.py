@@ -0,0 +1,101 @@
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import models
+from django.db.models import Q
+
+from apps.core.models import BaseModel
+
+
+class SalesGoal(BaseModel):
+    """
+    Meta de vendas de um mês: de um vendedor ou, sem vendedor, da equipe
+    da loja (soma das vendas da loja; sem loja, da rede toda).
+    O progresso é calculado em `apps/goals/progress.py`.
+    """
+    # Metas de vendedor herdam a loja dele no save()
+    store = models.ForeignKey(
+        'stores.Store',
+        on_delete=models.PROTECT, null=True, blank=True,
+        related_name='sales_goals',
+        verbose_name="Loja",
+        help_text="Metas de equipe: loja da equipe (vazio = rede toda)"
+    )
+
+    seller = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.PROTECT, null=True, blank=True,
+        related_name='sales_goals',
+        verbose_name="Vendedor",
+        help_text="Deixe em branco para uma meta da equipe"
+    )
+
+    year = models.PositiveIntegerField(
+        verbose_name="Ano",
+        validators=[MinValueValidator(2024), MaxValueValidator(2100)]
+    )
+    month = models.PositiveIntegerField(
+        verbose_name="Mês",
+        validators=[MinValueValidator(1), MaxValueValidator(12)]
+    )
+
+    target_amount = models.DecimalField(
+        max_digits=14, decimal_places=2,
+        validators=[MinValueValidator(Decimal('0.01'))],
+        verbose_name="Meta (R$)"
+    )
+    notes = models.TextField(blank=True, verbose_name="Observações")
+
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='goals_created', verbose_name="Criada por"
+    )
+
+    def __str__(self):
+        owner = self.seller.get_full_name() if self.seller_id else "Equipe"
+        return f"{owner} - {self.month:02d}/{self.year}"
+
+    def save(self, *args, **kwargs):
+        if self.seller_id is not None:
+            self.store_id = self.seller.store_id
+        super().save(*args, **kwargs)
+
+    @property
+    def is_team_goal(self):
+        return self.seller_id is None
+
+    def clean(self):
+        duplicates = SalesGoal.objects.exclude(pk=self.pk).filter(
+            seller_id=self.seller_id, year=self.year, month=self.month,
+        )
+        if self.seller_id is None:
+            duplicates = duplicates.filter(store_id=self.store_id)
+        if duplicates.exists():
+            raise ValidationError("Já existe uma meta ativa para este vendedor (ou equipe) neste mês.")
+
+    class Meta:
+        verbose_name = "Meta de Vendas"
+        verbose_name_plural = "Metas de Vendas"
+        ordering = ['-year', '-month', 'seller_id']
+        constraints = [
+            # Uma meta ativa por vendedor e mês, uma por equipe de loja e uma da rede
+            models.UniqueConstraint(
+                fields=['seller', 'year', 'month'], condition=Q(is_active=True),
+                name='goals_unique_seller_period',
+            ),
+            models.UniqueConstraint(
+                fields=['store', 'year', 'month'], condition=Q(is_active=True, seller__isnull=True),
+                name='goals_unique_team_period',
+            ),
+            models.UniqueConstraint(
+                fields=['year', 'month'], condition=Q(is_active=True, seller__isnull=True, store__isnull=True),
+                name='goals_unique_network_period',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['year', 'month'], condition=Q(is_active=True), name='goals_period_idx'),
+            models.Index(fields=['store', 'year', 'month'], condition=Q(is_active=True), name='goals_store_period_idx'),
+        ]
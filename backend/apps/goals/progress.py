@@ -0,0 +1,147 @@
+# apps/goals/progress.py
+"""
+Progresso das metas de um mês.
+
+O realizado sai de uma única consulta agrupada por loja e vendedor (ou do
+resumo gravado no arquivamento, se o mês já está no arquivo frio), cruzada
+em memória com as metas do mês; metas da equipe usam a soma dos vendedores
+da loja (ou de todos, nas metas da rede). Nenhuma consulta por meta.
+
+Para cada meta:
+    achieved              total vendido no mês (inclusive hoje)
+    attainment_pct        achieved / meta, em %
+    gap                   quanto falta (zero se a meta já foi batida)
+    current_daily_rate    vendas até `as_of` / dias até `as_of` (mesma janela)
+    required_daily_rate   média diária necessária nos dias restantes
+    on_track              o ritmo atual basta para fechar a meta
+
+`as_of` é o último dia completo (padrão: ontem), como em
+`apps/dashboard/projection.py`: o dia de hoje ainda conta como restante.
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+
+from collections import defaultdict
+
+from django.db.models import Q, Sum
+
+from apps.sales.archive import archived_rows, month_bounds, month_store_totals
+from apps.sales.models import ArchivedSalesMonth, DailySales
+from .models import SalesGoal
+
+ZERO = Decimal('0.00')
+
+
+def default_as_of(year, month, today=None):
+    """Ontem, limitado ao mês (meses passados: último dia; futuros: véspera do primeiro)."""
+    today = today or date.today()
+    first_day, next_month = month_bounds(year, month)
+    return max(first_day - timedelta(days=1), min(today - timedelta(days=1), next_month - timedelta(days=1)))
+
+
+def month_totals(year, month, as_of, store_id=None):
+    """
+    {(store_id, seller_id): (total vendido no mês, total até `as_of`)} com
+    uma consulta agrupada.
+    """
+    first_day, next_month = month_bounds(year, month)
+    archived = ArchivedSalesMonth.objects.filter(year=year, month=month).first()
+    if archived is not None:
+        # Resumo por loja gravado no arquivamento (loja de cada venda, não a atual do vendedor)
+        summary = month_store_totals(archived)
+        to_date = None
+        if as_of < next_month - timedelta(days=1):
+            # Corte no meio do mês: o resumo não tem os dias, lê as linhas
+            to_date = defaultdict(lambda: ZERO)
+            stores = {seller: store for store, seller in summary}
+            for row in archived_rows(first_day, as_of):
+                store = row['store_id'] if row['store_id'] is not None else stores.get(row['seller_id'])
+                to_date[(store, row['seller_id'])] += row['total_amount']
+        return {
+            key: (amount, amount if to_date is None else to_date[key])
+            for key, (amount, _) in summary.items()
+            if store_id is None or key[0] == store_id
+        }
+
+    sales_qs = DailySales.objects.filter(sale_date__gte=first_day, sale_date__lt=next_month)
+    if store_id is not None:
+        sales_qs = sales_qs.filter(store_id=store_id)
+    rows = sales_qs.values('store_id', 'seller_id').annotate(
+        total=Sum('total_amount'),
+        to_date=Sum('total_amount', filter=Q(sale_date__lte=as_of)),
+    ).order_by()
+    return {(row['store_id'], row['seller_id']): (row['total'] or ZERO, row['to_date'] or ZERO) for row in rows}
+
+
+def _progress(goal, achieved, achieved_to_date, elapsed_days, remaining_days):
+    target = goal.target_amount
+    gap = max(target - achieved, ZERO)
+    # Ritmo só com os dias completos: vendas de hoje não entram no numerador
+    current_rate = achieved_to_date / elapsed_days if elapsed_days else ZERO
+    required_rate = gap / remaining_days if remaining_days else None
+    return {
+        "id": goal.pk,
+        "seller": goal.seller_id,
+        "seller_name": goal.seller.get_full_name() if goal.seller_id else "Equipe",
+        "team": goal.is_team_goal,
+        "target_amount": float(target),
+        "achieved": float(achieved),
+        "attainment_pct": round(float(achieved / target * 100), 1),
+        "gap": float(gap),
+        "current_daily_rate": round(float(current_rate), 2),
+        "required_daily_rate": None if required_rate is None else round(float(required_rate), 2),
+        "on_track": gap == 0 or (required_rate is not None and current_rate >= required_rate),
+    }
+
+
+def _achieved(goal, seller_totals, store_totals, network_total):
+    """(total do mês, total até `as_of`) da meta."""
+    if not goal.is_team_goal:
+        return seller_totals[goal.seller_id]
+    return network_total if goal.store_id is None else store_totals[goal.store_id]
+
+
+def _add(totals, total, to_date):
+    return totals[0] + total, totals[1] + to_date
+
+
+def goal_progress(year, month, as_of=None, seller_id=None, include_team=True, store_id=None):
+    """
+    Progresso de todas as metas ativas do mês. Com `seller_id`, só as metas
+    dele (e as da equipe, se `include_team`); com `store_id`, só as da loja.
+    """
+    as_of = as_of or default_as_of(year, month)
+    first_day, next_month = month_bounds(year, month)
+    days_in_month = (next_month - first_day).days
+    elapsed_days = max(0, min((as_of - first_day).days + 1, days_in_month))
+    remaining_days = days_in_month - elapsed_days
+
+    goals_qs = SalesGoal.objects.filter(year=year, month=month).select_related('seller')
+    if store_id is not None:
+        goals_qs = goals_qs.filter(store_id=store_id)
+    if seller_id is not None:
+        goals_qs = goals_qs.filter(seller_id=seller_id) | (
+            goals_qs.filter(seller__isnull=True) if include_team else goals_qs.none()
+        )
+    goals = list(goals_qs.order_by('seller_id'))
+
+    totals = month_totals(year, month, as_of, store_id) if goals else {}
+    seller_totals = defaultdict(lambda: (ZERO, ZERO))
+    store_totals = defaultdict(lambda: (ZERO, ZERO))
+    network_total = (ZERO, ZERO)
+    for (store, seller), (total, to_date) in totals.items():
+        seller_totals[seller] = _add(seller_totals[seller], total, to_date)
+        store_totals[store] = _add(store_totals[store], total, to_date)
+        network_total = _add(network_total, total, to_date)
+    return {
+        "year": year,
+        "month": month,
+        "as_of": as_of.isoformat(),
+        "days_in_month": days_in_month,
+        "elapsed_days": elapsed_days,
+        "remaining_days": remaining_days,
+        "goals": [
+            _progress(goal, *_achieved(goal, seller_totals, store_totals, network_total), elapsed_days, remaining_days)
+            for goal in goals
+        ],
+    }
@@ -0,0 +1,23 @@
+from django.contrib import admin
+from .models import OutboxEvent, WebhookEndpoint
+
+
+@admin.register(WebhookEndpoint)
+class WebhookEndpointAdmin(admin.ModelAdmin):
+    list_display = ('name', 'url', 'is_active', 'last_event_id', 'failures', 'next_attempt_at')
+    list_filter = ('is_active',)
+    readonly_fields = ('last_event_id', 'failures', 'next_attempt_at', 'last_error')
+
+
+@admin.register(OutboxEvent)
+class OutboxEventAdmin(admin.ModelAdmin):
+    list_display = ('id', 'event_type', 'created_at')
+    list_filter = ('event_type',)
+    show_full_result_count = False
+
+    # Eventos são gravados pelo sistema
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
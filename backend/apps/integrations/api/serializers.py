@@ -0,0 +1,31 @@
+from rest_framework import serializers
+
+from ..changes import FEED_TYPES, InvalidCursor, decode_cursor
+
+MAX_PAGE_SIZE = 1000
+
+
+class ChangeFeedQuerySerializer(serializers.Serializer):
+    """
+    Valida os parâmetros de `/api/v1/changes/`.
+    - `since`: `next_cursor` da resposta anterior (vazio = desde o início)
+    - `types`: lista separada por vírgula entre sales, reports e accounts (padrão: todos)
+    - `page_size`: máximo de alterações por resposta (padrão 500, máx. 1000)
+    """
+    since = serializers.CharField(required=False, allow_blank=True, default='')
+    types = serializers.CharField(required=False, default=','.join(FEED_TYPES))
+    page_size = serializers.IntegerField(min_value=1, max_value=MAX_PAGE_SIZE, default=500)
+
+    def validate_since(self, value):
+        try:
+            decode_cursor(value)
+        except InvalidCursor:
+            raise serializers.ValidationError("Cursor inválido.")
+        return value
+
+    def validate_types(self, value):
+        types = [name.strip() for name in value.split(',') if name.strip()]
+        unknown = [name for name in types if name not in FEED_TYPES]
+        if unknown or not types:
+            raise serializers.ValidationError(f"Tipos aceitos: {', '.join(FEED_TYPES)}.")
+        return list(dict.fromkeys(types))
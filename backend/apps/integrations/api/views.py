@@ -0,0 +1,33 @@
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.stores.tenancy import resolve_store_id
+from ..changes import read_changes
+from .serializers import ChangeFeedQuerySerializer
+
+
+class ChangeFeedView(APIView):
+    """
+    Feed incremental de vendas, relatórios e usuários para sincronização
+    (apenas administradores). Desativações chegam com `is_active=false`.
+
+    /api/v1/changes/?types=sales,reports&page_size=500
+    /api/v1/changes/?since=<next_cursor da resposta anterior>
+    /api/v1/changes/?store=2   (administradores da rede: uma loja; os de uma loja sempre recebem só a deles)
+    {
+        "results": [{"type": "sales", "id": 42, "updated_at": "...", "is_active": true, "data": {...}}, ...],
+        "next_cursor": "eyJzYWxlcyI6...",
+        "has_more": false
+    }
+
+    Enquanto `has_more` for true, chame de novo com `since=next_cursor`.
+    """
+    permission_classes = [permissions.IsAdminUser]
+    throttle_scope = 'changes'
+
+    def get(self, request):
+        params = ChangeFeedQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+        return Response(read_changes(data['types'], data['since'], data['page_size'], resolve_store_id(request)))
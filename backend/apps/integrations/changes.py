@@ -0,0 +1,200 @@
+# apps/integrations/changes.py
+"""
+Feed incremental de alterações para sincronização (ERP, BI).
+
+Cada tipo é lido em keyset por `(updated_at, id)`, com índice próprio em
+cada tabela, pelo manager `all_objects`: desativações aparecem como linhas
+com `is_active=False`. O cursor é opaco (JSON em base64) e guarda a última
+posição `(updated_at, id)` entregue de cada tipo, então o cliente só
+precisa persistir o `next_cursor` da última resposta.
+
+Linhas alteradas nos últimos `CHANGE_FEED_LAG_SECONDS` ficam para a
+próxima chamada: uma transação mais lenta ainda pode gravar um
+`updated_at` anterior ao de outra que já foi confirmada, e sem essa folga
+o cursor passaria por cima dela.
+
+Com `store_id`, só as linhas da loja, pelos índices `(store, updated_at, id)`.
+
+O arquivamento de um mês (`apps.sales.archive`) tira as vendas da tabela
+sem tocar em `updated_at`. Para que uma venda alterada pouco antes do
+arquivamento, e ainda não entregue, não suma do feed, as vendas de cada
+mês arquivado depois do cursor são entregues de novo (tipo `sales`, antes
+das demais alterações) a partir do arquivo. O cursor guarda essa marca à
+parte (`ARCHIVE_KEY`: id do mês arquivado e posição da linha no arquivo),
+então cada página só monta as linhas que devolve. Vendas arquivadas não
+são exclusões; continuam valendo no histórico.
+"""
+import base64
+import binascii
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from apps.accounts.models import Account
+from apps.commissions.models import MonthlyCommissionReport
+from apps.sales.archive import in_store, read_month, seller_store_ids
+from apps.sales.models import ArchivedSalesMonth, DailySales
+
+CHANGE_FEED_LAG_SECONDS = getattr(settings, 'CHANGE_FEED_LAG_SECONDS', 5)
+# Marca das vendas arquivadas no cursor: [id do ArchivedSalesMonth, posição no arquivo]
+ARCHIVE_KEY = 'sales_archive'
+
+# tipo -> (modelo, colunas entregues)
+FEED_TYPES = {
+    'sales': (DailySales, (
+        'id', 'uuid', 'seller_id', 'store_id', 'sale_date', 'total_amount', 'commission_rate_applied',
+        'calculated_commission', 'notes', 'registered_by_id', 'is_active', 'created_at', 'updated_at',
+    )),
+    'reports': (MonthlyCommissionReport, (
+        'id', 'uuid', 'seller_id', 'store_id', 'year', 'month', 'total_sales_amount', 'sales_days_count',
+        'total_commission', 'average_commission_rate', 'status', 'approved_by_id', 'approved_at',
+        'paid_at', 'payment_batch_id', 'batch_amount', 'is_active', 'created_at', 'updated_at',
+    )),
+    'accounts': (Account, (
+        'id', 'uuid', 'username', 'first_name', 'last_name', 'email', 'user_type', 'store_id', 'document',
+        'commission_rate', 'commission_active', 'is_active', 'date_joined', 'created_at', 'updated_at',
+    )),
+}
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(positions):
+    """{tipo: (updated_at, id), ARCHIVE_KEY: (mês, posição)} -> texto opaco."""
+    data = {
+        name: list(value) if name == ARCHIVE_KEY else [value[0].isoformat(), value[1]]
+        for name, value in positions.items()
+    }
+    return base64.urlsafe_b64encode(json.dumps(data, separators=(',', ':')).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Inverso de `encode_cursor`. Cursor vazio = desde o início."""
+    if not cursor:
+        return {}
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        positions = {}
+        for name, (updated_at, pk) in data.items():
+            if name == ARCHIVE_KEY:
+                positions[name] = (int(updated_at), int(pk))
+                continue
+            value = parse_datetime(updated_at)
+            if name not in FEED_TYPES or value is None:
+                raise InvalidCursor(cursor)
+            positions[name] = (value, int(pk))
+        return positions
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, AttributeError) as exc:
+        raise InvalidCursor(cursor) from exc
+
+
+def _rows(name, position, upper, limit, store_id=None):
+    model, fields = FEED_TYPES[name]
+    queryset = model.all_objects.filter(updated_at__lte=upper)
+    if store_id is not None:
+        queryset = queryset.filter(store_id=store_id)
+    if position is not None:
+        updated_at, pk = position
+        queryset = queryset.filter(Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, id__gt=pk))
+    return list(queryset.order_by('updated_at', 'id').values(*fields)[:limit + 1])
+
+
+def _archive_start(sales_position):
+    """
+    Marca inicial das vendas arquivadas: desde o primeiro mês arquivado
+    (sincronização do zero) ou desde o primeiro arquivado depois da posição
+    `sales` de um cursor anterior à marca.
+    """
+    months = ArchivedSalesMonth.objects.order_by('id')
+    if sales_position is None:
+        first = months.values_list('id', flat=True).first()
+        return (first or 0, 0)
+    first = months.filter(created_at__gte=sales_position[0]).values_list('id', flat=True).first()
+    if first is None:
+        # Nada arquivado depois do cursor: só os próximos meses
+        first = (months.values_list('id', flat=True).last() or 0) + 1
+    return (first, 0)
+
+
+def _archived_sales(mark, limit, store_id=None):
+    """
+    Até `limit` vendas dos meses arquivados a partir da marca `(mês, posição)`.
+    Retorna (linhas, nova marca, há mais). Sem filtro de loja só as linhas
+    devolvidas são montadas; a posição conta as linhas do arquivo.
+    """
+    month_id, offset = mark
+    rows = []
+    store_sellers = None
+    for archived in ArchivedSalesMonth.objects.filter(id__gte=month_id).order_by('id'):
+        if archived.id != month_id:
+            month_id, offset = archived.id, 0
+        if len(rows) >= limit:
+            return rows, (month_id, offset), True
+        if store_sellers is None:
+            store_sellers = seller_store_ids(store_id) if store_id is not None else set()
+        stop = archived.row_count if store_id is not None else min(archived.row_count, offset + limit - len(rows))
+        for position, row in enumerate(read_month(archived, offset, stop), offset):
+            if len(rows) >= limit:
+                return rows, (month_id, position), True
+            if in_store(row, store_id, store_sellers):
+                rows.append(row)
+            offset = position + 1
+        if offset < archived.row_count:
+            return rows, (month_id, offset), True
+        month_id, offset = archived.id + 1, 0
+    return rows, (month_id, offset), False
+
+
+def read_changes(types, cursor=None, limit=500, store_id=None):
+    """
+    Até `limit` alterações (somando os tipos pedidos) depois do cursor,
+    em ordem de `updated_at` (só da loja, com `store_id`).
+
+    Retorna {"results": [{"type", "id", "updated_at", "is_active", "data"}],
+    "next_cursor", "has_more"}.
+    """
+    positions = decode_cursor(cursor)
+    upper = timezone.now() - timedelta(seconds=CHANGE_FEED_LAG_SECONDS)
+
+    if 'sales' in types:
+        # Vendas de meses arquivados depois do cursor vêm antes das demais alterações
+        mark = positions.get(ARCHIVE_KEY) or _archive_start(positions.get('sales'))
+        rows, positions[ARCHIVE_KEY], more = _archived_sales(mark, limit, store_id)
+        if rows or more:
+            return {
+                'results': [
+                    {'type': 'sales', 'id': row['id'], 'updated_at': row['updated_at'], 'is_active': row['is_active'], 'data': row}
+                    for row in rows
+                ],
+                'next_cursor': encode_cursor(positions),
+                'has_more': True,
+            }
+
+    candidates = []
+    fetched = {}
+    for name in types:
+        rows = _rows(name, positions.get(name), upper, limit, store_id)
+        fetched[name] = len(rows)
+        candidates.extend((row['updated_at'], name, row['id'], row) for row in rows)
+    candidates.sort(key=lambda item: item[:3])
+    page = candidates[:limit]
+
+    consumed = dict.fromkeys(types, 0)
+    for updated_at, name, pk, row in page:
+        positions[name] = (updated_at, pk)
+        consumed[name] += 1
+
+    return {
+        'results': [
+            {'type': name, 'id': pk, 'updated_at': updated_at, 'is_active': row['is_active'], 'data': row}
+            for updated_at, name, pk, row in page
+        ],
+        'next_cursor': encode_cursor(positions) if positions else (cursor or ''),
+        'has_more': any(fetched[name] > consumed[name] for name in types),
+    }
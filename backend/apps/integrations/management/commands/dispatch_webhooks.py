@@ -0,0 +1,39 @@
+# apps/integrations/management/commands/dispatch_webhooks.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.integrations.webhooks import Dispatcher, prune_delivered
+
+
+class Command(BaseCommand):
+    help = (
+        "Entrega os eventos do outbox aos endpoints de webhook ativos, em lotes, com conexões "
+        "keep-alive, até max_concurrency lotes simultâneos por endpoint e backoff nas falhas."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Um único ciclo de entrega')
+        parser.add_argument('--interval', type=float, default=1.0, help='Pausa entre ciclos sem eventos (segundos)')
+        parser.add_argument('--workers', type=int, default=4, help='Endpoints atendidos ao mesmo tempo')
+        parser.add_argument('--prune', action='store_true', help='Remove eventos já entregues a todos os endpoints')
+
+    def handle(self, *args, **options):
+        dispatcher = Dispatcher()
+        try:
+            while True:
+                delivered = dispatcher.run_once(max_workers=options['workers'])
+                if delivered:
+                    self.stdout.write(f"{delivered} eventos entregues.")
+                if options['prune']:
+                    pruned = prune_delivered()
+                    if pruned:
+                        self.stdout.write(f"{pruned} eventos removidos do outbox.")
+                if options['once']:
+                    break
+                if not delivered:
+                    time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            dispatcher.close()
@@ -0,0 +1,64 @@
+# apps/integrations/management/commands/webhook_stub_server.py
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Servidor HTTP local que recebe webhooks para testar o dispatch_webhooks. "
+        "Mostra cada lote recebido e a conexão usada (keep-alive); pode simular falhas e lentidão."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--fail-every', type=int, default=0, help='Responde 500 a cada N requisições')
+        parser.add_argument('--delay', type=float, default=0.0, help='Atraso de cada resposta (segundos)')
+
+    def handle(self, *args, **options):
+        stdout = self.stdout
+        lock = threading.Lock()
+        state = {'requests': 0, 'events': 0}
+
+        class Handler(BaseHTTPRequestHandler):
+            # HTTP/1.1 mantém a conexão aberta entre requisições
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                events = json.loads(body or b'{}').get('events', [])
+                with lock:
+                    state['requests'] += 1
+                    number = state['requests']
+                    failing = options['fail_every'] and number % options['fail_every'] == 0
+                    if not failing:
+                        state['events'] += len(events)
+                    total = state['events']
+                if options['delay']:
+                    time.sleep(options['delay'])
+
+                status = 500 if failing else 200
+                ids = f"{events[0]['id']}..{events[-1]['id']}" if events else '-'
+                stdout.write(
+                    f"#{number} {self.client_address[1]} {self.headers.get('X-VendaPay-Delivery', '')} "
+                    f"{len(events)} eventos ({ids}) -> {status} [total {total}]"
+                )
+                self.send_response(status)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((options['host'], options['port']), Handler)
+        self.stdout.write(f"Recebendo webhooks em http://{options['host']}:{options['port']}/ (Ctrl+C para sair)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
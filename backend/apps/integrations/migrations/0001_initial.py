@@ -0,0 +1,59 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:42
+
+import django.core.serializers.json
+import django.db.models.manager
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxEvent',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('event_type', models.CharField(choices=[('sale.registered', 'Venda registrada'), ('report.approved', 'Relatório aprovado'), ('report.paid', 'Relatório pago')], max_length=40, verbose_name='Tipo')),
+                ('payload', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder, verbose_name='Dados')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+            ],
+            options={
+                'verbose_name': 'Evento de Integração',
+                'verbose_name_plural': 'Eventos de Integração',
+                'ordering': ['id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='WebhookEndpoint',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False, verbose_name='ID')),
+                ('uuid', models.UUIDField(default=uuid.uuid4, editable=False, help_text='Identificador único usado em URLs públicas', unique=True, verbose_name='UUID')),
+                ('is_active', models.BooleanField(default=True, help_text='Desmarque para desativar o registro em vez de excluí-lo', verbose_name='Ativo')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Atualizado em')),
+                ('name', models.CharField(max_length=100, verbose_name='Nome')),
+                ('url', models.URLField(verbose_name='URL')),
+                ('secret', models.CharField(blank=True, help_text='Se preenchido, cada POST leva X-VendaPay-Signature (HMAC-SHA256 do corpo)', max_length=128, verbose_name='Segredo')),
+                ('event_types', models.JSONField(blank=True, default=list, help_text='Lista de tipos (ex.: ["report.paid"]); vazia = todos', verbose_name='Tipos de evento')),
+                ('batch_size', models.PositiveIntegerField(default=100, verbose_name='Eventos por requisição')),
+                ('max_concurrency', models.PositiveSmallIntegerField(default=2, help_text='Lotes enviados ao mesmo tempo (e conexões mantidas abertas) para este endpoint', verbose_name='Requisições simultâneas')),
+                ('last_event_id', models.PositiveBigIntegerField(default=0, verbose_name='Último evento entregue')),
+                ('failures', models.PositiveIntegerField(default=0, verbose_name='Falhas seguidas')),
+                ('next_attempt_at', models.DateTimeField(blank=True, null=True, verbose_name='Próxima tentativa')),
+                ('last_error', models.TextField(blank=True, verbose_name='Último erro')),
+            ],
+            options={
+                'verbose_name': 'Endpoint de Webhook',
+                'verbose_name_plural': 'Endpoints de Webhook',
+                'ordering': ['name'],
+            },
+            managers=[
+                ('all_objects', django.db.models.manager.Manager()),
+            ],
+        ),
+    ]
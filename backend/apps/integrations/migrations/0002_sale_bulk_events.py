@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-19 17:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('integrations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='outboxevent',
+            name='event_type',
+            field=models.CharField(choices=[('sale.registered', 'Venda registrada'), ('sale.updated', 'Venda recalculada'), ('sale.deactivated', 'Venda desativada'), ('report.approved', 'Relatório aprovado'), ('report.paid', 'Relatório pago')], max_length=40, verbose_name='Tipo'),
+        ),
+    ]
@@ -0,0 +1,71 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+from apps.core.models import BaseModel
+
+
+class OutboxEvent(models.Model):
+    """
+    Evento de integração gravado na mesma transação da alteração que o
+    gerou (outbox transacional). O `dispatch_webhooks` entrega os eventos
+    em ordem de `id` para cada `WebhookEndpoint`.
+
+    Não herda de BaseModel: eventos não são editados nem desativados.
+    """
+
+    class EventType(models.TextChoices):
+        SALE_REGISTERED = "sale.registered", "Venda registrada"
+        SALE_UPDATED = "sale.updated", "Venda recalculada"
+        SALE_DEACTIVATED = "sale.deactivated", "Venda desativada"
+        REPORT_APPROVED = "report.approved", "Relatório aprovado"
+        REPORT_PAID = "report.paid", "Relatório pago"
+
+    id = models.BigAutoField(primary_key=True)
+    event_type = models.CharField(max_length=40, choices=EventType.choices, verbose_name="Tipo")
+    payload = models.JSONField(encoder=DjangoJSONEncoder, verbose_name="Dados")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Criado em")
+
+    def __str__(self):
+        return f"{self.event_type} #{self.pk}"
+
+    class Meta:
+        verbose_name = "Evento de Integração"
+        verbose_name_plural = "Eventos de Integração"
+        ordering = ['id']
+
+
+class WebhookEndpoint(BaseModel):
+    """
+    Destino de webhooks. Cada endpoint tem seu próprio cursor
+    (`last_event_id`): um endpoint fora do ar não atrasa os outros e, ao
+    voltar, recebe os eventos pendentes na ordem original.
+    """
+    name = models.CharField(max_length=100, verbose_name="Nome")
+    url = models.URLField(verbose_name="URL")
+    secret = models.CharField(
+        max_length=128, blank=True, verbose_name="Segredo",
+        help_text="Se preenchido, cada POST leva X-VendaPay-Signature (HMAC-SHA256 do corpo)"
+    )
+    event_types = models.JSONField(
+        default=list, blank=True, verbose_name="Tipos de evento",
+        help_text='Lista de tipos (ex.: ["report.paid"]); vazia = todos'
+    )
+    batch_size = models.PositiveIntegerField(default=100, verbose_name="Eventos por requisição")
+    max_concurrency = models.PositiveSmallIntegerField(
+        default=2, verbose_name="Requisições simultâneas",
+        help_text="Lotes enviados ao mesmo tempo (e conexões mantidas abertas) para este endpoint"
+    )
+
+    # Estado da entrega
+    last_event_id = models.PositiveBigIntegerField(default=0, verbose_name="Último evento entregue")
+    failures = models.PositiveIntegerField(default=0, verbose_name="Falhas seguidas")
+    next_attempt_at = models.DateTimeField(null=True, blank=True, verbose_name="Próxima tentativa")
+    last_error = models.TextField(blank=True, verbose_name="Último erro")
+
+    def __str__(self):
+        return self.name
+
+    class Meta:
+        verbose_name = "Endpoint de Webhook"
+        verbose_name_plural = "Endpoints de Webhook"
+        ordering = ['name']
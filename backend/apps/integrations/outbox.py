@@ -0,0 +1,34 @@
+# apps/integrations/outbox.py
+"""
+Outbox transacional de eventos de integração.
+
+`publish` grava o `OutboxEvent` com a conexão da transação corrente, então
+o evento só existe se a alteração que o gerou for confirmada (as views de
+escrita já rodam em `transaction.atomic` via `retry_on_busy`). A entrega
+fica com `apps.integrations.webhooks`.
+"""
+from .models import OutboxEvent
+
+SALE_FIELDS = (
+    'id', 'uuid', 'seller_id', 'sale_date', 'total_amount', 'commission_rate_applied',
+    'calculated_commission', 'registered_by_id',
+)
+REPORT_FIELDS = (
+    'id', 'uuid', 'seller_id', 'year', 'month', 'total_sales_amount', 'total_commission',
+    'status', 'approved_by_id', 'approved_at', 'paid_at',
+)
+
+
+def instance_payload(instance, fields):
+    return {name: getattr(instance, name) for name in fields}
+
+
+def publish(event_type, payload, using=None):
+    return OutboxEvent.objects.using(using).create(event_type=event_type, payload=payload)
+
+
+def publish_many(event_type, payloads, using=None):
+    """Vários eventos do mesmo tipo em um único INSERT."""
+    return OutboxEvent.objects.using(using).bulk_create(
+        [OutboxEvent(event_type=event_type, payload=payload) for payload in payloads]
+    )
@@ -0,0 +1,55 @@
+# apps/integrations/signals.py
+from django.db.models.signals import post_save
+
+from apps.commissions.models import MonthlyCommissionReport
+from apps.commissions.signals import reports_transitioned
+from apps.sales.models import DailySales
+from apps.sales.signals import sales_updated
+from .models import OutboxEvent
+from .outbox import REPORT_FIELDS, SALE_FIELDS, instance_payload, publish, publish_many
+
+Status = MonthlyCommissionReport.Status
+
+# Status de relatório que geram evento
+REPORT_EVENTS = {
+    Status.APPROVED: OutboxEvent.EventType.REPORT_APPROVED,
+    Status.PAID: OutboxEvent.EventType.REPORT_PAID,
+}
+
+
+def sale_registered(sender, instance, created, raw=False, using=None, **kwargs):
+    if created and not raw:
+        publish(OutboxEvent.EventType.SALE_REGISTERED, instance_payload(instance, SALE_FIELDS), using=using)
+
+
+def report_status_changed(sender, instance, created, raw=False, using=None, **kwargs):
+    if raw or 'status' not in getattr(instance, '_tracked_changes', {}):
+        return
+    event_type = REPORT_EVENTS.get(instance.status)
+    if event_type:
+        publish(event_type, instance_payload(instance, REPORT_FIELDS), using=using)
+
+
+def reports_bulk_transitioned(sender, previous, status, **kwargs):
+    """Transição em lote (UPDATE direto): um evento por relatório, em um INSERT."""
+    event_type = REPORT_EVENTS.get(status)
+    if event_type is None or not previous:
+        return
+    rows = MonthlyCommissionReport.all_objects.filter(pk__in=list(previous)).order_by('id').values(*REPORT_FIELDS)
+    publish_many(event_type, list(rows))
+
+
+def sales_bulk_updated(sender, changes, **kwargs):
+    """Vendas alteradas em lote (UPDATE direto): um INSERT por tipo de evento."""
+    deactivated = [pk for pk, fields in changes.items() if 'is_active' in fields]
+    updated = [pk for pk in changes if 'is_active' not in changes[pk]]
+    for event_type, pks in ((OutboxEvent.EventType.SALE_DEACTIVATED, deactivated), (OutboxEvent.EventType.SALE_UPDATED, updated)):
+        if pks:
+            rows = DailySales.all_objects.filter(pk__in=pks).order_by('id').values(*SALE_FIELDS)
+            publish_many(event_type, list(rows))
+
+
+post_save.connect(sale_registered, sender=DailySales, dispatch_uid='outbox_sale_registered')
+post_save.connect(report_status_changed, sender=MonthlyCommissionReport, dispatch_uid='outbox_report_status')
+reports_transitioned.connect(reports_bulk_transitioned, dispatch_uid='outbox_reports_transitioned')
+sales_updated.connect(sales_bulk_updated, dispatch_uid='outbox_sales_updated')
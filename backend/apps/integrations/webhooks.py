@@ -0,0 +1,274 @@
+# apps/integrations/webhooks.py
+"""
+Entrega dos eventos do outbox aos `WebhookEndpoint`s.
+
+Para cada endpoint ativo e liberado (`next_attempt_at` vencido):
+- percorre os eventos depois do cursor (`last_event_id`), em ordem, e
+  separa os dos tipos assinados, até `batch_size * max_concurrency`
+- divide em lotes de `batch_size` e envia até `max_concurrency` lotes ao
+  mesmo tempo, cada um em um POST JSON:
+      {"events": [{"id": 1, "type": "sale.registered", "created_at": "...", "data": {...}}]}
+- avança o cursor até o último lote confirmado sem falhas antes dele
+  (entrega "ao menos uma vez": o receptor deduplica pelo `id` do evento);
+  sem falhas, até o maior id percorrido, inclusive eventos de tipos que o
+  endpoint não assina (senão o cursor e o `prune_delivered` param neles)
+- se algum lote falhar, agenda a próxima tentativa com backoff exponencial
+
+As conexões HTTP(S) ficam abertas entre lotes e entre ciclos (keep-alive),
+no máximo `max_concurrency` por endpoint.
+
+Ids são reservados no INSERT, mas uma transação mais lenta pode confirmar
+um id menor depois de outra, e o cursor não pode passar por cima dele:
+- eventos dos últimos `WEBHOOK_LAG_SECONDS` esperam o próximo ciclo
+- um buraco na sequência de ids (transação ainda aberta) segura o cursor
+  antes dele por até `WEBHOOK_GAP_SECONDS`, contados da criação do evento
+  seguinte. Depois disso o id é dado como perdido (rollback): uma
+  transação que fique aberta mais do que isso depois de gravar o evento
+  tem o evento pulado.
+"""
+import hashlib
+import hmac
+import http.client
+import json
+import logging
+import queue
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections
+from django.db.models import Min, Q
+from django.utils import timezone
+
+from .models import OutboxEvent, WebhookEndpoint
+
+logger = logging.getLogger(__name__)
+
+WEBHOOK_TIMEOUT = getattr(settings, 'WEBHOOK_TIMEOUT', 10)
+WEBHOOK_LAG_SECONDS = getattr(settings, 'WEBHOOK_LAG_SECONDS', 2)
+WEBHOOK_GAP_SECONDS = getattr(settings, 'WEBHOOK_GAP_SECONDS', 60)
+# Eventos percorridos por ciclo (de todos os tipos) à procura dos assinados
+WEBHOOK_SCAN_LIMIT = getattr(settings, 'WEBHOOK_SCAN_LIMIT', 5000)
+WEBHOOK_BACKOFF_BASE = getattr(settings, 'WEBHOOK_BACKOFF_BASE', 5)
+WEBHOOK_BACKOFF_MAX = getattr(settings, 'WEBHOOK_BACKOFF_MAX', 3600)
+
+SIGNATURE_HEADER = 'X-VendaPay-Signature'
+
+
+class DeliveryError(Exception):
+    pass
+
+
+def backoff_delay(failures):
+    """Segundos até a próxima tentativa: exponencial, com teto e jitter."""
+    delay = min(WEBHOOK_BACKOFF_BASE * (2 ** (failures - 1)), WEBHOOK_BACKOFF_MAX)
+    return delay * (1 + random.random() / 4)
+
+
+def sign(secret, body):
+    return 'sha256=' + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+class ConnectionPool:
+    """Até `size` conexões keep-alive para um mesmo host; cada POST usa uma livre."""
+
+    def __init__(self, url, size, timeout=WEBHOOK_TIMEOUT):
+        parts = urlsplit(url)
+        self.url = url
+        self.size = size
+        self.path = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+        self._connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        self._host, self._port = parts.hostname, parts.port
+        self._timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self.executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix='webhook')
+
+    def _new_connection(self):
+        return self._connection_class(self._host, self._port, timeout=self._timeout)
+
+    def _request(self, connection, body, headers):
+        connection.request('POST', self.path, body=body, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        return response
+
+    def post(self, body, headers):
+        """Envia o POST e devolve o status HTTP. Erros de rede levantam DeliveryError."""
+        with self._slots:
+            try:
+                connection, reused = self._idle.get_nowait(), True
+            except queue.Empty:
+                connection, reused = self._new_connection(), False
+            try:
+                try:
+                    response = self._request(connection, body, headers)
+                except (OSError, http.client.HTTPException):
+                    if not reused:
+                        raise
+                    # O servidor pode ter fechado a conexão ociosa: tenta uma nova
+                    connection.close()
+                    connection = self._new_connection()
+                    response = self._request(connection, body, headers)
+            except (OSError, http.client.HTTPException) as exc:
+                connection.close()
+                raise DeliveryError(f'{type(exc).__name__}: {exc}') from exc
+
+            if response.will_close:
+                connection.close()
+            else:
+                self._idle.put(connection)
+            return response.status
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class Dispatcher:
+    """Mantém os pools por endpoint entre ciclos de entrega."""
+
+    def __init__(self, timeout=WEBHOOK_TIMEOUT):
+        self.timeout = timeout
+        self._pools = {}
+
+    def pool_for(self, endpoint):
+        size = max(1, endpoint.max_concurrency)
+        pool = self._pools.get(endpoint.pk)
+        if pool is None or pool.url != endpoint.url or pool.size != size:
+            if pool is not None:
+                pool.close()
+            pool = self._pools[endpoint.pk] = ConnectionPool(endpoint.url, size, self.timeout)
+        return pool
+
+    def close(self):
+        for pool in self._pools.values():
+            pool.close()
+        self._pools.clear()
+
+    def due_endpoints(self):
+        now = timezone.now()
+        return list(
+            WebhookEndpoint.objects.filter(Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now))
+            .order_by('id')
+        )
+
+    def pending_events(self, endpoint):
+        """
+        (eventos a entregar, até onde o cursor pode ir se todos forem
+        confirmados). Percorre todos os tipos e para antes de um buraco
+        recente na sequência de ids.
+        """
+        now = timezone.now()
+        scanned = list(
+            OutboxEvent.objects.filter(
+                id__gt=endpoint.last_event_id, created_at__lte=now - timedelta(seconds=WEBHOOK_LAG_SECONDS),
+            ).order_by('id').values_list('id', 'event_type', 'created_at')[:WEBHOOK_SCAN_LIMIT]
+        )
+
+        expected = endpoint.last_event_id + 1
+        for position, (pk, _, created_at) in enumerate(scanned):
+            if pk != expected and created_at > now - timedelta(seconds=WEBHOOK_GAP_SECONDS):
+                # Id menor ainda pode ser confirmado: espera antes do buraco
+                scanned = scanned[:position]
+                break
+            expected = pk + 1
+        if not scanned:
+            return [], endpoint.last_event_id
+
+        limit = max(1, endpoint.batch_size) * max(1, endpoint.max_concurrency)
+        wanted = [
+            pk for pk, event_type, _ in scanned
+            if not endpoint.event_types or event_type in endpoint.event_types
+        ][:limit]
+        # Com o limite cheio, os eventos depois do último ficam para o próximo ciclo
+        upto = wanted[-1] if len(wanted) == limit else scanned[-1][0]
+        events = list(OutboxEvent.objects.filter(pk__in=wanted).order_by('id')) if wanted else []
+        return events, upto
+
+    def _send(self, endpoint, pool, batch):
+        body = json.dumps(
+            {'events': [
+                {'id': event.pk, 'type': event.event_type, 'created_at': event.created_at, 'data': event.payload}
+                for event in batch
+            ]},
+            cls=DjangoJSONEncoder,
+        ).encode()
+        headers = {
+            'Content-Type': 'application/json',
+            'X-VendaPay-Delivery': f'{endpoint.pk}-{batch[0].pk}-{batch[-1].pk}',
+        }
+        if endpoint.secret:
+            headers[SIGNATURE_HEADER] = sign(endpoint.secret, body)
+        status = pool.post(body, headers)
+        if not 200 <= status < 300:
+            raise DeliveryError(f'HTTP {status}')
+
+    def deliver(self, endpoint):
+        """Um ciclo de entrega para o endpoint. Retorna quantos eventos foram confirmados."""
+        events, upto = self.pending_events(endpoint)
+        if not events:
+            if upto > endpoint.last_event_id:
+                # Só eventos que o endpoint não assina: o cursor passa por eles
+                endpoint.last_event_id = upto
+                endpoint.save(update_fields=['last_event_id', 'updated_at'])
+            return 0
+
+        pool = self.pool_for(endpoint)
+        size = max(1, endpoint.batch_size)
+        batches = [events[start:start + size] for start in range(0, len(events), size)]
+        futures = [pool.executor.submit(self._send, endpoint, pool, batch) for batch in batches]
+
+        delivered, error = 0, None
+        for batch, future in zip(batches, futures):
+            try:
+                future.result()
+            except DeliveryError as exc:
+                error = error or exc
+                continue
+            if error is None:
+                # Cursor só avança por lotes contíguos confirmados
+                endpoint.last_event_id = batch[-1].pk
+                delivered += len(batch)
+
+        if error is None:
+            endpoint.last_event_id = upto
+            endpoint.failures, endpoint.next_attempt_at, endpoint.last_error = 0, None, ''
+        else:
+            endpoint.failures += 1
+            endpoint.next_attempt_at = timezone.now() + timedelta(seconds=backoff_delay(endpoint.failures))
+            endpoint.last_error = str(error)
+            logger.warning('Webhook %s falhou (%s seguidas): %s', endpoint, endpoint.failures, error)
+        endpoint.save(update_fields=['last_event_id', 'failures', 'next_attempt_at', 'last_error', 'updated_at'])
+        return delivered
+
+    def _deliver_isolated(self, endpoint):
+        try:
+            return self.deliver(endpoint)
+        finally:
+            close_old_connections()
+
+    def run_once(self, max_workers=4):
+        """Entrega para todos os endpoints liberados ao mesmo tempo. Retorna o total entregue."""
+        endpoints = self.due_endpoints()
+        if not endpoints:
+            return 0
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(endpoints)), thread_name_prefix='webhook-endpoint') as executor:
+            return sum(executor.map(self._deliver_isolated, endpoints))
+
+
+def prune_delivered():
+    """Remove eventos já entregues a todos os endpoints ativos."""
+    cursor = WebhookEndpoint.objects.aggregate(cursor=Min('last_event_id'))['cursor']
+    if cursor is None:
+        return 0
+    deleted, _ = OutboxEvent.objects.filter(id__lte=cursor).delete()
+    return deleted
@@ -1,7 +1,108 @@
-from django.contrib import admin
-from .models import DailySales
+from django.contrib import admin, messages
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Round, TruncMonth
+from django.utils import timezone
+
+from apps.accounts.counters import reconcile
+from apps.core.admin import AutocompleteFilter, LargeTableAdmin
+from apps.dashboard.snapshots import invalidate_sales
+from apps.stores.mixins import StoreScopedAdminMixin
+from apps.stores.tenancy import user_store_id
+from .anomalies import mark_reviewed
+from .archive import ArchiveError, archive_month, is_month_closed, month_bounds
+from .models import ArchivedSalesMonth, DailySales
+from .signals import sales_updated
+
 
 @admin.register(DailySales)
-class DailySalesAdmin(admin.ModelAdmin):
-    list_display = ('seller', 'sale_date', 'total_amount', 'commission_rate_applied', 'calculated_commission', 'is_active')
-    list_filter = ('seller', 'sale_date', 'is_active')  
\ No newline at end of file
+class DailySalesAdmin(StoreScopedAdminMixin, LargeTableAdmin):
+    list_display = ('seller', 'store', 'sale_date', 'total_amount', 'commission_rate_applied', 'calculated_commission', 'is_active', 'is_flagged', 'anomaly_score')
+    list_filter = ('store', ('seller', AutocompleteFilter), 'is_active', 'is_flagged')
+    list_select_related = ('seller', 'store')
+    date_hierarchy = 'sale_date'
+    autocomplete_fields = ('seller', 'registered_by')
+    actions = ('recalculate_commissions', 'deactivate', 'archive_months', 'review_anomalies')
+
+    def open_months(self, request, queryset):
+        """Tira da seleção as vendas de meses fechados (arquivados ou já pagos)."""
+        for period in queryset.dates('sale_date', 'month'):
+            if is_month_closed(period.year, period.month):
+                first_day, following = month_bounds(period.year, period.month)
+                queryset = queryset.exclude(sale_date__gte=first_day, sale_date__lt=following)
+                self.message_user(request, f"{period:%m/%Y}: mês fechado, vendas ignoradas.", messages.WARNING)
+        return queryset
+
+    @admin.action(description="Recalcular comissão com a taxa aplicada")
+    def recalculate_commissions(self, request, queryset):
+        # Um único UPDATE; vendas sem taxa registrada ficam como estão
+        queryset = self.open_months(request, queryset).filter(commission_rate_applied__isnull=False)
+        invalidate_sales(queryset)
+        now = timezone.now()
+        with transaction.atomic():
+            previous = {
+                row['id']: row for row in queryset.select_for_update().values('id', 'seller_id', 'store_id', 'calculated_commission')
+            }
+            DailySales.all_objects.filter(pk__in=list(previous)).update(
+                calculated_commission=Round(F('total_amount') * F('commission_rate_applied') / 100, 2),
+                updated_at=now,
+            )
+            current = DailySales.all_objects.filter(pk__in=list(previous)).values_list('id', 'calculated_commission')
+            changes = {
+                pk: {'calculated_commission': (previous[pk]['calculated_commission'], commission)}
+                for pk, commission in current
+                if commission != previous[pk]['calculated_commission']
+            }
+            # UPDATE direto não passa pelos signals: auditoria e outbox via `sales_updated`
+            self.send_updated(request, previous, changes, now)
+        # ... e recalcula os totais dos vendedores
+        reconcile({row['seller_id'] for row in previous.values()})
+        self.message_user(request, f"{len(changes)} vendas recalculadas.", messages.SUCCESS)
+
+    @admin.action(description="Desativar vendas selecionadas")
+    def deactivate(self, request, queryset):
+        queryset = self.open_months(request, queryset).active()
+        invalidate_sales(queryset)
+        now = timezone.now()
+        with transaction.atomic():
+            previous = {row['id']: row for row in queryset.select_for_update().values('id', 'seller_id', 'store_id')}
+            DailySales.all_objects.filter(pk__in=list(previous)).update(is_active=False, updated_at=now)
+            self.send_updated(request, previous, {pk: {'is_active': (True, False)} for pk in previous}, now)
+        reconcile({row['seller_id'] for row in previous.values()})
+        self.message_user(request, f"{len(previous)} vendas desativadas.", messages.SUCCESS)
+
+    def send_updated(self, request, previous, changes, changed_at):
+        if changes:
+            sales_updated.send(
+                sender=DailySales,
+                changes=changes,
+                stores={pk: previous[pk]['store_id'] for pk in changes},
+                actor=request.user,
+                changed_at=changed_at,
+            )
+
+    @admin.action(description="Arquivar os meses das vendas selecionadas")
+    def archive_months(self, request, queryset):
+        if user_store_id(request.user) is not None:
+            # O arquivo é por mês, com as vendas de todas as lojas
+            self.message_user(request, "Apenas usuários da rede podem arquivar meses.", messages.ERROR)
+            return
+        months = queryset.annotate(period=TruncMonth('sale_date')).order_by('period').values_list('period', flat=True).distinct()
+        for period in months:
+            try:
+                archived = archive_month(period.year, period.month)
+            except ArchiveError as exc:
+                self.message_user(request, f"{period:%m/%Y}: {exc}", messages.WARNING)
+            else:
+                self.message_user(request, f"{archived}: {archived.row_count} linhas.", messages.SUCCESS)
+
+    @admin.action(description="Marcar anomalias como revisadas")
+    def review_anomalies(self, request, queryset):
+        updated = mark_reviewed(queryset)
+        self.message_user(request, f"{updated} vendas revisadas.", messages.SUCCESS)
+
+
+@admin.register(ArchivedSalesMonth)
+class ArchivedSalesMonthAdmin(admin.ModelAdmin):
+    list_display = ('year', 'month', 'row_count', 'total_amount', 'total_commission', 'file_name', 'created_at')
+    readonly_fields = ('year', 'month', 'file_name', 'checksum', 'row_count', 'total_amount', 'total_commission', 'seller_totals', 'store_totals')
@@ -0,0 +1,237 @@
+# apps/sales/anomalies.py
+"""
+Sinalização de lançamentos fora do padrão (ex.: um zero a mais).
+
+Para cada vendedor, a mediana e o MAD (desvio absoluto mediano) de
+`total_amount` nos últimos `SALES_ANOMALY_WINDOW_DAYS` dias, por dia da
+semana e no geral. O escore de uma venda é o z robusto
+
+    z = (valor - mediana) / (1.4826 * MAD)
+
+usando o grupo do dia da semana quando ele tem pelo menos
+`SALES_ANOMALY_MIN_SAMPLES` vendas, senão o geral do vendedor (sem
+histórico suficiente a venda não recebe escore). |z| acima de
+`SALES_ANOMALY_THRESHOLD` sinaliza a venda (`is_flagged`), e relatórios
+com vendas sinalizadas no mês não podem ser aprovados até um gerente
+revisar (`mark_reviewed`) ou corrigir o valor.
+
+As estatísticas são calculadas com NumPy para todos os vendedores em uma
+passada (`compute_stats`) e ficam em cache por vendedor (`stats_cache`):
+- `detect_anomalies` (comando `detect_sale_anomalies`) reavalia um
+  período inteiro e atualiza os escores em lote
+- `check_sale` roda no pre_save de cada venda
+"""
+from datetime import date, timedelta
+
+import numpy as np
+from django.conf import settings
+from django.db.models import FloatField
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+from apps.core.cache import TTLCache
+from apps.core.tracking import changed_fields
+from .models import DailySales
+
+SALES_ANOMALY_THRESHOLD = getattr(settings, 'SALES_ANOMALY_THRESHOLD', 3.5)
+SALES_ANOMALY_WINDOW_DAYS = getattr(settings, 'SALES_ANOMALY_WINDOW_DAYS', 180)
+SALES_ANOMALY_MIN_SAMPLES = getattr(settings, 'SALES_ANOMALY_MIN_SAMPLES', 8)
+SALES_ANOMALY_CACHE_TTL = getattr(settings, 'SALES_ANOMALY_CACHE_TTL', 3600)
+
+MAD_SCALE = 1.4826
+# MAD zero (valores repetidos): escala mínima de 5% da mediana, e nunca menos de R$ 1
+MIN_SCALE_RATIO = 0.05
+MIN_SCALE = 1.0
+
+OVERALL = 7  # posição das estatísticas gerais, depois dos 7 dias da semana
+
+# seller_id -> (medianas[8], escalas[8], contagens[8])
+stats_cache = TTLCache(maxsize=20000, ttl=SALES_ANOMALY_CACHE_TTL)
+
+
+# ------------------------------------------
+# Estatísticas (vetorizadas)
+# ------------------------------------------
+def _group_medians(groups, values, size):
+    """Mediana de `values` por grupo (inteiros 0..size-1); NaN em grupos vazios."""
+    order = np.lexsort((values, groups))
+    values = values[order]
+    counts = np.bincount(groups, minlength=size)
+    starts = np.cumsum(counts) - counts
+    lower = starts + np.maximum(counts - 1, 0) // 2
+    upper = starts + counts // 2
+    medians = np.full(size, np.nan)
+    present = counts > 0
+    medians[present] = (values[lower[present]] + values[upper[present]]) / 2
+    return medians, counts
+
+
+def compute_stats(sellers, weekdays, amounts):
+    """
+    Estatísticas de todos os vendedores de uma vez. Recebe arrays alinhados
+    (uma posição por venda) e retorna (ids, medianas, escalas, contagens),
+    as três últimas com forma (vendedores, 8): dias da semana + geral.
+    """
+    ids, rows = np.unique(sellers, return_inverse=True)
+    size = len(ids) * 8
+
+    groups = np.concatenate([rows * 8 + weekdays, rows * 8 + OVERALL])
+    values = np.concatenate([amounts, amounts])
+    medians, counts = _group_medians(groups, values, size)
+    mads, _ = _group_medians(groups, np.abs(values - medians[groups]), size)
+
+    scales = np.maximum(MAD_SCALE * mads, np.maximum(MIN_SCALE_RATIO * np.abs(medians), MIN_SCALE))
+    shape = (len(ids), 8)
+    return ids, medians.reshape(shape), scales.reshape(shape), counts.reshape(shape)
+
+
+def robust_scores(medians, scales, counts, weekdays, amounts):
+    """
+    Escores z robustos de vendas, dados os arrays de estatísticas já
+    alinhados por venda (forma (n, 8)). NaN quando não há histórico suficiente.
+    """
+    rows = np.arange(len(amounts))
+    use_weekday = counts[rows, weekdays] >= SALES_ANOMALY_MIN_SAMPLES
+    column = np.where(use_weekday, weekdays, OVERALL)
+    enough = counts[rows, column] >= SALES_ANOMALY_MIN_SAMPLES
+    scores = (amounts - medians[rows, column]) / scales[rows, column]
+    return np.where(enough, scores, np.nan)
+
+
+# ------------------------------------------
+# Carga
+# ------------------------------------------
+def _baseline_rows(start, end, seller_id=None):
+    """(vendedores, dias da semana, valores) das vendas ativas e não sinalizadas do período."""
+    sales_qs = DailySales.objects.filter(sale_date__gte=start, sale_date__lte=end, is_flagged=False)
+    if seller_id is not None:
+        sales_qs = sales_qs.filter(seller_id=seller_id)
+    rows = list(sales_qs.order_by().values_list('seller_id', 'sale_date', Cast('total_amount', FloatField())))
+    if not rows:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+    sellers, sale_dates, amounts = zip(*rows)
+    return (
+        np.array(sellers, dtype=np.int64),
+        np.array([value.weekday() for value in sale_dates], dtype=np.int64),
+        np.array(amounts, dtype=float),
+    )
+
+
+def _stats_for(ids, medians, scales, counts, seller_ids):
+    """Estatísticas repetidas por venda (forma (n, 8)); vendedores sem histórico ficam com contagem zero."""
+    aligned_medians = np.full((len(seller_ids), 8), np.nan)
+    aligned_scales = np.ones((len(seller_ids), 8))
+    aligned_counts = np.zeros((len(seller_ids), 8), dtype=np.int64)
+    if len(ids):
+        positions = np.minimum(np.searchsorted(ids, seller_ids), len(ids) - 1)
+        known = ids[positions] == seller_ids
+        aligned_medians[known] = medians[positions[known]]
+        aligned_scales[known] = scales[positions[known]]
+        aligned_counts[known] = counts[positions[known]]
+    return aligned_medians, aligned_scales, aligned_counts
+
+
+def _cache_stats(ids, medians, scales, counts):
+    for position, seller_id in enumerate(ids.tolist()):
+        stats_cache.set(seller_id, (medians[position], scales[position], counts[position]))
+
+
+def seller_stats(seller_id, today=None):
+    """Estatísticas de um vendedor (do cache ou calculadas agora, com uma consulta)."""
+    stats = stats_cache.get(seller_id)
+    if stats is None:
+        today = today or date.today()
+        sellers, weekdays, amounts = _baseline_rows(today - timedelta(days=SALES_ANOMALY_WINDOW_DAYS), today, seller_id)
+        if len(amounts):
+            _, medians, scales, counts = compute_stats(sellers, weekdays, amounts)
+            stats = (medians[0], scales[0], counts[0])
+        else:
+            stats = (np.full(8, np.nan), np.ones(8), np.zeros(8, dtype=np.int64))
+        stats_cache.set(seller_id, stats)
+    return stats
+
+
+# ------------------------------------------
+# Verificação na gravação
+# ------------------------------------------
+def score_sale(seller_id, sale_date, amount):
+    """Escore z robusto de um lançamento, ou None sem histórico suficiente."""
+    medians, scales, counts = seller_stats(seller_id)
+    score = robust_scores(
+        medians[None, :], scales[None, :], counts[None, :],
+        np.array([sale_date.weekday()]), np.array([float(amount)]),
+    )[0]
+    return None if np.isnan(score) else round(float(score), 2)
+
+
+def check_sale(instance):
+    """Preenche `anomaly_score`/`is_flagged` antes do save (venda nova ou com valor alterado)."""
+    changes = changed_fields(instance)
+    if not instance._state.adding and not {'total_amount', 'sale_date', 'seller_id'} & set(changes):
+        return
+    if not instance._state.adding and 'total_amount' in changes:
+        # Valor corrigido: a revisão anterior não vale mais
+        instance.anomaly_reviewed = False
+    if instance.anomaly_reviewed or instance.total_amount is None:
+        return
+    instance.anomaly_score = score_sale(instance.seller_id, instance.sale_date, instance.total_amount)
+    instance.is_flagged = instance.anomaly_score is not None and abs(instance.anomaly_score) > SALES_ANOMALY_THRESHOLD
+
+
+def mark_reviewed(sales_qs):
+    """Marca vendas como conferidas (libera a aprovação). Retorna quantas mudaram."""
+    return sales_qs.filter(is_flagged=True).update(is_flagged=False, anomaly_reviewed=True, updated_at=timezone.now())
+
+
+# ------------------------------------------
+# Lote
+# ------------------------------------------
+def detect_anomalies(start, end, today=None, batch_size=1000):
+    """
+    Reavalia as vendas de `start` a `end` contra as estatísticas dos
+    últimos `SALES_ANOMALY_WINDOW_DAYS` dias (uma consulta para o histórico,
+    uma para as vendas do período) e grava só os escores que mudaram.
+    Retorna (vendas avaliadas, vendas sinalizadas).
+    """
+    today = today or date.today()
+    sellers, weekdays, amounts = _baseline_rows(today - timedelta(days=SALES_ANOMALY_WINDOW_DAYS), today)
+    ids, medians, scales, counts = compute_stats(sellers, weekdays, amounts)
+    _cache_stats(ids, medians, scales, counts)
+
+    candidates = list(
+        DailySales.objects.filter(sale_date__gte=start, sale_date__lte=end, anomaly_reviewed=False)
+        .order_by().only('pk', 'seller_id', 'sale_date', 'total_amount', 'anomaly_score', 'is_flagged')
+    )
+    if not candidates:
+        return 0, 0
+
+    seller_ids = np.array([sale.seller_id for sale in candidates], dtype=np.int64)
+    sale_weekdays = np.array([sale.sale_date.weekday() for sale in candidates], dtype=np.int64)
+    sale_amounts = np.array([float(sale.total_amount) for sale in candidates])
+
+    scores = robust_scores(*_stats_for(ids, medians, scales, counts, seller_ids), sale_weekdays, sale_amounts)
+
+    changed = []
+    flagged = 0
+    for sale, score in zip(candidates, scores.tolist()):
+        score = None if np.isnan(score) else round(score, 2)
+        is_flagged = score is not None and abs(score) > SALES_ANOMALY_THRESHOLD
+        flagged += is_flagged
+        if sale.anomaly_score != score or sale.is_flagged != is_flagged:
+            sale.anomaly_score, sale.is_flagged = score, is_flagged
+            changed.append(sale)
+
+    # bulk_update não dispara signals: escores não são alterações da venda
+    DailySales.all_objects.bulk_update(changed, ['anomaly_score', 'is_flagged'], batch_size=batch_size)
+    return len(candidates), flagged
+
+
+# ------------------------------------------
+# Bloqueio de aprovação
+# ------------------------------------------
+def flagged_periods(seller_ids, start, end):
+    """{(seller_id, ano, mês)} com vendas ativas sinalizadas entre `start` e `end`."""
+    rows = DailySales.objects.filter(
+        is_flagged=True, seller_id__in=seller_ids, sale_date__gte=start, sale_date__lte=end,
+    ).values_list('seller_id', 'sale_date')
+    return {(seller_id, sale_date.year, sale_date.month) for seller_id, sale_date in rows}
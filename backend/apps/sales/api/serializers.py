@@ -1,4 +1,7 @@
+from datetime import date, timedelta
 from rest_framework import serializers
+from rest_framework.validators import UniqueTogetherValidator
+from ..archive import is_month_closed
 from ..models import DailySales
 
 class SalesSerializer(serializers.ModelSerializer):
@@ -12,6 +15,7 @@ class SalesSerializer(serializers.ModelSerializer):
         model = DailySales
         fields = [
             'seller',
+            'store',  # loja do vendedor no lançamento (apps/stores)
             'sale_date',
             'total_amount',
             'commission_rate_applied',  # valor decimal real no POST/PUT
@@ -19,11 +23,21 @@ class SalesSerializer(serializers.ModelSerializer):
             'calculated_commission',
             'notes',
             'registered_by',
+            'anomaly_score',  # z robusto (apps/sales/anomalies.py)
+            'is_flagged',
+            'anomaly_reviewed',
             'pk',
             'created_at',
             'updated_at'
         ]
-        read_only_fields = ['registered_by', 'calculated_commission', 'commission_rate_display']
+        read_only_fields = [
+            'registered_by', 'calculated_commission', 'commission_rate_display', 'store',
+            'anomaly_score', 'is_flagged', 'anomaly_reviewed',
+        ]
+        # Só vendas ativas contam: uma excluída no mesmo dia é reativada em `create`
+        validators = [
+            UniqueTogetherValidator(queryset=DailySales.objects.all(), fields=['seller', 'sale_date']),
+        ]
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -37,10 +51,72 @@ class SalesSerializer(serializers.ModelSerializer):
         # Formata 0.5 -> "0,5%"
         return f"{obj.commission_rate_applied:.2f}%"
 
+    CLOSED_MONTH_MESSAGE = "Este mês já foi fechado; as vendas dele não podem mais ser alteradas."
+
+    def validate_sale_date(self, value):
+        # Meses fechados (comissões pagas) ou arquivados são somente leitura
+        if is_month_closed(value.year, value.month):
+            raise serializers.ValidationError(self.CLOSED_MONTH_MESSAGE)
+        return value
+
+    def validate(self, attrs):
+        # Editar uma venda de mês fechado também não (mesmo sem mudar a data)
+        if self.instance is not None and is_month_closed(self.instance.sale_date.year, self.instance.sale_date.month):
+            raise serializers.ValidationError({"sale_date": self.CLOSED_MONTH_MESSAGE})
+        if self.instance is not None and self._removed_sale(
+            attrs.get('seller', self.instance.seller), attrs.get('sale_date', self.instance.sale_date),
+        ) is not None:
+            raise serializers.ValidationError({"sale_date": "Já existe uma venda excluída deste vendedor neste dia."})
+        return attrs
+
+    def _removed_sale(self, seller, sale_date):
+        return DailySales.all_objects.filter(seller=seller, sale_date=sale_date, is_active=False).first()
+
     def create(self, validated_data):
         validated_data['registered_by'] = self.context['request'].user
-        return super().create(validated_data)
+        removed = self._removed_sale(validated_data['seller'], validated_data['sale_date'])
+        if removed is None:
+            return super().create(validated_data)
+        # Reativa a venda excluída (mesmo id no feed de alterações), com os valores do novo lançamento
+        validated_data.setdefault('notes', '')
+        validated_data.setdefault('commission_rate_applied', None)
+        return self.update(removed, {**validated_data, 'store': None, 'is_active': True})
 
-    def update(self, instance, validated_data):
-        validated_data['registered_by'] = self.context['request'].user
-        return super().update(instance, validated_data)
+
+
+class SalesHistoryQuerySerializer(serializers.Serializer):
+    """
+    Parâmetros de `history/` e `export/`: intervalo (padrão: mês corrente)
+    e vendedor (ignorado para vendedores, que só veem os próprios dados).
+    """
+    start_date = serializers.DateField(required=False)
+    end_date = serializers.DateField(required=False)
+    seller = serializers.IntegerField(required=False, min_value=1)
+
+    def validate(self, attrs):
+        today = date.today()
+        attrs.setdefault("start_date", today.replace(day=1))
+        attrs.setdefault("end_date", today)
+
+        if attrs["start_date"] > attrs["end_date"]:
+            raise serializers.ValidationError({"end_date": "Deve ser maior ou igual a start_date."})
+        max_days = self.context.get("max_days")
+        if max_days and attrs["end_date"] - attrs["start_date"] > timedelta(days=max_days):
+            raise serializers.ValidationError({"start_date": f"Intervalo máximo de {max_days} dias."})
+        return attrs
+
+
+class SalesHistoryRowSerializer(serializers.Serializer):
+    """Linha do histórico, venha ela da tabela ou do arquivo frio."""
+    pk = serializers.IntegerField(source='id')
+    seller = serializers.IntegerField(source='seller_id')
+    store = serializers.IntegerField(source='store_id', allow_null=True)
+    sale_date = serializers.DateField()
+    total_amount = serializers.DecimalField(max_digits=10, decimal_places=2)
+    commission_rate_applied = serializers.DecimalField(max_digits=5, decimal_places=2, allow_null=True)
+    calculated_commission = serializers.DecimalField(max_digits=8, decimal_places=2)
+    notes = serializers.CharField()
+    registered_by = serializers.IntegerField(source='registered_by_id', allow_null=True)
+    created_at = serializers.DateTimeField()
+    updated_at = serializers.DateTimeField()
+    archived = serializers.BooleanField()
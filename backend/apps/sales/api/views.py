@@ -1,23 +1,169 @@
-from rest_framework import viewsets, filters
+import csv
+from datetime import date
+
+from django.http import StreamingHttpResponse
+from rest_framework import viewsets, filters, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import Cursor
+from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
-from apps.core.pagination import StandardResultsSetPagination
-from .serializers import SalesSerializer
+from apps.accounts.search import AccountSearchFilter
+from apps.accounts.utils import is_vendedor
+from apps.core.db import retry_on_busy
+from apps.core.db_router import use_replica
+from apps.core.pagination import StandardCursorPagination, StandardResultsSetPagination
+from apps.core.streaming import EchoBuffer, stream_content
+from apps.stores.mixins import StoreScopedViewMixin
+from .serializers import SalesHistoryQuerySerializer, SalesHistoryRowSerializer, SalesSerializer
+from ..anomalies import mark_reviewed
+from ..archive import is_month_closed, iter_sales_rows, sales_rows_page
 from ..models import DailySales
 
-class SaleViewSet(viewsets.ModelViewSet):
-    queryset = DailySales.objects.all().select_related("seller", "registered_by")
+# Janelas máximas de leitura do histórico (a exportação é em streaming)
+HISTORY_MAX_DAYS = 366
+EXPORT_MAX_DAYS = 366 * 10
+
+EXPORT_COLUMNS = [
+    'id', 'seller_id', 'store_id', 'sale_date', 'total_amount', 'commission_rate_applied',
+    'calculated_commission', 'notes', 'registered_by_id', 'created_at', 'archived',
+]
+
+class SalesHistoryPagination(StandardCursorPagination):
+    """
+    Keyset por (sale_date, id) sobre a tabela e o arquivo frio: cada página
+    busca só `page_size` + 1 linhas a partir da última entregue, em vez de
+    montar o período inteiro para fatiar.
+    GET /api/v1/sales/history/?cursor=...
+    """
+
+    def paginate_rows(self, fetch, request):
+        """`fetch(after, limit)` devolve as linhas depois da chave `after` (ou do início)."""
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+        after = None
+        if cursor is not None:
+            try:
+                day, pk = cursor.position.split(':')
+                after = (date.fromisoformat(day), int(pk))
+            except (AttributeError, ValueError):
+                raise NotFound(self.invalid_cursor_message)
+        rows = fetch(after, self.page_size + 1)
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=f"{last['sale_date']}:{last['id']}"))
+
+    def get_paginated_response(self, data):
+        return Response({'next': self.get_next_link(), 'results': data})
+
+
+class SaleViewSet(StoreScopedViewMixin, viewsets.ModelViewSet):
+    # Só vendas ativas; filtrar por ?is_active= consulta todas
+    # 🏬 Restritas à loja da requisição (apps/stores/tenancy.py)
+    queryset = DailySales.objects.select_related("seller", "registered_by")
     serializer_class = SalesSerializer
     pagination_class = StandardResultsSetPagination
     permission_classes = [IsAuthenticated]
 
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, filters.SearchFilter]
-    filterset_fields = ['seller', 'sale_date', 'is_active']  # 🔹 campos filtráveis
-    ordering_fields = ['sale_date', 'total_amount', 'calculated_commission']
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, AccountSearchFilter]
+    filterset_fields = ['seller', 'sale_date', 'is_active', 'is_flagged']  # 🔹 campos filtráveis
+    ordering_fields = ['sale_date', 'total_amount', 'calculated_commission', 'anomaly_score']
     search_fields = ['seller__username', 'seller__first_name', 'seller__last_name']
+    search_account_field = 'seller'  # ?search= pelo índice de busca de contas
+    store_related_fields = {'seller': 'store'}  # só vendedores da loja
+
+    # ⏱️ Orçamentos em DEFAULT_THROTTLE_RATES (apps/core/throttling.py)
+    throttle_scope = 'sales'
+    throttle_action_scopes = {'export': 'exports'}
+
+    def get_queryset(self):
+        if 'is_active' in self.request.query_params:
+            return self.scope_to_store(DailySales.all_objects.select_related("seller", "registered_by"))
+        return super().get_queryset()
 
+    # Escritas em transação curta, repetida se o SQLite estiver ocupado
+    @retry_on_busy
     def perform_create(self, serializer):
         serializer.save(registered_by=self.request.user)
 
+    @retry_on_busy
     def perform_update(self, serializer):
-        serializer.save(registered_by=self.request.user)
+        # Quem lançou continua registrado; quem alterou fica no log de auditoria
+        serializer.save()
+
+    @retry_on_busy
+    def perform_destroy(self, instance):
+        # Exclusão lógica: a venda some das listagens e chega ao feed de
+        # alterações como is_active=False (apps/integrations/changes.py)
+        if is_month_closed(instance.sale_date.year, instance.sale_date.month):
+            raise ValidationError({"sale_date": SalesSerializer.CLOSED_MONTH_MESSAGE})
+        instance.is_active = False
+        instance.save()
+
+    def _history_params(self, request, max_days):
+        params = SalesHistoryQuerySerializer(data=request.query_params, context={"max_days": max_days})
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+        # Vendedor vê apenas seus próprios dados
+        seller_id = request.user.pk if is_vendedor(request.user) else data.get("seller")
+        return data["start_date"], data["end_date"], seller_id
+
+    @action(detail=False, methods=['get'])
+    def history(self, request):
+        """
+        Histórico de vendas de qualquer período, incluindo meses já movidos
+        para o arquivo frio (`archived: true`).
+        GET /api/v1/sales/history/?start_date=2024-01-01&end_date=2024-06-30&seller=3
+        """
+        start, end, seller_id = self._history_params(request, HISTORY_MAX_DAYS)
+        paginator = SalesHistoryPagination()
+
+        def fetch(after, limit):
+            with use_replica():
+                return sales_rows_page(start, end, after, limit, seller_id=seller_id, store_id=self.store_id)
+
+        page = paginator.paginate_rows(fetch, request)
+        return paginator.get_paginated_response(SalesHistoryRowSerializer(page, many=True).data)
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Exporta o período em CSV, em streaming, lendo tabela e arquivo frio.
+        GET /api/v1/sales/export/?start_date=2020-01-01&end_date=2025-12-31
+        """
+        start, end, seller_id = self._history_params(request, EXPORT_MAX_DAYS)
+        store_id = self.store_id
+
+        def stream():
+            writer = csv.writer(EchoBuffer())
+            yield writer.writerow(EXPORT_COLUMNS)
+            with use_replica():
+                for row in iter_sales_rows(start, end, seller_id=seller_id, store_id=store_id):
+                    yield writer.writerow([row[column] for column in EXPORT_COLUMNS])
+
+        response = StreamingHttpResponse(stream_content(request, stream()), content_type='text/csv')
+        response['Content-Disposition'] = f'attachment; filename="vendas-{start}-{end}.csv"'
+        return response
+
+    # 🚩 Anomalias (apps/sales/anomalies.py)
+    @action(detail=True, methods=['post'])
+    def review_anomaly(self, request, pk=None):
+        """
+        Confirma que a venda sinalizada está correta e libera a aprovação do mês.
+        POST /api/v1/sales/{id}/review_anomaly/
+        """
+        if is_vendedor(request.user):
+            return Response({"detail": "Apenas gerentes e administradores."}, status=status.HTTP_403_FORBIDDEN)
+        sale = self.get_object()
+        mark_reviewed(DailySales.all_objects.filter(pk=sale.pk))
+        sale.refresh_from_db()
+        return Response(self.get_serializer(sale).data)
@@ -4,3 +4,16 @@ from django.apps import AppConfig
 class SalesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.sales'
+
+    def ready(self):
+        import apps.sales.signals
+        from django.db.models.signals import pre_migrate
+        from apps.core.tracking import track_changes
+        from .models import DailySales
+        from .partitioning import check_migration_plan
+
+        # Diff de campos lido pela auditoria, dashboard, outbox e contadores
+        track_changes(DailySales)
+
+        # Tabela particionada: migrações de DailySales precisam ser adaptadas à mão
+        pre_migrate.connect(check_migration_plan, sender=self)
@@ -0,0 +1,598 @@
+# apps/sales/archive.py
+"""
+Arquivo frio de meses fechados.
+
+Quando todos os relatórios de comissão de um mês estão PAGOS (ou
+cancelados), as vendas diárias daquele mês não mudam mais. `archive_month`
+grava essas linhas em um arquivo compacto por mês e as remove da tabela
+quente; as leituras de histórico e exportação (`iter_sales_rows`) juntam
+as duas fontes de forma transparente.
+
+Formato (`sales-AAAA-MM.zip`, entradas comprimidas com deflate):
+    meta.json           versão, período, número de linhas, dicionário de vendedores
+    <coluna>.<tipo>     arrays de largura fixa little-endian (módulo `array`)
+    notes.json          observações não vazias, por posição
+
+Valores monetários são guardados em centavos (int64) e taxas em
+centésimos de ponto percentual (int32), então a leitura é exata.
+
+A versão 2 inclui a loja de cada venda (`store`). Arquivos da versão 1,
+anteriores às lojas, são lidos com `store_id` nulo e filtrados por loja
+pela loja atual do vendedor (`seller_store_ids`).
+"""
+import hashlib
+import json
+import os
+import sys
+import uuid
+import zipfile
+from array import array
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from .models import ArchivedSalesMonth, DailySales
+
+FORMAT_VERSION = 2
+NULL_ID = -1
+# Ids por DELETE ao remover as linhas arquivadas (limite de variáveis do SQLite)
+DELETE_BATCH_SIZE = 500
+CENT = Decimal('0.01')
+
+# Colunas das linhas de venda vindas da tabela (mesmas chaves de `read_month`)
+ROW_FIELDS = (
+    'id', 'uuid', 'seller_id', 'store_id', 'sale_date', 'total_amount', 'commission_rate_applied',
+    'calculated_commission', 'notes', 'registered_by_id', 'is_active', 'created_at', 'updated_at',
+)
+
+# coluna -> typecode do módulo array
+COLUMNS = {
+    'id': 'q',
+    'seller': 'I',          # posição no dicionário de vendedores
+    'store': 'I',           # id da loja (versão 2)
+    'day': 'B',
+    'total_amount': 'q',    # centavos
+    'commission_rate': 'i',  # centésimos de %, NULL_ID quando nulo
+    'commission': 'q',      # centavos
+    'registered_by': 'q',   # id do usuário, NULL_ID quando nulo
+    'is_active': 'B',
+    'created_at': 'd',      # epoch (UTC)
+    'updated_at': 'd',
+}
+
+
+class ArchiveError(Exception):
+    pass
+
+
+def archive_dir():
+    return Path(getattr(settings, 'SALES_ARCHIVE_DIR', Path(settings.BASE_DIR) / 'archive'))
+
+
+def archive_path(archived):
+    return archive_dir() / archived.file_name
+
+
+def month_bounds(year, month):
+    first_day = date(year, month, 1)
+    next_month = date(year + month // 12, month % 12 + 1, 1)
+    return first_day, next_month
+
+
+def _cents(value):
+    return int((value * 100).to_integral_value())
+
+
+def _from_cents(value):
+    return Decimal(value) / 100
+
+
+def _to_little_endian(values):
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_little_endian(typecode, data):
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values
+
+
+def _open_report_statuses():
+    from apps.commissions.models import MonthlyCommissionReport
+
+    return [MonthlyCommissionReport.Status.PENDING, MonthlyCommissionReport.Status.APPROVED]
+
+
+def check_month_closed(year, month):
+    """Levanta ArchiveError se o mês ainda puder receber alterações."""
+    from apps.commissions.models import MonthlyCommissionReport
+
+    if month_bounds(year, month)[1] > date.today():
+        raise ArchiveError('Só é possível arquivar meses já encerrados.')
+    reports = MonthlyCommissionReport.objects.filter(year=year, month=month)
+    if not reports.exists():
+        raise ArchiveError('O mês não tem relatórios de comissão.')
+    if reports.filter(status__in=_open_report_statuses()).exists():
+        raise ArchiveError('Há relatórios do mês ainda não pagos.')
+    if ArchivedSalesMonth.all_objects.filter(year=year, month=month).exists():
+        raise ArchiveError('Mês já arquivado.')
+
+
+def is_month_closed(year, month):
+    """
+    O mês não aceita mais lançamentos: já arquivado, ou encerrado com todos
+    os relatórios de comissão pagos/cancelados (pronto para arquivar).
+    """
+    from apps.commissions.models import MonthlyCommissionReport
+
+    if ArchivedSalesMonth.objects.filter(year=year, month=month).exists():
+        return True
+    if month_bounds(year, month)[1] > date.today():
+        return False
+    reports = MonthlyCommissionReport.objects.filter(year=year, month=month)
+    return reports.exists() and not reports.filter(status__in=_open_report_statuses()).exists()
+
+
+def _write_file(path, year, month, rows):
+    sellers = sorted({row['seller_id'] for row in rows})
+    seller_index = {seller_id: index for index, seller_id in enumerate(sellers)}
+    columns = {name: array(typecode) for name, typecode in COLUMNS.items()}
+    uuids = bytearray()
+    notes = {}
+
+    for position, row in enumerate(rows):
+        columns['id'].append(row['id'])
+        columns['seller'].append(seller_index[row['seller_id']])
+        columns['store'].append(row['store_id'])
+        columns['day'].append(row['sale_date'].day)
+        columns['total_amount'].append(_cents(row['total_amount']))
+        rate = row['commission_rate_applied']
+        columns['commission_rate'].append(NULL_ID if rate is None else _cents(rate))
+        columns['commission'].append(_cents(row['calculated_commission']))
+        columns['registered_by'].append(row['registered_by_id'] or NULL_ID)
+        columns['is_active'].append(1 if row['is_active'] else 0)
+        columns['created_at'].append(row['created_at'].timestamp())
+        columns['updated_at'].append(row['updated_at'].timestamp())
+        uuids += row['uuid'].bytes
+        if row['notes']:
+            notes[position] = row['notes']
+
+    meta = {
+        'version': FORMAT_VERSION,
+        'year': year,
+        'month': month,
+        'rows': len(rows),
+        'columns': COLUMNS,
+        'sellers': sellers,
+    }
+    tmp_path = path.with_suffix('.tmp')
+    with zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('meta.json', json.dumps(meta))
+        for name, values in columns.items():
+            archive.writestr(f'{name}.{COLUMNS[name]}', _to_little_endian(values))
+        archive.writestr('uuid.bin', bytes(uuids))
+        archive.writestr('notes.json', json.dumps(notes))
+    os.replace(tmp_path, path)
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as stream:
+        for chunk in iter(lambda: stream.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _seller_totals(rows):
+    """
+    Resumo por vendedor (só linhas ativas), guardado no banco para somas sem
+    abrir o arquivo: [valor, comissão, dias, soma de valor x taxa, última venda].
+    """
+    totals = {}
+    for row in rows:
+        if not row['is_active']:
+            continue
+        amount, commission, days, weighted, last = totals.get(
+            row['seller_id'], (Decimal('0'), Decimal('0'), 0, Decimal('0'), row['sale_date']),
+        )
+        rate = row['commission_rate_applied'] or Decimal('0')
+        totals[row['seller_id']] = (
+            amount + row['total_amount'],
+            commission + row['calculated_commission'],
+            days + 1,
+            weighted + row['total_amount'] * rate,
+            max(last, row['sale_date']),
+        )
+    return {
+        str(seller_id): [str(amount), str(commission), days, str(weighted), last.isoformat()]
+        for seller_id, (amount, commission, days, weighted, last) in totals.items()
+    }
+
+
+def _store_totals(entries):
+    """
+    Resumo por loja e vendedor, pela loja gravada em cada venda:
+    {store_id: {seller_id: [valor, comissão, dias]}}. `entries` são
+    (loja, vendedor, valor, comissão) das linhas ativas.
+    """
+    totals = {}
+    for store_id, seller_id, amount, commission in entries:
+        sellers = totals.setdefault(str(store_id), {})
+        previous_amount, previous_commission, days = sellers.get(str(seller_id), (Decimal('0'), Decimal('0'), 0))
+        sellers[str(seller_id)] = (previous_amount + amount, previous_commission + commission, days + 1)
+    return {
+        store_id: {
+            seller_id: [str(amount.quantize(CENT)), str(commission.quantize(CENT)), days]
+            for seller_id, (amount, commission, days) in sellers.items()
+        }
+        for store_id, sellers in totals.items()
+    }
+
+
+def file_store_totals(archived):
+    """
+    `store_totals` lido das colunas do arquivo, para resumos gravados antes
+    dele. Arquivos da versão 1 (sem loja) usam a loja atual do vendedor.
+    """
+    from apps.accounts.models import Account
+
+    meta, columns = read_columns(archived)
+    sellers = meta['sellers']
+    stores = columns.get('store')
+    if stores is None:
+        current = dict(Account.all_objects.filter(pk__in=sellers).values_list('pk', 'store_id'))
+    return _store_totals(
+        (
+            stores[position] if stores is not None else current.get(sellers[seller]),
+            sellers[seller],
+            _from_cents(columns['total_amount'][position]),
+            _from_cents(columns['commission'][position]),
+        )
+        for position, seller in enumerate(columns['seller'])
+        if columns['is_active'][position]
+    )
+
+
+def seller_last_dates(archived):
+    """
+    {seller_id (str): 'AAAA-MM-DD'} da última venda ativa de cada vendedor no
+    mês, lida das colunas do arquivo. Para resumos gravados antes de
+    `seller_totals` trazer a data.
+    """
+    meta, columns = read_columns(archived)
+    last = {}
+    for seller, day, active in zip(columns['seller'], columns['day'], columns['is_active']):
+        if active:
+            seller_id = str(meta['sellers'][seller])
+            last[seller_id] = max(last.get(seller_id, 0), day)
+    return {seller_id: date(meta['year'], meta['month'], day).isoformat() for seller_id, day in last.items()}
+
+
+def _delete_rows(ids):
+    """Remove as linhas pelos ids gravados e devolve quantas saíram."""
+    deleted = 0
+    for start in range(0, len(ids), DELETE_BATCH_SIZE):
+        batch = DailySales.all_objects.filter(pk__in=ids[start:start + DELETE_BATCH_SIZE])
+        # Remoção direta, sem sinais por linha: arquivar não é excluir uma venda
+        deleted += batch._raw_delete(batch.db)
+    return deleted
+
+
+def archive_month(year, month):
+    """
+    Grava as vendas do mês em arquivo e remove as linhas da tabela quente.
+    Retorna o `ArchivedSalesMonth` criado.
+
+    Leitura, gravação e remoção acontecem na mesma transação, com as linhas
+    travadas (`select_for_update`; no SQLite a própria transação segura a
+    escrita). Só saem da tabela os ids gravados no arquivo, e se o mês
+    ganhou ou perdeu linhas no meio do caminho nada é removido (ArchiveError).
+    """
+    check_month_closed(year, month)
+    first_day, next_month = month_bounds(year, month)
+    sales_qs = DailySales.all_objects.filter(sale_date__gte=first_day, sale_date__lt=next_month)
+
+    directory = archive_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    file_name = f'sales-{year:04d}-{month:02d}.zip'
+    path = directory / file_name
+
+    try:
+        with transaction.atomic():
+            rows = list(
+                sales_qs.select_for_update().order_by('sale_date', 'seller_id').values(
+                    'id', 'uuid', 'seller_id', 'store_id', 'sale_date', 'total_amount', 'commission_rate_applied',
+                    'calculated_commission', 'notes', 'registered_by_id', 'is_active', 'created_at', 'updated_at',
+                )
+            )
+            checksum = _write_file(path, year, month, rows)
+            active = [row for row in rows if row['is_active']]
+
+            archived = ArchivedSalesMonth.objects.create(
+                year=year,
+                month=month,
+                file_name=file_name,
+                checksum=checksum,
+                row_count=len(rows),
+                total_amount=sum((row['total_amount'] for row in active), Decimal('0.00')),
+                total_commission=sum((row['calculated_commission'] for row in active), Decimal('0.00')),
+                seller_totals=_seller_totals(rows),
+                store_totals=_store_totals(
+                    (row['store_id'], row['seller_id'], row['total_amount'], row['calculated_commission'])
+                    for row in active
+                ),
+            )
+            deleted = _delete_rows([row['id'] for row in rows])
+            if deleted != archived.row_count or sales_qs.exists():
+                raise ArchiveError('As vendas do mês mudaram durante o arquivamento. Tente novamente.')
+    except BaseException:
+        # Nada foi removido: o arquivo não pode ficar para trás
+        path.unlink(missing_ok=True)
+        raise
+    return archived
+
+
+def read_columns(archived, with_extras=False):
+    """
+    Lê as colunas do arquivo do mês sem montar linhas: (meta, {coluna: array}).
+    Com `with_extras`, também (uuids em bytes, observações por posição).
+    """
+    path = archive_path(archived)
+    with zipfile.ZipFile(path) as archive:
+        meta = json.loads(archive.read('meta.json'))
+        columns = {
+            name: _from_little_endian(typecode, archive.read(f'{name}.{typecode}'))
+            for name, typecode in meta['columns'].items()
+        }
+        if not with_extras:
+            return meta, columns
+        return meta, columns, archive.read('uuid.bin'), json.loads(archive.read('notes.json'))
+
+
+def read_month(archived, start=0, stop=None):
+    """
+    Lê o arquivo do mês e devolve as linhas como dicionários (mesmas chaves
+    do `values()`). `start`/`stop` limitam as posições montadas.
+    """
+    meta, columns, uuids, notes = read_columns(archived, with_extras=True)
+
+    sellers = meta['sellers']
+    stores = columns.get('store')
+    rows = []
+    for position in range(meta['rows'])[start:stop]:
+        rate = columns['commission_rate'][position]
+        registered_by = columns['registered_by'][position]
+        rows.append({
+            'id': columns['id'][position],
+            'uuid': uuid.UUID(bytes=uuids[position * 16:(position + 1) * 16]),
+            'seller_id': sellers[columns['seller'][position]],
+            'store_id': stores[position] if stores is not None else None,
+            'sale_date': date(meta['year'], meta['month'], columns['day'][position]),
+            'total_amount': _from_cents(columns['total_amount'][position]),
+            'commission_rate_applied': None if rate == NULL_ID else _from_cents(rate),
+            'calculated_commission': _from_cents(columns['commission'][position]),
+            'notes': notes.get(str(position), ''),
+            'registered_by_id': None if registered_by == NULL_ID else registered_by,
+            'is_active': bool(columns['is_active'][position]),
+            'created_at': datetime.fromtimestamp(columns['created_at'][position], tz=dt_timezone.utc),
+            'updated_at': datetime.fromtimestamp(columns['updated_at'][position], tz=dt_timezone.utc),
+        })
+    return rows
+
+
+def archived_months(start, end):
+    """Meses arquivados que cruzam o intervalo, indexados por (ano, mês)."""
+    months = Q()
+    current = date(start.year, start.month, 1)
+    while current <= end:
+        months |= Q(year=current.year, month=current.month)
+        current = month_bounds(current.year, current.month)[1]
+    return {(archived.year, archived.month): archived for archived in ArchivedSalesMonth.objects.filter(months)}
+
+
+def seller_store_ids(store_id):
+    """Vendedores (inclusive inativos) da loja, para filtrar arquivos da versão 1."""
+    from apps.accounts.models import Account
+
+    return set(Account.all_objects.filter(store_id=store_id).values_list('pk', flat=True))
+
+
+def in_store(row, store_id, store_sellers):
+    """A linha arquivada é da loja? (pela coluna `store` ou, na versão 1, pelo vendedor)"""
+    if store_id is None:
+        return True
+    if row['store_id'] is not None:
+        return row['store_id'] == store_id
+    return row['seller_id'] in store_sellers
+
+
+def _month_rows(archived_month, start, end, seller_id, store_id, store_sellers, include_inactive):
+    """Linhas de um mês arquivado dentro do intervalo e dos filtros, em ordem."""
+    rows = [
+        row for row in read_month(archived_month)
+        if start <= row['sale_date'] <= end
+        and (seller_id is None or row['seller_id'] == seller_id)
+        and in_store(row, store_id, store_sellers)
+        and (include_inactive or row['is_active'])
+    ]
+    return sorted(rows, key=lambda row: (row['sale_date'], row['seller_id']))
+
+
+def archived_rows(start, end, seller_id=None, store_id=None):
+    """
+    Só as vendas ativas dos meses arquivados do intervalo. Para quem agrega
+    a tabela no banco e precisa somar o que já saiu dela.
+    """
+    archived = archived_months(start, end)
+    if not archived:
+        return []
+    store_sellers = seller_store_ids(store_id) if store_id is not None else set()
+    return [
+        row
+        for key in sorted(archived)
+        for row in _month_rows(archived[key], start, end, seller_id, store_id, store_sellers, False)
+    ]
+
+
+def iter_sales_rows(start, end, seller_id=None, include_inactive=False, chunk_size=2000, store_id=None):
+    """
+    Vendas do intervalo, mês a mês, lendo do arquivo frio os meses
+    arquivados e da tabela os demais. Cada linha traz `archived` indicando a origem.
+    Com `store_id`, só as vendas da loja.
+    """
+    archived = archived_months(start, end)
+    store_sellers = seller_store_ids(store_id) if store_id is not None and archived else set()
+    current = date(start.year, start.month, 1)
+    while current <= end:
+        first_day, next_month = month_bounds(current.year, current.month)
+        archived_month = archived.get((current.year, current.month))
+
+        if archived_month is not None:
+            rows = _month_rows(archived_month, start, end, seller_id, store_id, store_sellers, include_inactive)
+            for row in rows:
+                yield {**row, 'archived': True}
+        else:
+            manager = DailySales.all_objects if include_inactive else DailySales.objects
+            sales_qs = manager.filter(
+                sale_date__gte=max(first_day, start), sale_date__lt=next_month, sale_date__lte=end,
+            )
+            if seller_id is not None:
+                sales_qs = sales_qs.filter(seller_id=seller_id)
+            if store_id is not None:
+                sales_qs = sales_qs.filter(store_id=store_id)
+            rows = sales_qs.order_by('sale_date', 'seller_id').values(*ROW_FIELDS)
+            for row in rows.iterator(chunk_size=chunk_size):
+                yield {**row, 'archived': False}
+
+        current = next_month
+
+
+def sales_rows_page(start, end, after=None, limit=100, seller_id=None, store_id=None):
+    """
+    Até `limit` vendas ativas do intervalo, em ordem de (sale_date, id) e
+    depois da chave `after` (keyset). Meses da tabela param no LIMIT do SQL;
+    um mês arquivado só é lido quando a página chega nele.
+    """
+    if after is not None:
+        start = max(start, after[0])
+    archived = archived_months(start, end)
+    store_sellers = seller_store_ids(store_id) if store_id is not None and archived else set()
+    rows = []
+    current = date(start.year, start.month, 1)
+    while current <= end and len(rows) < limit:
+        first_day, next_month = month_bounds(current.year, current.month)
+        archived_month = archived.get((current.year, current.month))
+
+        if archived_month is not None:
+            month_rows = sorted(
+                (
+                    row for row in _month_rows(archived_month, start, end, seller_id, store_id, store_sellers, False)
+                    if after is None or (row['sale_date'], row['id']) > after
+                ),
+                key=lambda row: (row['sale_date'], row['id']),
+            )
+            rows.extend({**row, 'archived': True} for row in month_rows[:limit - len(rows)])
+        else:
+            sales_qs = DailySales.objects.filter(
+                sale_date__gte=max(first_day, start), sale_date__lt=next_month, sale_date__lte=end,
+            )
+            if after is not None:
+                sales_qs = sales_qs.filter(Q(sale_date__gt=after[0]) | Q(sale_date=after[0], id__gt=after[1]))
+            if seller_id is not None:
+                sales_qs = sales_qs.filter(seller_id=seller_id)
+            if store_id is not None:
+                sales_qs = sales_qs.filter(store_id=store_id)
+            month_rows = sales_qs.order_by('sale_date', 'id').values(*ROW_FIELDS)[:limit - len(rows)]
+            rows.extend({**row, 'archived': False} for row in month_rows)
+
+        current = next_month
+    return rows
+
+
+def archived_seller_totals(year, month, seller_id):
+    """Totais de um vendedor em um mês arquivado (ou None se o mês não está arquivado)."""
+    archived = ArchivedSalesMonth.objects.filter(year=year, month=month).first()
+    if archived is None:
+        return None
+    amount, commission, days, weighted = archived.seller_totals.get(str(seller_id), ['0', '0', 0, '0'])[:4]
+    return Decimal(amount), Decimal(commission), days, Decimal(weighted)
+
+
+def month_store_totals(archived):
+    """
+    {(store_id, seller_id): (valor, comissão)} das vendas ativas do mês
+    arquivado, pelo resumo gravado (sem abrir o arquivo). Resumos sem
+    `store_totals` (arquivo fora deste ambiente na migração) caem na loja
+    atual do vendedor.
+    """
+    if archived.store_totals or not archived.seller_totals:
+        return {
+            (int(store_id) if store_id != 'None' else None, int(seller_id)): (Decimal(values[0]), Decimal(values[1]))
+            for store_id, sellers in archived.store_totals.items()
+            for seller_id, values in sellers.items()
+        }
+    from apps.accounts.models import Account
+
+    stores = dict(Account.all_objects.filter(pk__in=list(map(int, archived.seller_totals))).values_list('pk', 'store_id'))
+    return {
+        (stores.get(int(seller_id)), int(seller_id)): (Decimal(values[0]), Decimal(values[1]))
+        for seller_id, values in archived.seller_totals.items()
+    }
+
+
+def archived_month_totals(year, month, seller_id=None, store_id=None):
+    """
+    `month_store_totals` do mês (vazio se não está arquivado), filtrado por
+    vendedor e loja.
+    """
+    archived = ArchivedSalesMonth.objects.filter(year=year, month=month).only(
+        'year', 'month', 'seller_totals', 'store_totals',
+    ).first()
+    if archived is None:
+        return {}
+    return {
+        key: totals for key, totals in month_store_totals(archived).items()
+        if (seller_id is None or key[1] == seller_id) and (store_id is None or key[0] == store_id)
+    }
+
+
+def archived_lifetime_totals(seller_ids=None):
+    """
+    {seller_id: (valor, comissão, dias, última venda)} somando os resumos
+    `seller_totals` de todos os meses arquivados, sem abrir os arquivos
+    (a não ser resumos antigos, sem a data da última venda).
+    """
+    months = ArchivedSalesMonth.objects.all()
+    if seller_ids is not None:
+        keys = [str(seller_id) for seller_id in seller_ids]
+        if not keys:
+            return {}
+        months = months.filter(seller_totals__has_any_keys=keys)
+    wanted = None if seller_ids is None else set(keys)
+
+    totals = {}
+    for archived in months.only('year', 'month', 'file_name', 'seller_totals'):
+        legacy_dates = None
+        for seller_id, values in archived.seller_totals.items():
+            if wanted is not None and seller_id not in wanted:
+                continue
+            if len(values) > 4:
+                last = date.fromisoformat(values[4])
+            else:
+                if legacy_dates is None:
+                    legacy_dates = seller_last_dates(archived)
+                last = date.fromisoformat(legacy_dates[seller_id]) if seller_id in legacy_dates else None
+            amount, commission, days, previous_last = totals.get(int(seller_id), (Decimal('0'), Decimal('0'), 0, None))
+            totals[int(seller_id)] = (
+                amount + Decimal(values[0]),
+                commission + Decimal(values[1]),
+                days + values[2],
+                max(filter(None, (previous_last, last)), default=None),
+            )
+    return totals
@@ -0,0 +1,26 @@
+# apps/sales/management/commands/archive_month.py
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.sales.archive import ArchiveError, archive_month, archive_path
+
+
+class Command(BaseCommand):
+    help = (
+        "Move as vendas diárias de um mês fechado (relatórios pagos ou cancelados) "
+        "para o arquivo frio e remove as linhas da tabela."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--year', type=int, required=True)
+        parser.add_argument('--month', type=int, required=True, choices=range(1, 13))
+
+    def handle(self, *args, **options):
+        try:
+            archived = archive_month(options['year'], options['month'])
+        except ArchiveError as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{archived}: {archived.row_count} linhas em {archive_path(archived)} "
+            f"({archive_path(archived).stat().st_size} bytes)."
+        ))
@@ -0,0 +1,33 @@
+# apps/sales/management/commands/archive_sales_partitions.py
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.sales.partitioning import ARCHIVE_SCHEMA, PartitioningError, archive_partitions
+
+
+class Command(BaseCommand):
+    help = (
+        "Desanexa as partições anuais de vendas mais antigas que N anos (PostgreSQL). "
+        f"Por padrão move para o schema '{ARCHIVE_SCHEMA}'; com --drop remove."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--keep-years', type=int, required=True,
+                            help='Anos mantidos na tabela quente, contando o atual')
+        parser.add_argument('--drop', action='store_true', help='Remove as partições em vez de movê-las')
+        parser.add_argument('--dry-run', action='store_true', help='Só lista o que seria arquivado')
+
+    def handle(self, *args, **options):
+        if options['keep_years'] < 1:
+            raise CommandError('--keep-years deve ser pelo menos 1.')
+        try:
+            years = archive_partitions(options['keep_years'], drop=options['drop'], dry_run=options['dry_run'])
+        except PartitioningError as exc:
+            raise CommandError(str(exc))
+
+        if not years:
+            self.stdout.write("Nenhuma partição para arquivar.")
+        elif options['dry_run']:
+            self.stdout.write(f"Seriam arquivados: {', '.join(map(str, years))}")
+        else:
+            action = 'removidas' if options['drop'] else f"movidas para {ARCHIVE_SCHEMA}"
+            self.stdout.write(self.style.SUCCESS(f"Partições {', '.join(map(str, years))} {action}."))
@@ -0,0 +1,30 @@
+# apps/sales/management/commands/detect_sale_anomalies.py
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.sales.anomalies import SALES_ANOMALY_THRESHOLD, detect_anomalies
+
+
+class Command(BaseCommand):
+    help = (
+        "Reavalia as vendas do período contra o histórico de cada vendedor "
+        "e sinaliza os lançamentos fora do padrão. Agende (ex.: diariamente)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=60, help='Últimos N dias (padrão: 60)')
+        parser.add_argument('--start', type=date.fromisoformat, help='Data inicial (AAAA-MM-DD)')
+        parser.add_argument('--end', type=date.fromisoformat, help='Data final (AAAA-MM-DD, padrão: hoje)')
+
+    def handle(self, *args, **options):
+        end = options['end'] or date.today()
+        start = options['start'] or end - timedelta(days=options['days'])
+        if start > end:
+            raise CommandError('--start deve ser anterior a --end.')
+
+        evaluated, flagged = detect_anomalies(start, end)
+        self.stdout.write(self.style.SUCCESS(
+            f"{evaluated} vendas avaliadas de {start} a {end}; "
+            f"{flagged} sinalizadas (|z| > {SALES_ANOMALY_THRESHOLD})."
+        ))
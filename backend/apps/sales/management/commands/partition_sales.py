@@ -0,0 +1,44 @@
+# apps/sales/management/commands/partition_sales.py
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.sales.partitioning import (
+    TABLE, PartitioningError, convert_to_partitioned, ensure_partitions, is_partitioned,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Particionamento anual das vendas diárias (PostgreSQL). "
+        "Com --convert migra a tabela atual; sem ele cria as partições futuras. "
+        "Agende (ex.: mensalmente) para manter partições criadas com antecedência."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--convert', action='store_true',
+                            help='Converte a tabela atual em tabela particionada (uma vez, em janela de manutenção)')
+        parser.add_argument('--ahead', type=int, default=1,
+                            help='Quantos anos à frente devem ter partição (padrão: 1)')
+
+    def handle(self, *args, **options):
+        ahead = options['ahead']
+        current_year = date.today().year
+        try:
+            if options['convert']:
+                years = convert_to_partitioned(ahead=ahead)
+                self.stdout.write(self.style.SUCCESS(
+                    f"{TABLE} convertida. Partições: {', '.join(map(str, years))} + default"
+                ))
+                return
+
+            if not is_partitioned():
+                raise CommandError(f"{TABLE} não é particionada. Rode primeiro com --convert.")
+            created = ensure_partitions(current_year, current_year + ahead)
+        except PartitioningError as exc:
+            raise CommandError(str(exc))
+
+        if created:
+            self.stdout.write(self.style.SUCCESS(f"Partições criadas: {', '.join(map(str, created))}"))
+        else:
+            self.stdout.write("Nenhuma partição nova necessária.")
@@ -0,0 +1,101 @@
+# apps/sales/management/commands/stress_sales_writes.py
+import tempfile
+import threading
+import time
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.accounts.models import Account
+from apps.sales.api.views import SaleViewSet
+from apps.sales.models import DailySales
+from apps.stores.models import Store
+
+
+class Command(BaseCommand):
+    help = (
+        "Teste de estresse: N escritores concorrentes lançando DailySales pela API "
+        "(POST /api/v1/sales/). Mostra erros e vazão (linhas/s). Roda só com DEBUG, "
+        "em um banco de teste criado e removido pelo próprio comando."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=8, help='Escritores concorrentes (threads)')
+        parser.add_argument('--rows', type=int, default=100, help='Lançamentos por escritor')
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG:
+            raise CommandError("Teste de estresse só com DEBUG=True (nunca no banco de produção).")
+
+        with tempfile.TemporaryDirectory() as directory:
+            test_settings = connection.settings_dict.setdefault('TEST', {})
+            if connection.vendor == 'sqlite':
+                # Arquivo temporário (e não o banco em memória) para medir o SQLite com WAL
+                test_settings['NAME'] = str(Path(directory) / 'stress.sqlite3')
+            old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+            try:
+                self.stress(options['writers'], options['rows'])
+            finally:
+                connections.close_all()
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def stress(self, writers, rows):
+        prefix = f"stress-{uuid.uuid4().hex[:8]}"
+
+        sellers = [
+            Account.objects.create_user(
+                username=f"{prefix}-{i}", password=None, document=f"{prefix[-8:]}{i:04d}",
+                user_type=Account.UserType.SELLER, commission_rate=Decimal('0.50'), store_id=Store.default_id(),
+            )
+            for i in range(writers)
+        ]
+        view = SaleViewSet.as_view({'post': 'create'})
+        factory = APIRequestFactory()
+        first_day = date.today() - timedelta(days=rows)
+        errors = []
+        start_barrier = threading.Barrier(writers)
+
+        def writer(seller):
+            try:
+                start_barrier.wait()
+                for day in range(rows):
+                    request = factory.post('/api/v1/sales/', {
+                        'seller': seller.pk,
+                        'sale_date': (first_day + timedelta(days=day)).isoformat(),
+                        'total_amount': '123.45',
+                    }, format='json')
+                    force_authenticate(request, user=seller)
+                    response = view(request)
+                    if response.status_code != 201:
+                        errors.append((seller.username, response.status_code, response.data))
+            except Exception as exc:  # noqa: BLE001 - registra qualquer falha do escritor
+                errors.append((seller.username, 'exception', repr(exc)))
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=writer, args=(seller,)) for seller in sellers]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        written = DailySales.all_objects.filter(seller__in=sellers).count()
+        self.stdout.write(
+            f"banco={connection.vendor} escritores={writers} linhas={written}/{writers * rows} "
+            f"erros={len(errors)} tempo={elapsed:.2f}s vazão={written / elapsed:.0f} linhas/s"
+        )
+        for error in errors[:10]:
+            self.stderr.write(str(error))
+
+        if errors:
+            self.stderr.write(self.style.ERROR(f"{len(errors)} lançamentos falharam"))
+        else:
+            self.stdout.write(self.style.SUCCESS("Nenhum erro de escrita"))
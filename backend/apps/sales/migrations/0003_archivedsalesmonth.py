@@ -0,0 +1,38 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:24
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '0002_alter_dailysales_calculated_commission_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedSalesMonth',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False, verbose_name='ID')),
+                ('uuid', models.UUIDField(default=uuid.uuid4, editable=False, help_text='Identificador único usado em URLs públicas', unique=True, verbose_name='UUID')),
+                ('is_active', models.BooleanField(default=True, help_text='Desmarque para desativar o registro em vez de excluí-lo', verbose_name='Ativo')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Atualizado em')),
+                ('year', models.PositiveIntegerField(verbose_name='Ano')),
+                ('month', models.PositiveIntegerField(verbose_name='Mês')),
+                ('file_name', models.CharField(help_text='Nome do arquivo dentro de SALES_ARCHIVE_DIR', max_length=255, verbose_name='Arquivo')),
+                ('checksum', models.CharField(max_length=64, verbose_name='SHA-256 do arquivo')),
+                ('row_count', models.PositiveIntegerField(verbose_name='Linhas arquivadas')),
+                ('total_amount', models.DecimalField(decimal_places=2, max_digits=14, verbose_name='Total vendido (R$)')),
+                ('total_commission', models.DecimalField(decimal_places=2, max_digits=14, verbose_name='Total de comissões (R$)')),
+                ('seller_totals', models.JSONField(default=dict, help_text='seller_id -> [total vendido, comissão, dias, soma de valor x taxa]', verbose_name='Totais por vendedor')),
+            ],
+            options={
+                'verbose_name': 'Mês de Vendas Arquivado',
+                'verbose_name_plural': 'Meses de Vendas Arquivados',
+                'ordering': ['-year', '-month'],
+                'unique_together': {('year', 'month')},
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:26
+
+import django.db.models.manager
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '0003_archivedsalesmonth'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='archivedsalesmonth',
+            managers=[
+                ('all_objects', django.db.models.manager.Manager()),
+            ],
+        ),
+        migrations.AlterModelManagers(
+            name='dailysales',
+            managers=[
+                ('all_objects', django.db.models.manager.Manager()),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name='dailysales',
+            name='sales_daily_seller__e2e4bf_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='dailysales',
+            name='sales_daily_sale_da_f2bdae_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='dailysales',
+            name='sales_daily_is_acti_fc219d_idx',
+        ),
+        migrations.AddIndex(
+            model_name='dailysales',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['seller', 'sale_date'], name='sales_daily_active_seller_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dailysales',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['sale_date'], name='sales_daily_active_date_idx'),
+        ),
+    ]
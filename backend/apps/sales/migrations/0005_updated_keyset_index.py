@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '0004_partial_active_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='dailysales',
+            index=models.Index(fields=['updated_at', 'id'], name='sales_daily_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.5 on 2026-10-19 16:07
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '0005_updated_keyset_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailysales',
+            name='anomaly_reviewed',
+            field=models.BooleanField(default=False, editable=False, help_text='Valor conferido por um gerente; não volta a ser sinalizado enquanto não mudar', verbose_name='Anomalia Revisada'),
+        ),
+        migrations.AddField(
+            model_name='dailysales',
+            name='anomaly_score',
+            field=models.FloatField(blank=True, editable=False, help_text='Escore z robusto do valor em relação ao histórico do vendedor no mesmo dia da semana', null=True, verbose_name='Escore de Anomalia'),
+        ),
+        migrations.AddField(
+            model_name='dailysales',
+            name='is_flagged',
+            field=models.BooleanField(default=False, editable=False, help_text='Valor muito fora do padrão; impede a aprovação do relatório do mês até ser revisada', verbose_name='Sinalizada'),
+        ),
+        migrations.AddIndex(
+            model_name='dailysales',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_flagged', True)), fields=['seller', 'sale_date'], name='sales_daily_flagged_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Migração separada do preenchimento: no PostgreSQL o ALTER não pode rodar
+# na mesma transação do UPDATE (eventos de trigger pendentes)
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '0007_dailysales_store'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='dailysales',
+            name='store',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.PROTECT, related_name='daily_sales', to='stores.store', verbose_name='Loja'),
+        ),
+        migrations.AddIndex(
+            model_name='dailysales',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['store', 'sale_date'], name='sales_daily_store_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dailysales',
+            index=models.Index(fields=['store', 'updated_at', 'id'], name='sales_daily_store_updated_idx'),
+        ),
+    ]
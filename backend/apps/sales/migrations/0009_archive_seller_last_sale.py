@@ -0,0 +1,37 @@
+from django.db import migrations, models
+
+from apps.sales.archive import seller_last_dates
+
+
+def add_last_sale_dates(apps, schema_editor):
+    # Resumos antigos ganham a data da última venda de cada vendedor
+    # (lida das colunas do arquivo; uma vez por mês arquivado)
+    ArchivedSalesMonth = apps.get_model('sales', 'ArchivedSalesMonth')
+    for archived in ArchivedSalesMonth._default_manager.all():
+        if all(len(values) > 4 for values in archived.seller_totals.values()):
+            continue
+        try:
+            last_dates = seller_last_dates(archived)
+        except FileNotFoundError:
+            # Arquivo fora deste ambiente: a data é lida do arquivo quando for preciso
+            continue
+        for seller_id, values in archived.seller_totals.items():
+            if len(values) == 4 and seller_id in last_dates:
+                values.append(last_dates[seller_id])
+        archived.save(update_fields=['seller_totals'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '0008_dailysales_store_required'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='archivedsalesmonth',
+            name='seller_totals',
+            field=models.JSONField(default=dict, help_text='seller_id -> [total vendido, comissão, dias, soma de valor x taxa, última venda (AAAA-MM-DD)]', verbose_name='Totais por vendedor'),
+        ),
+        migrations.RunPython(add_last_sale_dates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+from apps.sales.archive import file_store_totals
+
+
+def add_store_totals(apps, schema_editor):
+    # Resumos antigos ganham os totais por loja (lidos das colunas do arquivo)
+    ArchivedSalesMonth = apps.get_model('sales', 'ArchivedSalesMonth')
+    for archived in ArchivedSalesMonth._default_manager.filter(store_totals={}):
+        try:
+            archived.store_totals = file_store_totals(archived)
+        except FileNotFoundError:
+            # Arquivo fora deste ambiente: as leituras usam a loja atual do vendedor
+            continue
+        archived.save(update_fields=['store_totals'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '0009_archive_seller_last_sale'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedsalesmonth',
+            name='store_totals',
+            field=models.JSONField(default=dict, help_text='store_id -> seller_id -> [total vendido, comissão, dias], pela loja de cada venda', verbose_name='Totais por loja'),
+        ),
+        migrations.RunPython(add_store_totals, migrations.RunPython.noop),
+    ]
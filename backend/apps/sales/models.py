@@ -1,8 +1,10 @@
 from decimal import Decimal
 from django.db import models
+from django.db.models import Q
 from django.conf import settings
 from django.core.validators import MinValueValidator
 from apps.core.models import BaseModel
+from apps.stores.models import Store
 
 class DailySales(BaseModel):
     """
@@ -18,6 +20,15 @@ class DailySales(BaseModel):
         help_text="Vendedor que realizou as vendas"
     )
 
+    # Loja do vendedor no lançamento (tenant); preenchida no save()
+    store = models.ForeignKey(
+        'stores.Store',
+        on_delete=models.PROTECT,
+        editable=False,
+        related_name='daily_sales',
+        verbose_name="Loja"
+    )
+
     sale_date = models.DateField(
         verbose_name="Data das Vendas",
         help_text="Data em que as vendas foram realizadas"
@@ -63,12 +74,39 @@ class DailySales(BaseModel):
         help_text="Usuário que fez o lançamento (vendedor ou gerente/admin)"
     )
 
+    # Conferência de valores fora do padrão do vendedor (apps/sales/anomalies.py)
+    anomaly_score = models.FloatField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name="Escore de Anomalia",
+        help_text="Escore z robusto do valor em relação ao histórico do vendedor no mesmo dia da semana"
+    )
+
+    is_flagged = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name="Sinalizada",
+        help_text="Valor muito fora do padrão; impede a aprovação do relatório do mês até ser revisada"
+    )
+
+    anomaly_reviewed = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name="Anomalia Revisada",
+        help_text="Valor conferido por um gerente; não volta a ser sinalizado enquanto não mudar"
+    )
+
     def save(self, *args, **kwargs):
         """
         Ao salvar:
+        - Sem loja, usa a do vendedor (ou a loja padrão).
         - Se não houver taxa manual, aplica a taxa do vendedor.
         - Calcula a comissão com base na taxa aplicada.
         """
+        if self.store_id is None:
+            self.store_id = self.seller.store_id or Store.default_id()
+
         # Garante que a taxa de comissão seja preenchida se estiver vazia
         if self.commission_rate_applied is None:
             self.commission_rate_applied = self.seller.commission_rate
@@ -85,8 +123,71 @@ class DailySales(BaseModel):
         verbose_name = "Venda Diária"
         verbose_name_plural = "Vendas Diárias"
         unique_together = ['seller', 'sale_date']
+        # Índices parciais: só linhas ativas (o unique_together já cobre todas)
         indexes = [
-            models.Index(fields=['seller', 'sale_date']),
-            models.Index(fields=['sale_date']),
-            models.Index(fields=['is_active', 'sale_date']),
-        ]
\ No newline at end of file
+            models.Index(fields=['seller', 'sale_date'], condition=Q(is_active=True), name='sales_daily_active_seller_idx'),
+            models.Index(fields=['sale_date'], condition=Q(is_active=True), name='sales_daily_active_date_idx'),
+            # Consultas de uma loja (dashboard, séries, projeção): tenant primeiro
+            models.Index(fields=['store', 'sale_date'], condition=Q(is_active=True), name='sales_daily_store_date_idx'),
+            # Keyset do feed de alterações (apps/integrations/changes.py); inclui inativas
+            models.Index(fields=['updated_at', 'id'], name='sales_daily_updated_idx'),
+            models.Index(fields=['store', 'updated_at', 'id'], name='sales_daily_store_updated_idx'),
+            # Bloqueio de aprovação: poucas linhas sinalizadas por vendedor/mês
+            models.Index(fields=['seller', 'sale_date'], condition=Q(is_flagged=True, is_active=True), name='sales_daily_flagged_idx'),
+        ]
+
+class ArchivedSalesMonth(BaseModel):
+    """
+    Mês de vendas movido para o arquivo frio (ver `apps.sales.archive`).
+    Guarda o caminho do arquivo e os totais do mês, para que relatórios
+    e somas não precisem abrir o arquivo.
+    """
+
+    year = models.PositiveIntegerField(verbose_name="Ano")
+    month = models.PositiveIntegerField(verbose_name="Mês")
+
+    file_name = models.CharField(
+        max_length=255,
+        verbose_name="Arquivo",
+        help_text="Nome do arquivo dentro de SALES_ARCHIVE_DIR"
+    )
+
+    checksum = models.CharField(
+        max_length=64,
+        verbose_name="SHA-256 do arquivo"
+    )
+
+    row_count = models.PositiveIntegerField(verbose_name="Linhas arquivadas")
+
+    total_amount = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        verbose_name="Total vendido (R$)"
+    )
+
+    total_commission = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        verbose_name="Total de comissões (R$)"
+    )
+
+    seller_totals = models.JSONField(
+        default=dict,
+        verbose_name="Totais por vendedor",
+        help_text="seller_id -> [total vendido, comissão, dias, soma de valor x taxa, última venda (AAAA-MM-DD)]"
+    )
+
+    store_totals = models.JSONField(
+        default=dict,
+        verbose_name="Totais por loja",
+        help_text="store_id -> seller_id -> [total vendido, comissão, dias], pela loja de cada venda"
+    )
+
+    def __str__(self):
+        return f"Vendas arquivadas {self.month:02d}/{self.year}"
+
+    class Meta:
+        verbose_name = "Mês de Vendas Arquivado"
+        verbose_name_plural = "Meses de Vendas Arquivados"
+        unique_together = ['year', 'month']
+        ordering = ['-year', '-month']
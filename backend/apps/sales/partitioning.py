@@ -0,0 +1,244 @@
+# apps/sales/partitioning.py
+"""
+Particionamento declarativo por ano (RANGE em `sale_date`) da tabela de
+vendas diárias no PostgreSQL.
+
+Estrutura depois da conversão:
+    sales_dailysales            tabela particionada (pai)
+    sales_dailysales_y2025      partição [2025-01-01, 2026-01-01)
+    sales_dailysales_y2026      ...
+    sales_dailysales_default    recebe datas fora das partições criadas
+
+Consultas do mês corrente filtram `sale_date` e o planner lê só a partição
+do ano. VACUUM e manutenção de índices passam a ser por partição.
+
+Observações:
+- No PostgreSQL, PK e UNIQUE de tabela particionada precisam conter a
+  chave de partição. No banco a PK vira (id, sale_date) e o uuid fica
+  único por (uuid, sale_date); o Django continua usando `id` como pk e os
+  ids seguem únicos porque vêm de uma única sequência.
+- Nada referencia `sales_dailysales` por FK, requisito para a conversão.
+- Essas constraints trocadas não existem no estado de migrações do Django
+  (que segue com `uuid` único e `unique_together` do modelo). Por isso,
+  com a tabela já particionada, `migrate` recusa migrações que mexem em
+  `DailySales` (`check_migration_plan`): escreva-as à mão para a tabela
+  particionada e marque a classe `Migration` com `partitioned_sales_safe = True`.
+"""
+from datetime import date
+
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+
+from .models import DailySales
+
+TABLE = DailySales._meta.db_table
+LEGACY_TABLE = f'{TABLE}_legacy'
+DEFAULT_PARTITION = f'{TABLE}_default'
+ID_SEQUENCE = f'{TABLE}_pk_seq'
+ARCHIVE_SCHEMA = 'sales_archive'
+
+
+class PartitioningError(Exception):
+    pass
+
+
+def partition_name(year):
+    return f'{TABLE}_y{year}'
+
+
+def check_supported(using=DEFAULT_DB_ALIAS):
+    if connections[using].vendor != 'postgresql':
+        raise PartitioningError('Particionamento disponível apenas no PostgreSQL.')
+
+
+def is_partitioned(using=DEFAULT_DB_ALIAS):
+    check_supported(using)
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relkind FROM pg_class c "
+            "JOIN pg_namespace n ON n.oid = c.relnamespace "
+            "WHERE c.relname = %s AND n.nspname = current_schema()",
+            [TABLE],
+        )
+        row = cursor.fetchone()
+    return row is not None and row[0] == 'p'
+
+
+def partition_years():
+    """Anos que já têm partição (sem contar a partição default)."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = %s::regclass",
+            [TABLE],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    prefix = partition_name('')
+    return sorted(int(name[len(prefix):]) for name in names if name.startswith(prefix))
+
+
+def _touches_sales_table(operation):
+    names = {getattr(operation, attr, None) for attr in ('model_name', 'name')}
+    return DailySales._meta.model_name in {name.lower() for name in names if isinstance(name, str)}
+
+
+def check_migration_plan(plan, using=DEFAULT_DB_ALIAS, **kwargs):
+    """
+    Receptor de `pre_migrate`: com a tabela particionada, recusa migrações
+    de `DailySales` que não foram marcadas com `partitioned_sales_safe`.
+    O schema editor do Django procuraria PK/UNIQUE pelos nomes e colunas do
+    modelo, que a conversão trocou.
+    """
+    if not plan or connections[using].vendor != 'postgresql' or not is_partitioned(using):
+        return
+    blocked = [
+        f'{migration.app_label}.{migration.name}'
+        for migration, backwards in plan
+        if not getattr(migration, 'partitioned_sales_safe', False)
+        and any(_touches_sales_table(operation) for operation in migration.operations)
+    ]
+    if blocked:
+        raise PartitioningError(
+            f"{TABLE} é particionada e estas migrações alteram o modelo DailySales: {', '.join(blocked)}. "
+            "Adapte-as à tabela particionada e marque-as com partitioned_sales_safe = True."
+        )
+
+
+def _create_year_partition(cursor, year):
+    """
+    Cria a partição do ano movendo antes as linhas desse ano que estejam na
+    partição default (senão o ATTACH falharia).
+    """
+    name = partition_name(year)
+    start, end = date(year, 1, 1), date(year + 1, 1, 1)
+    cursor.execute(f'CREATE TABLE {name} (LIKE {TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+    cursor.execute(
+        f'WITH moved AS ('
+        f'  DELETE FROM {DEFAULT_PARTITION} WHERE sale_date >= %s AND sale_date < %s RETURNING *'
+        f') INSERT INTO {name} SELECT * FROM moved',
+        [start, end],
+    )
+    cursor.execute(
+        f'ALTER TABLE {TABLE} ATTACH PARTITION {name} FOR VALUES FROM (%s) TO (%s)',
+        [start, end],
+    )
+
+
+def ensure_partitions(first_year, last_year):
+    """Cria as partições que faltam entre `first_year` e `last_year`. Retorna os anos criados."""
+    check_supported()
+    if not is_partitioned():
+        raise PartitioningError(f'{TABLE} ainda não é particionada (use partition_sales --convert).')
+
+    existing = set(partition_years())
+    created = []
+    with transaction.atomic(), connection.cursor() as cursor:
+        for year in range(first_year, last_year + 1):
+            if year not in existing:
+                _create_year_partition(cursor, year)
+                created.append(year)
+    return created
+
+
+def convert_to_partitioned(ahead=1):
+    """
+    Migra a tabela atual para uma tabela particionada por ano, em uma
+    única transação (a tabela fica bloqueada durante a cópia: rode em
+    janela de manutenção).
+
+    1. guarda índices não únicos e FKs da tabela atual
+    2. renomeia a tabela atual para `_legacy`
+    3. cria a tabela particionada com as mesmas colunas e uma sequência nova
+    4. cria uma partição por ano (dos dados existentes até o ano atual + `ahead`) e a default
+    5. copia os dados, remove a `_legacy` e recria PK/UNIQUE (com a chave de
+       partição), FKs e índices com os mesmos nomes
+    """
+    check_supported()
+    if is_partitioned():
+        raise PartitioningError(f'{TABLE} já é particionada.')
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE')
+
+        cursor.execute(
+            "SELECT indexdef FROM pg_indexes "
+            "WHERE schemaname = current_schema() AND tablename = %s AND indexdef NOT LIKE 'CREATE UNIQUE%%'",
+            [TABLE],
+        )
+        index_definitions = [row[0] for row in cursor.fetchall()]
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype IN ('f', 'c')",
+            [TABLE],
+        )
+        constraints = cursor.fetchall()
+
+        cursor.execute(
+            f'SELECT EXTRACT(YEAR FROM MIN(sale_date))::int, COALESCE(MAX(id), 0) FROM {TABLE}'
+        )
+        first_year, max_id = cursor.fetchone()
+        current_year = date.today().year
+        first_year = first_year or current_year
+
+        cursor.execute(f'ALTER TABLE {TABLE} RENAME TO {LEGACY_TABLE}')
+
+        cursor.execute(f'CREATE SEQUENCE {ID_SEQUENCE}')
+        cursor.execute('SELECT setval(%s::regclass, %s, false)', [ID_SEQUENCE, max_id + 1])
+        cursor.execute(
+            f'CREATE TABLE {TABLE} (LIKE {LEGACY_TABLE} INCLUDING DEFAULTS) '
+            f'PARTITION BY RANGE (sale_date)'
+        )
+        cursor.execute(f"ALTER TABLE {TABLE} ALTER COLUMN id SET DEFAULT nextval('{ID_SEQUENCE}')")
+        cursor.execute(f'ALTER SEQUENCE {ID_SEQUENCE} OWNED BY {TABLE}.id')
+
+        cursor.execute(f'CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT')
+        for year in range(first_year, current_year + ahead + 1):
+            _create_year_partition(cursor, year)
+
+        cursor.execute(f'INSERT INTO {TABLE} SELECT * FROM {LEGACY_TABLE}')
+        # Remover a antiga libera os nomes dos índices/constraints para a nova
+        cursor.execute(f'DROP TABLE {LEGACY_TABLE}')
+
+        # Índices criados depois da carga (mais rápido que mantê-los durante o INSERT)
+        cursor.execute(f'ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_pkey PRIMARY KEY (id, sale_date)')
+        cursor.execute(f'ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_uuid_sale_date_uniq UNIQUE (uuid, sale_date)')
+        cursor.execute(
+            f'ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_seller_id_sale_date_uniq UNIQUE (seller_id, sale_date)'
+        )
+        for name, definition in constraints:
+            cursor.execute(f'ALTER TABLE {TABLE} ADD CONSTRAINT {name} {definition}')
+        # As definições referenciam `sales_dailysales`, que agora é a tabela particionada
+        for definition in index_definitions:
+            cursor.execute(definition)
+
+    return partition_years()
+
+
+def archive_partitions(keep_years, drop=False, dry_run=False):
+    """
+    Desanexa as partições com mais de `keep_years` anos (contando o atual).
+
+    Por padrão a partição desanexada é movida para o schema `sales_archive`
+    (continua consultável por SQL, fora do ORM e das consultas quentes).
+    Com `drop=True` ela é removida. Retorna os anos processados.
+    """
+    check_supported()
+    if not is_partitioned():
+        raise PartitioningError(f'{TABLE} não é particionada.')
+
+    cutoff = date.today().year - keep_years + 1
+    years = [year for year in partition_years() if year < cutoff]
+    if dry_run or not years:
+        return years
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        if not drop:
+            cursor.execute(f'CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}')
+        for year in years:
+            name = partition_name(year)
+            cursor.execute(f'ALTER TABLE {TABLE} DETACH PARTITION {name}')
+            if drop:
+                cursor.execute(f'DROP TABLE {name}')
+            else:
+                cursor.execute(f'ALTER TABLE {name} SET SCHEMA {ARCHIVE_SCHEMA}')
+    return years
@@ -0,0 +1,23 @@
+# apps/sales/signals.py
+from django.db.models.signals import pre_save
+from django.dispatch import Signal, receiver
+
+from .anomalies import check_sale
+from .models import DailySales
+
+# Enviado após alterar vendas em lote (UPDATE direto, sem post_save).
+# Argumentos:
+#   changes: {id: {campo: (antes, depois)}} das vendas que mudaram
+#   stores: {id: store_id}
+#   actor: usuário que fez a alteração
+#   changed_at: datetime gravado em updated_at
+sales_updated = Signal()
+
+
+@receiver(pre_save, sender=DailySales)
+def flag_outlier_sale(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Calcula o escore de anomalia da venda antes de gravar (apps.sales.anomalies)."""
+    # Fixtures (raw) e saves parciais que não mexem no valor ficam como estão
+    if raw or (update_fields and 'total_amount' not in update_fields):
+        return
+    check_sale(instance)
@@ -1,3 +1,325 @@
-from django.test import TestCase
+import shutil
+import tempfile
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.accounts.models import Account
+from apps.audit.models import ChangeEvent
+from apps.core import streaming
+from apps.commissions.models import MonthlyCommissionReport
+from apps.dashboard.projection import month_projection
+from apps.dashboard.services import dashboard_aggregates, run_serially
+from apps.integrations import changes
+from apps.integrations.models import OutboxEvent
+from apps.stores.models import Store
+from . import archive
+from .archive import ArchiveError, archive_month, archive_path, iter_sales_rows, month_bounds
+from .models import ArchivedSalesMonth, DailySales
+
+
+class ArchiveMonthTests(TestCase):
+    """Arquivamento de um mês fechado: ida e volta e corrida com lançamentos."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.archive_dir = tempfile.mkdtemp()
+        cls.archive_settings = override_settings(SALES_ARCHIVE_DIR=cls.archive_dir)
+        cls.archive_settings.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.archive_settings.disable()
+        shutil.rmtree(cls.archive_dir, ignore_errors=True)
+        super().tearDownClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = Account.objects.create_user(
+            'admin', 'admin@example.com', 'x', user_type='ADMIN', document='1', is_staff=True,
+        )
+        cls.seller = Account.objects.create_user(
+            'bruno', 'bruno@example.com', 'x', user_type='SELLER', document='2', first_name='Bruno',
+            store_id=Store.default_id(), commission_rate=Decimal('1.00'),
+        )
+        # Dois meses atrás: encerrado e com o relatório pago
+        previous = date.today().replace(day=1) - timedelta(days=1)
+        closed = previous.replace(day=1) - timedelta(days=1)
+        cls.year, cls.month = closed.year, closed.month
+        cls.first_day, cls.following = month_bounds(cls.year, cls.month)
+        for day in range(10):
+            DailySales.objects.create(
+                seller=cls.seller, sale_date=cls.first_day + timedelta(days=day),
+                total_amount=Decimal('100.00') + day,
+            )
+        report = MonthlyCommissionReport(seller=cls.seller, year=cls.year, month=cls.month)
+        report.calculate_from_sales()
+        report.status = MonthlyCommissionReport.Status.PAID
+        report.save()
+
+    def month_sales(self):
+        return DailySales.all_objects.filter(sale_date__gte=self.first_day, sale_date__lt=self.following)
+
+    def rows(self):
+        last_day = self.following - timedelta(days=1)
+        return [
+            (row['id'], row['uuid'], row['seller_id'], row['store_id'], row['sale_date'],
+             row['total_amount'], row['calculated_commission'])
+            for row in iter_sales_rows(self.first_day, last_day, include_inactive=True)
+        ]
+
+    def timeseries(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        response = client.get('/api/v1/analytics/timeseries/', {
+            'start_date': self.first_day.isoformat(),
+            'end_date': (self.following - timedelta(days=1)).isoformat(),
+            'bucket': 'day',
+        })
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def dashboard(self, year, month):
+        results = run_serially(dashboard_aggregates(self.admin, year, month))
+        return results['total_sales'], results['prev_total_sales'], results['chart'], results['top_sellers']
+
+    def test_round_trip_keeps_every_read_path(self):
+        next_year, next_month = (self.following.year, self.following.month)
+        before = (
+            self.rows(),
+            self.timeseries(),
+            self.dashboard(self.year, self.month),
+            self.dashboard(next_year, next_month)[1],
+            month_projection(self.year, self.month, self.following - timedelta(days=1))['totals'],
+        )
+
+        archived = archive_month(self.year, self.month)
+
+        self.assertEqual(archived.row_count, 10)
+        self.assertFalse(self.month_sales().exists())
+        after = (
+            self.rows(),
+            self.timeseries(),
+            self.dashboard(self.year, self.month),
+            self.dashboard(next_year, next_month)[1],
+            month_projection(self.year, self.month, self.following - timedelta(days=1))['totals'],
+        )
+        self.assertEqual(after, before)
+        self.assertEqual(after[3], Decimal('1045.00'))
+        # Total do mês anterior sai do resumo gravado, sem abrir o arquivo
+        with mock.patch.object(archive, 'read_columns', side_effect=AssertionError('arquivo lido')):
+            self.assertEqual(self.dashboard(next_year, next_month)[1], Decimal('1045.00'))
+
+    def test_archived_sales_stay_in_change_feed(self):
+        with mock.patch.object(changes, 'CHANGE_FEED_LAG_SECONDS', 0):
+            before = changes.read_changes(['sales'])
+            archive_month(self.year, self.month)
+
+            # Cursor já depois das vendas: o mês arquivado vem de novo, em páginas, lendo só o necessário
+            results, cursor = [], before['next_cursor']
+            with mock.patch.object(changes, 'read_month', wraps=changes.read_month) as read_month:
+                while True:
+                    page = changes.read_changes(['sales'], cursor, limit=4)
+                    results.extend(page['results'])
+                    cursor = page['next_cursor']
+                    if not page['has_more']:
+                        break
+            self.assertEqual([call.args[1:] for call in read_month.call_args_list], [(0, 4), (4, 8), (8, 10)])
+            self.assertEqual(changes.read_changes(['sales'], cursor)['results'], [])
+
+        self.assertEqual(len(before['results']), 10)
+        self.assertEqual(
+            sorted(results, key=lambda item: item['id']), sorted(before['results'], key=lambda item: item['id']),
+        )
+
+    def test_history_pages_by_keyset_across_archive(self):
+        DailySales.objects.create(seller=self.seller, sale_date=self.following, total_amount=Decimal('50.00'))
+        archive_month(self.year, self.month)
+        client = APIClient()
+        client.force_authenticate(self.admin)
+
+        results, url = [], f'/api/v1/sales/history/?start_date={self.first_day}&end_date={self.following}&page_size=4'
+        while url:
+            body = client.get(url).json()
+            results.extend((row['sale_date'], row['pk'], row['archived']) for row in body['results'])
+            url = body['next']
+
+        self.assertEqual(len(results), 11)
+        self.assertEqual(results, sorted(results))
+        self.assertEqual([archived for _, _, archived in results], [True] * 10 + [False])
+
+    async def test_export_streams_in_chunks_under_asgi(self):
+        await sync_to_async(archive_month)(self.year, self.month)
+        last_day = self.following - timedelta(days=1)
+        url = f'/api/v1/sales/export/?start_date={self.first_day}&end_date={last_day}'
+        await sync_to_async(self.client.force_login)(self.admin)
+        await self.async_client.aforce_login(self.admin)
+        expected = await sync_to_async(lambda: b''.join(self.client.get(url).streaming_content))()
+
+        with mock.patch.object(streaming, 'STREAM_CHUNK_LINES', 4):
+            response = await self.async_client.get(url)
+            self.assertTrue(response.is_async)
+            chunks = [chunk async for chunk in response.streaming_content]
+
+        # Cabeçalho + 10 vendas em blocos de 4 linhas, lidos do arquivo frio
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(b''.join(chunks), expected)
+
+    def test_sale_inserted_while_archiving_aborts(self):
+        write_file = archive._write_file
+
+        def write_then_insert(*args):
+            checksum = write_file(*args)
+            # Lançamento concorrente depois da leitura das linhas
+            DailySales.objects.create(
+                seller=self.seller, sale_date=self.first_day + timedelta(days=20), total_amount=Decimal('5.00'),
+            )
+            return checksum
+
+        with mock.patch.object(archive, '_write_file', side_effect=write_then_insert):
+            with self.assertRaises(ArchiveError):
+                archive_month(self.year, self.month)
+
+        self.assertFalse(ArchivedSalesMonth.all_objects.exists())
+        self.assertEqual(self.month_sales().count(), 10)
+        self.assertFalse(archive_path(ArchivedSalesMonth(file_name=f'sales-{self.year:04d}-{self.month:02d}.zip')).exists())
+
+    def test_sale_deleted_while_archiving_aborts(self):
+        write_file = archive._write_file
+
+        def write_then_delete(*args):
+            checksum = write_file(*args)
+            gone = self.month_sales().filter(sale_date=self.first_day)
+            gone._raw_delete(gone.db)
+            return checksum
+
+        with mock.patch.object(archive, '_write_file', side_effect=write_then_delete):
+            with self.assertRaises(ArchiveError):
+                archive_month(self.year, self.month)
+
+        self.assertFalse(ArchivedSalesMonth.all_objects.exists())
+        self.assertEqual(self.month_sales().count(), 10)
+
+    def test_closed_month_rejects_sales_before_archiving(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+
+        response = client.post('/api/v1/sales/', {
+            'seller': self.seller.pk,
+            'sale_date': (self.first_day + timedelta(days=20)).isoformat(),
+            'total_amount': '10.00',
+        })
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('sale_date', response.json())
+
+        sale = self.month_sales().first()
+        response = client.patch(f'/api/v1/sales/{sale.pk}/', {'total_amount': '1.00'})
+        self.assertEqual(response.status_code, 400)
+        sale.refresh_from_db()
+        self.assertNotEqual(sale.total_amount, Decimal('1.00'))
+
+
+class SaleDestroyTests(TestCase):
+    """DELETE na API desativa a venda; um novo lançamento no mesmo dia a reativa."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = Account.objects.create_user(
+            'admin', 'admin@example.com', 'x', user_type='ADMIN', document='1', is_staff=True,
+        )
+        cls.seller = Account.objects.create_user(
+            'bruno', 'bruno@example.com', 'x', user_type='SELLER', document='2',
+            store_id=Store.default_id(), commission_rate=Decimal('1.00'),
+        )
+        cls.sale = DailySales.objects.create(seller=cls.seller, sale_date=date.today(), total_amount=Decimal('100.00'))
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_destroy_deactivates_and_create_reactivates(self):
+        response = self.client.delete(f'/api/v1/sales/{self.sale.pk}/')
+        self.assertEqual(response.status_code, 204)
+        self.sale.refresh_from_db()
+        self.assertFalse(self.sale.is_active)
+
+        response = self.client.post('/api/v1/sales/', {
+            'seller': self.seller.pk, 'sale_date': date.today().isoformat(), 'total_amount': '80.00',
+        })
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['pk'], self.sale.pk)
+        self.sale.refresh_from_db()
+        self.assertTrue(self.sale.is_active)
+        self.assertEqual(self.sale.calculated_commission, Decimal('0.80'))
+
+    def test_duplicate_active_sale_is_rejected(self):
+        response = self.client.post('/api/v1/sales/', {
+            'seller': self.seller.pk, 'sale_date': date.today().isoformat(), 'total_amount': '80.00',
+        })
+        self.assertEqual(response.status_code, 400)
+
+
+class SalesAdminActionTests(TestCase):
+    """Ações em lote do admin: meses fechados ficam de fora, auditoria e outbox registram."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = Account.objects.create_superuser('root', 'root@example.com', 'x', document='1')
+        cls.seller = Account.objects.create_user(
+            'bruno', 'bruno@example.com', 'x', user_type='SELLER', document='2',
+            store_id=Store.default_id(), commission_rate=Decimal('1.00'),
+        )
+        previous = date.today().replace(day=1) - timedelta(days=1)
+        closed = previous.replace(day=1) - timedelta(days=1)
+        cls.closed_sale = DailySales.objects.create(seller=cls.seller, sale_date=closed, total_amount=Decimal('100.00'))
+        report = MonthlyCommissionReport(seller=cls.seller, year=closed.year, month=closed.month)
+        report.calculate_from_sales()
+        report.status = MonthlyCommissionReport.Status.PAID
+        report.save()
+        cls.open_sale = DailySales.objects.create(seller=cls.seller, sale_date=date.today(), total_amount=Decimal('100.00'))
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def run_action(self, action):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/admin/sales/dailysales/', {
+                'action': action, '_selected_action': [self.closed_sale.pk, self.open_sale.pk],
+            })
+        self.assertEqual(response.status_code, 302)
+
+    def test_deactivate_skips_closed_months_and_records_events(self):
+        self.run_action('deactivate')
+
+        self.closed_sale.refresh_from_db()
+        self.open_sale.refresh_from_db()
+        self.assertTrue(self.closed_sale.is_active)
+        self.assertFalse(self.open_sale.is_active)
+        event = ChangeEvent.objects.get(object_id=self.open_sale.pk, action=ChangeEvent.Action.UPDATE)
+        self.assertEqual(event.changes, {'is_active': [True, False]})
+        self.assertEqual((event.actor, event.store_id), (self.admin, self.open_sale.store_id))
+        outbox = OutboxEvent.objects.get(event_type=OutboxEvent.EventType.SALE_DEACTIVATED)
+        self.assertEqual(outbox.payload['id'], self.open_sale.pk)
+
+    def test_recalculate_skips_closed_months_and_records_events(self):
+        DailySales.all_objects.filter(pk__in=[self.closed_sale.pk, self.open_sale.pk]).update(
+            calculated_commission=Decimal('0.10'),
+        )
+
+        self.run_action('recalculate_commissions')
+
+        self.closed_sale.refresh_from_db()
+        self.open_sale.refresh_from_db()
+        self.assertEqual(self.closed_sale.calculated_commission, Decimal('0.10'))
+        self.assertEqual(self.open_sale.calculated_commission, Decimal('1.00'))
+        event = ChangeEvent.objects.get(object_id=self.open_sale.pk, action=ChangeEvent.Action.UPDATE)
+        self.assertEqual(event.changes, {'calculated_commission': ['0.10', '1.00']})
+        self.assertEqual(
+            list(OutboxEvent.objects.filter(event_type=OutboxEvent.EventType.SALE_UPDATED).values_list('payload__id', flat=True)),
+            [self.open_sale.pk],
+        )
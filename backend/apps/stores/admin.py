@@ -0,0 +1,11 @@
+from django.contrib import admin
+
+from .models import Store
+
+
+@admin.register(Store)
+class StoreAdmin(admin.ModelAdmin):
+    list_display = ('name', 'code', 'document', 'is_active')
+    list_filter = ('is_active',)
+    search_fields = ('name', 'code', 'document')
+    prepopulated_fields = {'code': ('name',)}
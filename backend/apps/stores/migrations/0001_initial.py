@@ -0,0 +1,46 @@
+# Generated by Django 5.2.5 on 2026-10-19 16:15
+
+import django.db.models.manager
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+def create_default_store(apps, schema_editor):
+    # Instalações de loja única: todos os dados existentes passam a ser desta loja
+    Store = apps.get_model('stores', 'Store')
+    code = getattr(settings, 'DEFAULT_STORE_CODE', 'principal')
+    Store._default_manager.get_or_create(code=code, defaults={'name': 'Loja Principal'})
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Store',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False, verbose_name='ID')),
+                ('uuid', models.UUIDField(default=uuid.uuid4, editable=False, help_text='Identificador único usado em URLs públicas', unique=True, verbose_name='UUID')),
+                ('is_active', models.BooleanField(default=True, help_text='Desmarque para desativar o registro em vez de excluí-lo', verbose_name='Ativo')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Atualizado em')),
+                ('name', models.CharField(max_length=120, verbose_name='Nome')),
+                ('code', models.SlugField(help_text='Identificador curto da loja (ex.: centro-sp)', max_length=40, unique=True, verbose_name='Código')),
+                ('document', models.CharField(blank=True, max_length=18, verbose_name='CNPJ')),
+            ],
+            options={
+                'verbose_name': 'Loja',
+                'verbose_name_plural': 'Lojas',
+                'ordering': ['name'],
+            },
+            managers=[
+                ('all_objects', django.db.models.manager.Manager()),
+            ],
+        ),
+        migrations.RunPython(create_default_store, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,62 @@
+# apps/stores/mixins.py
+from rest_framework.exceptions import PermissionDenied
+
+from .tenancy import NO_STORE, resolve_store_id, scope_queryset, user_store_id
+
+
+class StoreScopedViewMixin:
+    """
+    Viewsets/views do DRF: o queryset fica restrito à loja da requisição.
+
+    - `store_field`: caminho até a FK da loja no modelo da view
+    - `store_related_fields`: {campo do serializer: caminho até a loja} cujas
+      opções (ex.: `seller`) também ficam restritas à loja
+    - `store_exempt_actions`: ações permitidas a quem não tem loja (403 nas demais)
+    """
+    store_field = 'store'
+    store_related_fields = {}
+    # Ações liberadas para quem está sem loja (ex.: `me/`)
+    store_exempt_actions = ()
+
+    @property
+    def store_id(self):
+        return resolve_store_id(self.request)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        # Depois da autenticação: vendedor/gerente sem loja não acessa nada
+        if self.store_id == NO_STORE and getattr(self, 'action', None) not in self.store_exempt_actions:
+            raise PermissionDenied("Usuário sem loja vinculada. Procure um administrador.")
+
+    def scope_to_store(self, queryset, field=None):
+        return scope_queryset(queryset, self.store_id, field or self.store_field)
+
+    def get_queryset(self):
+        return self.scope_to_store(super().get_queryset())
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        fields = getattr(serializer, 'fields', {})
+        for name, field in self.store_related_fields.items():
+            related = fields.get(name)
+            if related is not None and getattr(related, 'queryset', None) is not None:
+                related.queryset = scope_queryset(related.queryset, self.store_id, field)
+        return serializer
+
+
+class StoreScopedAdminMixin:
+    """
+    Admin: usuários vinculados a uma loja só veem (e editam) os registros
+    dela; usuários da rede veem todos. O parâmetro `?store=` não é usado
+    aqui (o admin o trataria como filtro); use o filtro lateral `store`.
+    """
+    store_field = 'store'
+
+    def get_queryset(self, request):
+        return scope_queryset(super().get_queryset(request), user_store_id(request.user), self.store_field)
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        store_id = user_store_id(request.user)
+        if db_field.name == 'store' and store_id is not None:
+            kwargs['queryset'] = db_field.remote_field.model.objects.filter(pk=store_id)
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.db import models
+
+from apps.core.models import BaseModel
+
+DEFAULT_STORE_CODE = getattr(settings, 'DEFAULT_STORE_CODE', 'principal')
+
+
+class Store(BaseModel):
+    """
+    Loja da rede. Usuários, vendas e relatórios de comissão pertencem a uma
+    loja; as consultas da requisição ficam restritas a ela (apps/stores/tenancy.py).
+    """
+    name = models.CharField(max_length=120, verbose_name="Nome")
+    code = models.SlugField(
+        max_length=40,
+        unique=True,
+        verbose_name="Código",
+        help_text="Identificador curto da loja (ex.: centro-sp)"
+    )
+    document = models.CharField(max_length=18, blank=True, verbose_name="CNPJ")
+
+    # id da loja padrão, por processo (ver `default_id`)
+    _default_id = None
+
+    def __str__(self):
+        return self.name
+
+    @classmethod
+    def default_id(cls):
+        """
+        Loja padrão (criada na migração inicial): recebe as vendas e relatórios
+        de vendedores sem loja, como em uma instalação de loja única.
+        """
+        if cls._default_id is None:
+            store, _ = cls.all_objects.get_or_create(code=DEFAULT_STORE_CODE, defaults={'name': 'Loja Principal'})
+            cls._default_id = store.pk
+        return cls._default_id
+
+    class Meta:
+        verbose_name = "Loja"
+        verbose_name_plural = "Lojas"
+        ordering = ['name']
@@ -0,0 +1,78 @@
+# apps/stores/tenancy.py
+"""
+Loja (tenant) da requisição.
+
+- Usuário vinculado a uma loja (`Account.store`): sempre a dele.
+- Administrador da rede (ADMIN sem loja): todas as lojas, ou uma
+  escolhida com `?store=<id>` ou o header `X-Store: <id>`.
+- Vendedor ou gerente sem loja (cadastro incompleto): nenhuma loja
+  (`NO_STORE`); as views restritas respondem 403.
+
+A loja é resolvida uma vez por requisição e guardada no HttpRequest.
+Viewsets, dashboard e admin filtram por ela (`scope_queryset` e os mixins
+de `apps/stores/mixins.py`), e os caches que guardam dados agregados
+(snapshots, projeção, autocomplete, SSE) usam a loja na chave.
+
+As tabelas grandes têm índices começando por `store`, então a consulta de
+uma loja percorre só as linhas dela, como antes da consolidação.
+"""
+from django.http import Http404
+
+STORE_PARAM = 'store'
+STORE_HEADER = 'HTTP_X_STORE'
+STORE_ATTR = '_store_id'
+UNSET = object()
+# Nenhuma loja tem id 0: filtrar por ele não devolve nada
+NO_STORE = 0
+
+
+def is_chain_wide(user):
+    """Só administradores sem loja acessam a rede toda."""
+    return (
+        user is not None and user.is_authenticated
+        and getattr(user, 'user_type', None) == 'ADMIN'
+        and getattr(user, 'store_id', None) is None
+    )
+
+
+def user_store_id(user):
+    """
+    Loja do usuário: None para administradores da rede (e para chamadas
+    sem usuário, como comandos), `NO_STORE` para anônimos e para não
+    administradores sem loja.
+    """
+    if user is None or is_chain_wide(user):
+        return None
+    if not user.is_authenticated:
+        return NO_STORE
+    return getattr(user, 'store_id', None) or NO_STORE
+
+
+def resolve_store_id(request, user=None):
+    """
+    Loja da requisição (None = todas). `user` permite resolver em views
+    assíncronas depois de `await request.auser()`. Não consulta o banco.
+    """
+    http_request = getattr(request, '_request', request)
+    cached = getattr(http_request, STORE_ATTR, UNSET)
+    if cached is not UNSET:
+        return cached
+
+    user = request.user if user is None else user
+    store_id = user_store_id(user)
+    if is_chain_wide(user):
+        value = http_request.GET.get(STORE_PARAM) or http_request.META.get(STORE_HEADER)
+        if value:
+            if not str(value).isdigit():
+                raise Http404("Loja não encontrada.")
+            store_id = int(value)
+
+    setattr(http_request, STORE_ATTR, store_id)
+    return store_id
+
+
+def scope_queryset(queryset, store_id, field='store'):
+    """Restringe `queryset` à loja (`field` é o caminho até a FK, ex.: 'seller__store')."""
+    if store_id is None:
+        return queryset
+    return queryset.filter(**{f'{field}_id': store_id})
@@ -3,6 +3,9 @@ ASGI config for vendapay project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Servidor de produção (necessário para o SSE do dashboard ao vivo):
+    uvicorn vendapay.asgi:application --workers 4
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -42,10 +42,14 @@ INSTALLED_APPS = [
 
     # Your apps
     'apps.core',
+    'apps.stores',
     'apps.accounts',
     'apps.sales',
     'apps.commissions',
-    'apps.dashboard'
+    'apps.dashboard',
+    'apps.audit',
+    'apps.integrations',
+    'apps.goals',
 ]
 
 MIDDLEWARE = [
@@ -54,6 +58,10 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    # Grava os eventos de auditoria da requisição em um único INSERT
+    'apps.audit.middleware.AuditMiddleware',
+    # Headers X-RateLimit-* dos throttles da API (apps/core/throttling.py)
+    'apps.core.middleware.RateLimitHeadersMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 
@@ -81,6 +89,16 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'vendapay.wsgi.application'
+# Servidor ASGI (obrigatório para o dashboard ao vivo via SSE):
+#   uvicorn vendapay.asgi:application --workers 4
+# Sob WSGI o endpoint /api/v1/analytics/live/ responde 501.
+ASGI_APPLICATION = 'vendapay.asgi.application'
+# None = SSE ligado só quando a página vem pelo ASGI; True quando só as rotas
+# /api/v1/analytics/ vão para um servidor ASGI separado; False desliga
+DASHBOARD_LIVE_ENABLED = config(
+    'DASHBOARD_LIVE_ENABLED', default=None,
+    cast=lambda value: None if value is None else str(value).lower() in ('1', 'true', 'yes'),
+)
 
 
 # Database
@@ -98,13 +116,57 @@ if config('DB_ENGINE', default='sqlite') == 'postgres':
         }
     }
 else:
+    # Perfil de produção do SQLite (lojas menores):
+    # - WAL: leitores não bloqueiam o escritor e vice-versa
+    # - synchronous=NORMAL: seguro com WAL e sem fsync a cada commit
+    # - busy_timeout: espera o lock em vez de falhar com "database is locked"
+    # - transaction_mode=IMMEDIATE: pega o lock de escrita no BEGIN e evita o
+    #   deadlock de upgrade de leitura para escrita (que ignora o busy_timeout)
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': config('SQLITE_BUSY_TIMEOUT', default=5000, cast=int),  # ms
+        'mmap_size': config('SQLITE_MMAP_SIZE', default=134217728, cast=int),  # bytes (128 MB)
+        'cache_size': config('SQLITE_CACHE_SIZE', default=-64000, cast=int),  # negativo = KiB (64 MB)
+        'temp_store': 'MEMORY',
+    }
     DATABASES = {
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
             'NAME': BASE_DIR / 'db.sqlite3',
+            'OPTIONS': {
+                'init_command': ';'.join(f'PRAGMA {name}={value}' for name, value in SQLITE_PRAGMAS.items()),
+                'transaction_mode': 'IMMEDIATE',
+                'timeout': SQLITE_PRAGMAS['busy_timeout'] / 1000,
+            },
+        }
+    }
+
+# Réplica de leitura opcional (dashboard, análises e exportações)
+# Postgres: POSTGRES_REPLICA_HOST (e opcionalmente _PORT/_DB/_USER/_PASSWORD)
+# SQLite (testes locais): SQLITE_REPLICA_PATH apontando para um segundo arquivo
+if config('DB_ENGINE', default='sqlite') == 'postgres':
+    if config('POSTGRES_REPLICA_HOST', default=''):
+        DATABASES['replica'] = {
+            **DATABASES['default'],
+            'NAME': config('POSTGRES_REPLICA_DB', default=DATABASES['default']['NAME']),
+            'USER': config('POSTGRES_REPLICA_USER', default=DATABASES['default']['USER']),
+            'PASSWORD': config('POSTGRES_REPLICA_PASSWORD', default=DATABASES['default']['PASSWORD']),
+            'HOST': config('POSTGRES_REPLICA_HOST'),
+            'PORT': config('POSTGRES_REPLICA_PORT', default=DATABASES['default']['PORT']),
         }
+elif config('SQLITE_REPLICA_PATH', default=''):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': config('SQLITE_REPLICA_PATH'),
     }
 
+if 'replica' in DATABASES:
+    # Nos testes a réplica aponta para o mesmo banco do primário
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+
+DATABASE_ROUTERS = ['apps.core.db_router.PrimaryReplicaRouter']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -147,22 +209,65 @@ MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')  # Diretório onde os arquivos
 # de mídia serão armazenados
 
+# Arquivo frio de meses de vendas fechados (manage.py archive_month)
+SALES_ARCHIVE_DIR = config('SALES_ARCHIVE_DIR', default=str(BASE_DIR / 'archive'))
+
+# Empresa pagadora no header da remessa de comissões (apps/commissions/payments.py)
+PAYMENT_COMPANY_NAME = config('PAYMENT_COMPANY_NAME', default='VendaPay')
+PAYMENT_COMPANY_DOCUMENT = config('PAYMENT_COMPANY_DOCUMENT', default='')
+
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Cache local por processo (usado também pelas sessões cached_db)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'vendapay',
+    }
+}
+
+# Autenticação com cache de usuários e tokens (apps/accounts/backends.py)
+# Sessões: lidas do cache e gravadas também no banco (write-through)
+AUTHENTICATION_BACKENDS = ['apps.accounts.backends.CachedModelBackend']
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+AUTH_CACHE_TTL = config('AUTH_CACHE_TTL', default=60, cast=int)  # segundos
+AUTH_CACHE_MAXSIZE = config('AUTH_CACHE_MAXSIZE', default=1024, cast=int)
+
 # Configurações do Django REST Framework
-"""REST_FRAMEWORK = {
+REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'apps.accounts.backends.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
+        'rest_framework.authentication.BasicAuthentication',
     ],
-    'DEFAULT_PERMISSION_CLASSES': [
-        'rest_framework.permissions.IsAuthenticated',
+    # Token bucket por usuário/IP e por escopo da view (apps/core/throttling.py)
+    'DEFAULT_THROTTLE_CLASSES': [
+        'apps.core.throttling.UserBucketThrottle',
+        'apps.core.throttling.ScopedBucketThrottle',
     ],
-}"""
+    'DEFAULT_THROTTLE_RATES': {
+        'user': config('API_THROTTLE_USER', default='1200/min'),
+        'anon': config('API_THROTTLE_ANON', default='60/min'),
+        'sales': '600/min',
+        'reports': '600/min',
+        'accounts': '600/min',
+        'autocomplete': '1200/min',
+        'analytics': '300/min',
+        'changes': '120/min',
+        'exports': '20/hour',
+        'commissions-generate': '10/hour',
+        'commissions-bulk': '60/hour',
+        'payments': '30/hour',
+        'goals': '300/min',
+    },
+}
+
+# Cache compartilhado para os baldes do throttling (None = em memória, por processo)
+API_THROTTLE_CACHE = config('API_THROTTLE_CACHE', default=None)
 
 # Configurações de e-mail (exemplo usando console backend)
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
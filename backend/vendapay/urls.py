@@ -15,6 +15,18 @@ urlpatterns = [
     path('api/v1/', include('apps.sales.api.urls')),
         
     path('api/v1/', include('apps.commissions.api.urls')),
+
+    # Rotas Api de análises (séries temporais do dashboard)
+    path('api/v1/', include('apps.dashboard.api.urls')),
+
+    # Log de auditoria (somente leitura)
+    path('api/v1/', include('apps.audit.api.urls')),
+
+    # Feed incremental de alterações para sincronização (ERP/BI)
+    path('api/v1/', include('apps.integrations.api.urls')),
+
+    # Metas de vendas e progresso
+    path('api/v1/', include('apps.goals.api.urls')),
     path('', include('apps.dashboard.urls')), # Dashboard é a página inicial
 
 ]